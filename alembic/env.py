@@ -16,6 +16,11 @@ from app.models.ai_model import AIModel
 from app.models.ai_provider import AIProvider
 from app.models.prompt import Prompt
 from app.models.upload import Upload
+from app.models.llm_cache_entry import LLMCacheEntry
+from app.models.job import Job
+from app.models.stripe_event import StripeEvent
+from app.models.upload_page import UploadPage
+from app.models.embedding_chunk import EmbeddingChunk
 from sqlmodel import SQLModel
 
 target_metadata = SQLModel.metadata
@@ -0,0 +1,47 @@
+"""add embedding chunks
+
+Revision ID: 0b7e3d5a9c14
+Revises: f2a6d8b0c351
+Create Date: 2026-10-18 19:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e3d5a9c14'
+down_revision: Union[str, None] = 'f2a6d8b0c351'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('embedding_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('source_type', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=True),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('text', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('token_count', sa.Integer(), nullable=False),
+    sa.Column('text_sha256', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('embedder', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('dim', sa.Integer(), nullable=False),
+    sa.Column('vector', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_embedding_chunks_user_id_embedder', 'embedding_chunks', ['user_id', 'embedder'], unique=False)
+    op.create_index('ix_embedding_chunks_source', 'embedding_chunks', ['source_type', 'source_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_embedding_chunks_source', table_name='embedding_chunks')
+    op.drop_index('ix_embedding_chunks_user_id_embedder', table_name='embedding_chunks')
+    op.drop_table('embedding_chunks')
@@ -0,0 +1,27 @@
+"""add keyset pagination indexes
+
+Revision ID: 3f8a1c6d2b7e
+Revises: 7c2d9e41a3b8
+Create Date: 2026-10-18 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a1c6d2b7e'
+down_revision: Union[str, None] = '7c2d9e41a3b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_contents_user_id_created_at_id', 'contents', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_uploads_user_id_upload_date_id', 'uploads', ['user_id', 'upload_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_uploads_user_id_upload_date_id', table_name='uploads')
+    op.drop_index('ix_contents_user_id_created_at_id', table_name='contents')
@@ -0,0 +1,26 @@
+"""add content brief token counts
+
+Revision ID: 5d9a2c7e4f18
+Revises: 0b7e3d5a9c14
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9a2c7e4f18'
+down_revision: Union[str, None] = '0b7e3d5a9c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('content_briefs', sa.Column('token_counts', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('content_briefs', 'token_counts')
@@ -0,0 +1,43 @@
+"""add stripe events
+
+Revision ID: c4d7f2a8e913
+Revises: a91e4b7c5d20
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7f2a8e913'
+down_revision: Union[str, None] = 'a91e4b7c5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stripe_events',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('customer_key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('received_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stripe_events_type'), 'stripe_events', ['type'], unique=False)
+    op.create_index('ix_stripe_events_customer_key_status_created', 'stripe_events', ['customer_key', 'status', 'created'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stripe_events_customer_key_status_created', table_name='stripe_events')
+    op.drop_index(op.f('ix_stripe_events_type'), table_name='stripe_events')
+    op.drop_table('stripe_events')
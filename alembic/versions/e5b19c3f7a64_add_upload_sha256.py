@@ -0,0 +1,29 @@
+"""add upload sha256
+
+Revision ID: e5b19c3f7a64
+Revises: c4d7f2a8e913
+Create Date: 2026-10-18 16:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b19c3f7a64'
+down_revision: Union[str, None] = 'c4d7f2a8e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('uploads', sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    op.create_index(op.f('ix_uploads_sha256'), 'uploads', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_uploads_sha256'), table_name='uploads')
+    op.drop_column('uploads', 'sha256')
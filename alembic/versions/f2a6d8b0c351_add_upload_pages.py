@@ -0,0 +1,40 @@
+"""add upload pages
+
+Revision ID: f2a6d8b0c351
+Revises: e5b19c3f7a64
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6d8b0c351'
+down_revision: Union[str, None] = 'e5b19c3f7a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('upload_pages',
+    sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('page_number', sa.Integer(), nullable=False),
+    sa.Column('text', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('char_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('sha256', 'page_number')
+    )
+    op.add_column('uploads', sa.Column('page_count', sa.Integer(), nullable=True))
+    op.add_column('uploads', sa.Column('extracted_at', sa.DateTime(), nullable=True))
+    op.add_column('uploads', sa.Column('extraction_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('uploads', 'extraction_error')
+    op.drop_column('uploads', 'extracted_at')
+    op.drop_column('uploads', 'page_count')
+    op.drop_table('upload_pages')
@@ -0,0 +1,141 @@
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from .config import settings
+
+access_logger = logging.getLogger("app.access")
+REDACTED = "[REDACTED]"
+
+def _csv(value: str) -> set[str]:
+    return {item.strip().lower() for item in value.split(",") if item.strip()}
+
+def start_access_log_listener() -> QueueListener:
+    """
+    Route access logs through a queue so the request path only enqueues a record;
+    formatting and writing to stdout happen on the listener's thread.
+    """
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    access_logger.handlers = [QueueHandler(log_queue)]
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    listener.start()
+    return listener
+
+def redact_headers(headers: list[tuple[bytes, bytes]], redact_fields: set[str]) -> dict:
+    redacted = {}
+    for raw_name, raw_value in headers:
+        name = raw_name.decode("latin-1").lower()
+        redacted[name] = REDACTED if name in redact_fields else raw_value.decode("latin-1")
+    return redacted
+
+def redact_body(body: str, redact_fields: set[str]) -> str:
+    # Regex rather than json.loads: the captured prefix is usually truncated, invalid JSON
+    for field in redact_fields:
+        body = re.sub(
+            rf'("{re.escape(field)}"\s*:\s*)"(?:[^"\\]|\\.)*"?',
+            rf'\1"{REDACTED}"',
+            body,
+            flags=re.IGNORECASE
+        )
+    return body
+
+class AccessLogMiddleware:
+    """
+    Pure ASGI access logger. Unlike the old log_requests middleware it never awaits the full
+    request body: it copies at most `body_bytes` from the chunks as the app reads them, and
+    counts response bytes as they are sent.
+    """
+    def __init__(
+        self,
+        app,
+        sample_rate: float = settings.ACCESS_LOG_SAMPLE_RATE,
+        error_sample_rate: float = settings.ACCESS_LOG_ERROR_SAMPLE_RATE,
+        body_bytes: int = settings.ACCESS_LOG_BODY_BYTES,
+        body_content_types: str = settings.ACCESS_LOG_BODY_CONTENT_TYPES,
+        redact_fields: str = settings.ACCESS_LOG_REDACT_FIELDS
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.error_sample_rate = error_sample_rate
+        self.body_bytes = body_bytes
+        self.body_content_types = _csv(body_content_types)
+        self.redact_fields = _csv(redact_fields)
+
+    def _capture_body(self, headers: list[tuple[bytes, bytes]]) -> bool:
+        if self.body_bytes <= 0:
+            return False
+        for name, value in headers:
+            if name.lower() == b"content-type":
+                content_type = value.decode("latin-1").split(";")[0].strip().lower()
+                return content_type in self.body_content_types
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        capture_body = self._capture_body(scope["headers"])
+        captured = bytearray()
+        request_bytes = 0
+        status_code: Optional[int] = None
+        response_bytes = 0
+
+        async def receive_wrapper():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                request_bytes += len(chunk)
+                if capture_body and len(captured) < self.body_bytes:
+                    captured.extend(chunk[:self.body_bytes - len(captured)])
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            status_code = status_code or 500
+            raise
+        finally:
+            self._log(scope, started, status_code or 500, request_bytes, response_bytes, bytes(captured))
+
+    def _log(self, scope, started: float, status_code: int, request_bytes: int, response_bytes: int, body: bytes) -> None:
+        rate = self.error_sample_rate if status_code >= 500 else self.sample_rate
+        if random.random() >= rate:
+            return
+
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes,
+            "client": scope["client"][0] if scope.get("client") else None,
+            "headers": redact_headers(scope["headers"], self.redact_fields),
+            "sample_rate": rate,
+        }
+        if body:
+            record["body"] = redact_body(body.decode("utf-8", errors="replace"), self.redact_fields)
+            record["body_truncated"] = request_bytes > len(body)
+        access_logger.info(json.dumps(record))
@@ -1,14 +1,7 @@
-import asyncio
-import os
 from dataclasses import dataclass
-from typing import Any
+from functools import lru_cache
 from pydantic import BaseModel
-
-import logfire
-from devtools import debug
-from httpx import AsyncClient
-
-from pydantic_ai import Agent, ModelRetry, RunContext
+from app.clients.http import on_close
 
 class ContentBlock(BaseModel):    
     content_block: str
@@ -17,13 +10,97 @@ class ContentBlock(BaseModel):
 class Deps:    
     system_prompt: str
 
-content_writer_agent = Agent(
-    'openai:gpt-4o-mini',        
-    deps_type=Deps,
-    retries=2,
-    result_type=ContentBlock
-)
+CONTENT_WRITER_MODEL = 'openai:gpt-4o-mini'
+
+@lru_cache(maxsize=1)
+def get_content_writer_agent():
+    """
+    Build the agent on first use. pydantic_ai (and the OpenAI SDK behind it) is slow to
+    import, so it stays off the cold-start path for requests that never generate content.
+    """
+    from pydantic_ai import Agent, RunContext
+
+    content_writer_agent = Agent(
+        CONTENT_WRITER_MODEL,
+        # Callers pass the routed model to run(); don't require OpenAI credentials up front
+        defer_model_check=True,
+        deps_type=Deps,
+        retries=2,
+        result_type=ContentBlock
+    )
+
+    @content_writer_agent.system_prompt
+    def add_system_prompt(ctx: RunContext[str]) -> str:  
+        return f"{ctx.deps.system_prompt}"
+
+    return content_writer_agent
+
+@lru_cache(maxsize=None)
+def _openai_client(base_url: str = None, api_key_env: str = None):
+    """
+    One SDK client per OpenAI-compatible endpoint, on the shared HTTP transport. Its own
+    retries are off: run_content_writer retries through the provider's rate limiter.
+    """
+    import os
+    from openai import AsyncOpenAI
+    from app.clients.http import get_http_client
+    api_key = os.getenv(api_key_env) if api_key_env else os.getenv("OPEN_AI_API_KEY") or os.getenv("OPENAI_API_KEY")
+    return AsyncOpenAI(base_url=base_url, api_key=api_key or "", http_client=get_http_client(), max_retries=0)
+
+@lru_cache(maxsize=None)
+def _anthropic_client(base_url: str = None, api_key_env: str = None):
+    """The Anthropic counterpart of _openai_client: shared HTTP transport, SDK retries off."""
+    import os
+    from anthropic import AsyncAnthropic
+    from app.clients.http import get_http_client
+    return AsyncAnthropic(
+        base_url=base_url,
+        api_key=os.getenv(api_key_env or "ANTHROPIC_API_KEY"),
+        http_client=get_http_client(),
+        max_retries=0
+    )
+
+# Both hold the shared transport, so they are rebuilt once it has been closed
+on_close(_openai_client.cache_clear)
+on_close(_anthropic_client.cache_clear)
+
+def agent_model(route):
+    """The pydantic_ai model for a ModelRoute, passed to Agent.run(model=...)."""
+    if route.provider == "fake":
+        from pydantic_ai.models.test import TestModel
+        return TestModel()
+    if route.provider == "openai":
+        from pydantic_ai.models.openai import OpenAIModel
+        return OpenAIModel(route.model, openai_client=_openai_client(route.base_url, route.api_key_env))
+    if route.provider == "anthropic":
+        from pydantic_ai.models.anthropic import AnthropicModel
+        return AnthropicModel(route.model, anthropic_client=_anthropic_client(route.base_url, route.api_key_env))
+    return f"{route.provider}:{route.model}"
+
+def run_tokens(result) -> int:
+    return result.usage().total_tokens or 0
+
+async def run_content_writer(prompt: str, request_type: str, deps: Deps = None, provider: str = None):
+    """
+    Run the agent on the model the router picks for `request_type`, recording its latency.
+    Bounded by the call deadline, and hedged on another model when it runs past its p95.
+    """
+    from app.clients.rate_limit import estimate_request_tokens, get_limiter
+    from app.services.hedging_service import hedged_call
+    from app.services.model_router_service import model_router
+    route = model_router.select(request_type, provider)
+
+    async def attempt(attempt_route, timeout: float):
+        async with model_router.track(attempt_route):
+            return await get_limiter(attempt_route.limiter_key).call(
+                lambda: get_content_writer_agent().run(
+                    prompt,
+                    deps=deps,
+                    model=agent_model(attempt_route),
+                    model_settings={"timeout": timeout}
+                ),
+                tokens=estimate_request_tokens(prompt, deps.system_prompt if deps else None),
+                used=run_tokens
+            )
 
-@content_writer_agent.system_prompt
-def add_system_prompt(ctx: RunContext[str]) -> str:  
-    return f"{ctx.deps.system_prompt}"
\ No newline at end of file
+    return await hedged_call(request_type, route, attempt, router=model_router, provider=provider)
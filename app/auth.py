@@ -6,12 +6,13 @@ from jose import JWTError, jwt
 from datetime import datetime, timedelta, UTC
 from typing import Optional
 from sqlmodel import Session, select
-from .database import get_db
+from .database import get_db, get_session
 from .models.user import User
 from .schemas.user import UserMeResponse
 from .schemas.token import TokenData, Token
+from .schemas.principal import Principal
+from .services import principal_service
 import logging
-import resend
 from .config import settings
 from .config.email_config import get_email_config
 
@@ -63,6 +64,7 @@ async def send_magic_link(email: str, token: str, frontend_url: str = DEFAULT_FR
     logger.info(f"Selected email configuration: Domain={get_domain_from_url(frontend_url)}, API key={config['api_key'][:8]}...")
         
     # Set the API key for this request
+    import resend
     resend.api_key = config["api_key"]
         
     link = f"{frontend_url}/auth/callback?token={token}"
@@ -111,7 +113,7 @@ def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_session)) -> Principal:
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -136,8 +138,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    statement = select(User).where(User.id == int(token_data.user_id))
-    user = db.exec(statement).first()
+    # Lightweight cached principal: no relationship loading on every authenticated request
+    if settings.USE_ASYNC_DB:
+        user = await principal_service.get_principal_async(db, int(token_data.user_id))
+    else:
+        user = principal_service.get_principal(db, int(token_data.user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,18 +1,27 @@
-import anthropic
 import os
 import logging
+from typing import Optional
 from dotenv import load_dotenv
+from .http import get_http_client, on_close
+from .rate_limit import estimate_request_tokens, get_limiter
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 
+DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+
+def message_tokens(message) -> int:
+    return message.usage.input_tokens + message.usage.output_tokens
+
 class AnthropicClient:
     def __init__(self):
         self.api_key = os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             logger.error("ANTHROPIC_API_KEY not found in environment variables")
             raise ValueError("ANTHROPIC_API_KEY is not set")
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        import anthropic
+        # Retries go through the rate limiter, which backs off instead of retrying straight away
+        self.client = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
 
     def create_message(
         self,
@@ -20,19 +29,26 @@ class AnthropicClient:
         system_prompt: str,
         tools: list,
         tool_choice: dict,
-        model: str = "claude-3-5-sonnet-20241022",
-        max_tokens: int = 2024
+        model: str = DEFAULT_MODEL,
+        max_tokens: int = 2024,
+        timeout: Optional[float] = None
     ):
+        import anthropic
         try:
-            message = self.client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                tool_choice=tool_choice,
-                system=system_prompt,
-                tools=tools,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            message = get_limiter("anthropic").call_sync(
+                lambda: self.client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    tool_choice=tool_choice,
+                    system=system_prompt,
+                    tools=tools,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    timeout=timeout or anthropic.NOT_GIVEN
+                ),
+                tokens=estimate_request_tokens(prompt, system_prompt, tools, max_tokens=max_tokens),
+                used=message_tokens
             )
             return message
         except anthropic.APIError as e:
@@ -41,3 +57,104 @@ class AnthropicClient:
         except Exception as e:
             logger.error(f"Unexpected error in create_message: {str(e)}", exc_info=True)
             raise
+
+
+class AsyncAnthropicClient:
+    """Non-blocking variant of AnthropicClient that runs on the shared HTTP transport."""
+    def __init__(self, http_client=None):
+        self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not self.api_key:
+            logger.error("ANTHROPIC_API_KEY not found in environment variables")
+            raise ValueError("ANTHROPIC_API_KEY is not set")
+        import anthropic
+        self.client = anthropic.AsyncAnthropic(
+            api_key=self.api_key,
+            http_client=http_client or get_http_client(),
+            max_retries=0
+        )
+
+    async def create_message(
+        self,
+        prompt: str,
+        system_prompt: str,
+        tools: list,
+        tool_choice: dict,
+        model: str = DEFAULT_MODEL,
+        max_tokens: int = 2024,
+        timeout: Optional[float] = None
+    ):
+        import anthropic
+        try:
+            message = await get_limiter("anthropic").call(
+                lambda: self.client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    tool_choice=tool_choice,
+                    system=system_prompt,
+                    tools=tools,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    timeout=timeout or anthropic.NOT_GIVEN
+                ),
+                tokens=estimate_request_tokens(prompt, system_prompt, tools, max_tokens=max_tokens),
+                used=message_tokens
+            )
+            return message
+        except anthropic.APIError as e:
+            logger.error(f"Anthropic API error: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error in create_message: {str(e)}", exc_info=True)
+            raise
+
+    async def create_text_message(
+        self,
+        prompt: str,
+        system,
+        model: str = DEFAULT_MODEL,
+        max_tokens: int = 4096,
+        timeout: Optional[float] = None
+    ):
+        """
+        Plain text completion. `system` may be a string or a list of content blocks,
+        so callers can mark stable prefixes with cache_control. `timeout` bounds this call
+        (the SDK's None would mean no limit, so it is only passed when set).
+        """
+        import anthropic
+        try:
+            message = await get_limiter("anthropic").call(
+                lambda: self.client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    system=system,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    timeout=timeout or anthropic.NOT_GIVEN
+                ),
+                tokens=estimate_request_tokens(prompt, system, max_tokens=max_tokens),
+                used=message_tokens
+            )
+            return message
+        except anthropic.APIError as e:
+            logger.error(f"Anthropic API error: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error in create_text_message: {str(e)}", exc_info=True)
+            raise
+
+_async_client: Optional[AsyncAnthropicClient] = None
+
+def get_async_anthropic_client() -> AsyncAnthropicClient:
+    """Return the process-wide AsyncAnthropicClient, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncAnthropicClient()
+    return _async_client
+
+@on_close
+def _reset_async_client() -> None:
+    # Rebuilt on the new transport by the next get_*_client() call
+    global _async_client
+    _async_client = None
@@ -0,0 +1,38 @@
+import asyncio
+import hashlib
+import logging
+import random
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class FakeLLMError(Exception):
+    pass
+
+class FakeLLMClient:
+    """
+    Local stand-in for an LLM provider, for tests and development without API keys.
+    Returns deterministic text after `latency_ms`, and fails a seeded `error_rate` of calls.
+    """
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    async def create_text_message(self, prompt: str, system: str = "", model: str = "fake", max_tokens: int = 4096) -> str:
+        self.calls += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise FakeLLMError(f"Simulated failure from {model}")
+        digest = hashlib.sha256(f"{model}\n{system}\n{prompt}".encode("utf-8")).hexdigest()[:12]
+        return f"## Generated section\n\nDeterministic response {digest} from {model}."
+
+_clients: Dict[str, FakeLLMClient] = {}
+
+def get_fake_llm_client(model: str, latency_ms: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None) -> FakeLLMClient:
+    """One client per fake model name, so call counts and the failure sequence persist."""
+    if model not in _clients:
+        _clients[model] = FakeLLMClient(latency_ms=latency_ms, error_rate=error_rate, seed=seed or 0)
+    return _clients[model]
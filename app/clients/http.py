@@ -0,0 +1,49 @@
+import logging
+from typing import TYPE_CHECKING, Callable, List, Optional
+from ..config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+_http_client: Optional["httpx.AsyncClient"] = None
+# Resets for whatever was built on the shared client (SDK client singletons, cached agent
+# clients), run on close so none of them keeps using a closed transport
+_close_hooks: List[Callable[[], None]] = []
+
+def on_close(reset: Callable[[], None]) -> Callable[[], None]:
+    """Run `reset` whenever the shared client is closed. Usable as a decorator."""
+    _close_hooks.append(reset)
+    return reset
+
+def get_http_client() -> "httpx.AsyncClient":
+    """
+    Return the process-wide keep-alive HTTP client shared by the async LLM SDK clients.
+    Created on first use (normally from the FastAPI lifespan) so every SDK reuses one connection pool.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+        _http_client = httpx.AsyncClient(
+            http2=settings.LLM_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.LLM_HTTP_TIMEOUT, connect=settings.LLM_HTTP_CONNECT_TIMEOUT),
+        )
+        logger.info(
+            f"Created shared LLM HTTP client (http2={settings.LLM_HTTP2}, "
+            f"max_connections={settings.LLM_HTTP_MAX_CONNECTIONS})"
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    for reset in _close_hooks:
+        reset()
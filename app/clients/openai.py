@@ -1,18 +1,32 @@
-from typing import Type, Any
+from typing import Type, Any, Optional
 from pydantic import BaseModel
-from openai import OpenAI
 import os
 from dotenv import load_dotenv
 import logging
+from .http import get_http_client, on_close
+from .rate_limit import estimate_request_tokens, get_limiter
 
 load_dotenv()
 
+def completion_tokens(completion) -> int:
+    return completion.usage.total_tokens if completion.usage else 0
+
 def get_openai_client():
     api_key = os.getenv("OPEN_AI_API_KEY")
     if not api_key:
         logging.error("OpenAI API key not found in environment variables")
         raise ValueError("OpenAI API key not found")
-    return OpenAI(api_key=api_key)
+    from openai import OpenAI
+    # Retries go through the rate limiter, which backs off instead of retrying straight away
+    return OpenAI(api_key=api_key, max_retries=0)
+
+def get_async_openai_sdk_client(http_client=None):
+    api_key = os.getenv("OPEN_AI_API_KEY")
+    if not api_key:
+        logging.error("OpenAI API key not found in environment variables")
+        raise ValueError("OpenAI API key not found")
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=api_key, http_client=http_client or get_http_client(), max_retries=0)
 
 class OpenAIClient:
     def __init__(self):
@@ -24,18 +38,25 @@ class OpenAIClient:
         system_prompt: str,
         user_prompt: str,
         model: str = "gpt-4o-mini",
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
     ) -> Any:
+        from openai import NOT_GIVEN
         try:
             logging.info(f"Requesting structured response with model: {model}")
-            completion = self.client.beta.chat.completions.parse(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format=response_model,
-                temperature=temperature
+            completion = get_limiter("openai").call_sync(
+                lambda: self.client.beta.chat.completions.parse(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    response_format=response_model,
+                    temperature=temperature,
+                    timeout=timeout or NOT_GIVEN
+                ),
+                tokens=estimate_request_tokens(system_prompt, user_prompt),
+                used=completion_tokens
             )
             
             logging.info("Successfully received response from OpenAI API")
@@ -44,3 +65,58 @@ class OpenAIClient:
         except Exception as e:
             logging.error(f"Error in get_structured_response: {str(e)}", exc_info=True)
             raise
+
+
+class AsyncOpenAIClient:
+    """Non-blocking variant of OpenAIClient that runs on the shared HTTP transport."""
+    def __init__(self, http_client=None):
+        self.client = get_async_openai_sdk_client(http_client)
+
+    async def get_structured_response(
+        self,
+        response_model: Type[BaseModel],
+        system_prompt: str,
+        user_prompt: str,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
+    ) -> Any:
+        from openai import NOT_GIVEN
+        try:
+            logging.info(f"Requesting structured response with model: {model}")
+            completion = await get_limiter("openai").call(
+                lambda: self.client.beta.chat.completions.parse(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    response_format=response_model,
+                    temperature=temperature,
+                    timeout=timeout or NOT_GIVEN
+                ),
+                tokens=estimate_request_tokens(system_prompt, user_prompt),
+                used=completion_tokens
+            )
+
+            logging.info("Successfully received response from OpenAI API")
+            return completion.choices[0].message.parsed
+
+        except Exception as e:
+            logging.error(f"Error in get_structured_response: {str(e)}", exc_info=True)
+            raise
+
+_async_client: Optional[AsyncOpenAIClient] = None
+
+def get_async_openai_client() -> AsyncOpenAIClient:
+    """Return the process-wide AsyncOpenAIClient, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAIClient()
+    return _async_client
+
+@on_close
+def _reset_async_client() -> None:
+    # Rebuilt on the new transport by the next get_*_client() call
+    global _async_client
+    _async_client = None
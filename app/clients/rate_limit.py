@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# How often a blocked caller re-checks for a free slot
+POLL_SECONDS = 0.02
+
+OK = "ok"
+RATE_LIMITED = "rate_limited"
+OVERLOADED = "overloaded"
+ERROR = "error"
+CANCELLED = "cancelled"
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    # anthropic/openai APIStatusError carry status_code; httpx.HTTPStatusError carries the response
+    status = getattr(exc, "status_code", None)
+    if status is None and getattr(exc, "response", None) is not None:
+        status = getattr(exc.response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+def classify(exc: BaseException) -> str:
+    """429 is a rate limit; 5xx/529 and timeouts mean the provider is overloaded; anything else is our problem."""
+    if isinstance(exc, asyncio.CancelledError):
+        return CANCELLED
+    status = _status_code(exc)
+    if status == 429:
+        return RATE_LIMITED
+    if (status is not None and status >= 500) or isinstance(exc, TimeoutError) or "Timeout" in type(exc).__name__:
+        return OVERLOADED
+    return ERROR
+
+def retryable(exc: BaseException) -> bool:
+    """429s and 5xx responses; timeouts are not retried, the caller's deadline has mostly gone."""
+    return classify(exc) in (RATE_LIMITED, OVERLOADED) and _status_code(exc) is not None
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def estimate_request_tokens(*texts: Any, max_tokens: int = 0) -> int:
+    """Rough token cost of a request for the tokens-per-minute bucket: ~4 characters a token plus the output allowance."""
+    return sum(len(str(text)) for text in texts if text) // 4 + max_tokens
+
+class TokenBucket:
+    """`per_minute` units a minute, refilled continuously, with up to a minute's worth banked."""
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available; a request bigger than the bucket waits for a full one."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        # May go negative: the settled usage of a request exceeded its estimate
+        self.level -= amount
+
+class Lease:
+    """One admitted request. Report the actual token usage with `used()` to settle the estimate."""
+    def __init__(self, limiter: "ProviderLimiter", tokens: int):
+        self.limiter = limiter
+        self.tokens = tokens
+
+    def used(self, tokens: Optional[int]) -> None:
+        # Unknown usage (None or 0) leaves the estimate standing
+        if not tokens:
+            return
+        self.limiter._settle(self.tokens, tokens)
+        self.tokens = tokens
+
+class ProviderLimiter:
+    """
+    Outbound limiter for one provider account. Concurrency adapts AIMD-style: +1/limit per
+    success, times RATE_LIMIT_BACKOFF on a 429, an overload error or a latency spike (at most
+    once per cooldown, so a burst of 429s from requests already in flight halves it once).
+    A 429 also pauses new requests for its Retry-After. Requests/min and tokens/min token
+    buckets cap the rate on top. Thread-safe, and not tied to an event loop, so it can be
+    shared by the sync clients, the web process and the job worker.
+    """
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        initial_limit: float = None,
+        min_limit: float = None,
+        max_limit: float = None
+    ):
+        self.name = name
+        self.min_limit = min_limit or settings.RATE_LIMIT_MIN_CONCURRENCY
+        self.max_limit = max_limit or settings.RATE_LIMIT_MAX_CONCURRENCY
+        self.limit = float(initial_limit or settings.RATE_LIMIT_INITIAL_CONCURRENCY)
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease_at = 0.0
+        # Smoothed latency of successful calls; a call far above it is a spike
+        self.baseline_ms: Optional[float] = None
+        self.counts: Dict[str, int] = {OK: 0, RATE_LIMITED: 0, OVERLOADED: 0, ERROR: 0, CANCELLED: 0, "latency_spikes": 0}
+        self.waited_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Admit the request (0.0) or return how long to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= int(self.limit):
+                return POLL_SECONDS
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is not None and amount:
+                    wait = bucket.wait_time(amount, now)
+                    if wait > 0:
+                        return wait
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+            self.in_flight += 1
+            return 0.0
+
+    def _settle(self, estimated: int, actual: int) -> None:
+        with self._lock:
+            if self.tokens is not None:
+                self.tokens.take(actual - estimated)
+
+    def _decrease(self, now: float) -> None:
+        cooldown = max((self.baseline_ms or 0) / 1000, 1.0)
+        if now - self.last_decrease_at >= cooldown:
+            self.limit = max(self.min_limit, self.limit * settings.RATE_LIMIT_BACKOFF)
+            self.last_decrease_at = now
+            logger.info(f"{self.name}: concurrency limit down to {self.limit:.1f}")
+
+    def release(self, latency_ms: float, outcome: str, pause: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.in_flight -= 1
+            self.counts[outcome] += 1
+            if outcome == OK:
+                if self.baseline_ms is not None and latency_ms > self.baseline_ms * settings.RATE_LIMIT_LATENCY_TOLERANCE:
+                    self.counts["latency_spikes"] += 1
+                    self._decrease(now)
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self.baseline_ms = latency_ms if self.baseline_ms is None else 0.9 * self.baseline_ms + 0.1 * latency_ms
+            elif outcome in (RATE_LIMITED, OVERLOADED):
+                self._decrease(now)
+                if outcome == RATE_LIMITED:
+                    self.paused_until = max(self.paused_until, now + (pause or settings.RATE_LIMIT_DEFAULT_PAUSE_SECONDS))
+
+    async def acquire(self, tokens: int = 0) -> Lease:
+        started = time.monotonic()
+        while (wait := self._try_acquire(tokens)) > 0:
+            await asyncio.sleep(min(wait, 1.0))
+        return self._admitted(started, tokens)
+
+    def acquire_sync(self, tokens: int = 0) -> Lease:
+        started = time.monotonic()
+        while (wait := self._try_acquire(tokens)) > 0:
+            time.sleep(min(wait, 1.0))
+        return self._admitted(started, tokens)
+
+    def _admitted(self, started: float, tokens: int) -> Lease:
+        with self._lock:
+            self.waited_seconds += time.monotonic() - started
+        return Lease(self, tokens)
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0):
+        """Hold one of the provider's request slots for the duration of the block."""
+        lease = await self.acquire(tokens)
+        started = time.perf_counter()
+        try:
+            yield lease
+        except BaseException as e:
+            self.release((time.perf_counter() - started) * 1000, classify(e), retry_after(e))
+            raise
+        self.release((time.perf_counter() - started) * 1000, OK)
+
+    @contextmanager
+    def slot_sync(self, tokens: int = 0):
+        lease = self.acquire_sync(tokens)
+        started = time.perf_counter()
+        try:
+            yield lease
+        except BaseException as e:
+            self.release((time.perf_counter() - started) * 1000, classify(e), retry_after(e))
+            raise
+        self.release((time.perf_counter() - started) * 1000, OK)
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        used: Optional[Callable[[T], Optional[int]]] = None,
+        retries: int = None
+    ) -> T:
+        """
+        Await `fn()` in a slot. 429s and 5xx responses are retried up to RATE_LIMIT_RETRIES
+        times, each retry queueing behind the backoff it caused instead of going straight
+        back to the provider (the SDK clients' own retries are off for this reason).
+        `used(result)` gives the actual token usage, if known.
+        """
+        retries = settings.RATE_LIMIT_RETRIES if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                async with self.slot(tokens) as lease:
+                    result = await fn()
+                    self._settle_result(lease, result, used)
+                    return result
+            except Exception as e:
+                if not retryable(e) or attempt == retries:
+                    raise
+                logger.warning(f"{self.name}: {classify(e)}, retry {attempt + 1} of {retries}")
+
+    def call_sync(
+        self,
+        fn: Callable[[], T],
+        tokens: int = 0,
+        used: Optional[Callable[[T], Optional[int]]] = None,
+        retries: int = None
+    ) -> T:
+        retries = settings.RATE_LIMIT_RETRIES if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                with self.slot_sync(tokens) as lease:
+                    result = fn()
+                    self._settle_result(lease, result, used)
+                    return result
+            except Exception as e:
+                if not retryable(e) or attempt == retries:
+                    raise
+                logger.warning(f"{self.name}: {classify(e)}, retry {attempt + 1} of {retries}")
+
+    @staticmethod
+    def _settle_result(lease: Lease, result: Any, used: Optional[Callable[[Any], Optional[int]]]) -> None:
+        if used is None:
+            return
+        try:
+            lease.used(used(result))
+        except Exception as e:
+            logger.warning(f"Could not read token usage: {str(e)}")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "name": self.name,
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "paused_for": round(max(self.paused_until - now, 0.0), 2),
+                "baseline_ms": round(self.baseline_ms, 1) if self.baseline_ms is not None else None,
+                "waited_seconds": round(self.waited_seconds, 2),
+                **self.counts,
+            }
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name: str) -> ProviderLimiter:
+    """The process-wide limiter for a provider, with its requests/tokens per minute from RATE_LIMITS."""
+    with _limiters_lock:
+        if name not in _limiters:
+            limits = settings.RATE_LIMITS.get(name, {})
+            _limiters[name] = ProviderLimiter(
+                name,
+                requests_per_minute=limits.get("requests_per_minute"),
+                tokens_per_minute=limits.get("tokens_per_minute"),
+            )
+        return _limiters[name]
+
+def limiter_snapshot() -> list:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.snapshot() for limiter in limiters]
@@ -0,0 +1,41 @@
+"""
+Extract page text for uploaded PDFs.
+
+    python -m app.commands.extract_pdfs                  # incremental: only uploads never extracted
+    python -m app.commands.extract_pdfs --full           # re-parse every PDF
+    python -m app.commands.extract_pdfs --upload-id 12 --upload-id 13 --workers 4
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from sqlmodel import Session
+from app.config import settings
+from app.database import engine
+from app.services import pdf_extraction_service
+
+async def run(upload_ids, incremental: bool, workers: int) -> dict:
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        with Session(engine) as db:
+            return await pdf_extraction_service.extract_uploads(
+                db, upload_ids=upload_ids, incremental=incremental, executor=executor
+            )
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--upload-id", type=int, action="append", dest="upload_ids")
+    parser.add_argument("--full", action="store_true", help="Re-parse PDFs that were already extracted")
+    parser.add_argument("--workers", type=int, default=settings.PDF_EXTRACTION_WORKERS)
+    args = parser.parse_args(argv)
+
+    counts = asyncio.run(run(args.upload_ids, not args.full, args.workers))
+    print(
+        f"pdfs={counts['pdfs']} parsed={counts['parsed']} cached={counts['cached']} failed={counts['failed']} "
+        f"pages={counts['pages']} elapsed={counts['elapsed_seconds']}s pages/sec={counts['pages_per_second']}"
+    )
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    main()
@@ -0,0 +1,37 @@
+"""
+Build or refresh the retrieval index over uploads, content sections and briefs.
+
+    python -m app.commands.index_embeddings --user-id 42
+    python -m app.commands.index_embeddings --all --backend openai
+
+Sources whose text hasn't changed since they were last embedded are skipped.
+"""
+import argparse
+import logging
+import sys
+from sqlmodel import Session, select
+from app.database import engine
+from app.models.user import User
+from app.services import embedding_service
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user-id", type=int, action="append", dest="user_ids")
+    target.add_argument("--all", action="store_true", help="Index every user")
+    parser.add_argument("--backend", choices=sorted(embedding_service.EMBEDDERS), help="Defaults to EMBEDDING_BACKEND")
+    args = parser.parse_args(argv)
+
+    embedder = embedding_service.get_embedder(args.backend)
+    with Session(engine) as db:
+        user_ids = args.user_ids or db.exec(select(User.id).order_by(User.id)).all()
+        for user_id in user_ids:
+            counts = embedding_service.index_user(db, user_id, embedder)
+            print(
+                f"user={user_id} sources={counts['sources']} indexed={counts['indexed']} "
+                f"unchanged={counts['unchanged']} chunks={counts['chunks']}"
+            )
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    main()
@@ -0,0 +1,45 @@
+"""
+Reconcile users' subscription columns against Stripe in bulk, e.g. after missed webhooks.
+
+    python -m app.commands.reconcile_stripe_subscriptions
+    python -m app.commands.reconcile_stripe_subscriptions --fixture subscriptions.json --batch-size 1000
+
+Users are matched with IN (...) lookups per page and updated with one
+UPDATE ... FROM (VALUES ...) per batch instead of a query and commit per subscription.
+"""
+import argparse
+import logging
+import sys
+from sqlmodel import Session
+from app.database import engine
+from app.services import stripe_reconciliation_service
+from app.services.stripe_reconciliation_service import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_PAGE_SIZE,
+    FixtureSubscriptionSource,
+    StripeSubscriptionSource,
+)
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", help="JSON file of Stripe subscription objects to use instead of the Stripe API")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.fixture:
+        source = FixtureSubscriptionSource(args.fixture, page_size=args.page_size)
+    else:
+        source = StripeSubscriptionSource(page_size=args.page_size)
+
+    with Session(engine) as db:
+        counts = stripe_reconciliation_service.reconcile(db, source, batch_size=args.batch_size)
+    print(
+        f"seen={counts['seen']} matched={counts['matched']} updated={counts['updated']} "
+        f"unmatched={counts['unmatched']} elapsed={counts['elapsed_seconds']}s "
+        f"rows/sec={counts['rows_per_second']}"
+    )
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    main()
@@ -0,0 +1,48 @@
+"""
+Re-run stored Stripe webhook events in bulk.
+
+    python -m app.commands.replay_stripe_events                      # everything pending or failed
+    python -m app.commands.replay_stripe_events --type customer.subscription.updated --since 2026-10-01
+    python -m app.commands.replay_stripe_events --event evt_123 --event evt_456 --include-processed
+
+Events are applied per customer in Stripe's creation order, exactly as the webhook path does.
+"""
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime
+from sqlmodel import Session
+from app.database import engine
+from app.models.stripe_event import StripeEventStatus
+from app.services import stripe_event_service
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--event", action="append", dest="event_ids", help="Event id; may be repeated")
+    parser.add_argument("--type", dest="event_type")
+    parser.add_argument("--customer", dest="customer_key", help="Stripe customer id")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only events created at or after this ISO timestamp")
+    parser.add_argument("--include-processed", action="store_true", help="Also re-apply events that already succeeded")
+    args = parser.parse_args(argv)
+
+    statuses = [StripeEventStatus.RECEIVED, StripeEventStatus.FAILED]
+    if args.include_processed:
+        statuses.append(StripeEventStatus.PROCESSED)
+
+    started = time.perf_counter()
+    with Session(engine) as db:
+        counts = stripe_event_service.replay_events(
+            db,
+            event_ids=args.event_ids,
+            event_type=args.event_type,
+            customer_key=args.customer_key,
+            since=args.since,
+            statuses=statuses
+        )
+    elapsed = time.perf_counter() - started
+    print(f"selected={counts['selected']} processed={counts['processed']} failed_customers={counts['failed_customers']} elapsed={elapsed:.2f}s")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    main()
@@ -1,8 +1,8 @@
 import os
-import boto3
 import logging
+from functools import cached_property
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -11,23 +11,145 @@ logger.setLevel(logging.INFO)
 class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "postgresql://postgres:postgres@db:5432/essay_checker"
+    # Serve routers from the asyncpg-backed AsyncSession instead of the sync Session
+    USE_ASYNC_DB: bool = os.getenv('USE_ASYNC_DB', 'False').lower() == 'true'
+    ASYNC_DB_POOL_SIZE: int = 10
+    ASYNC_DB_MAX_OVERFLOW: int = 10
+    # "create_all" (local dev), "alembic" (trust migrations, check revision only) or "none"
+    STARTUP_SCHEMA_MODE: str = "create_all"
     
     # JWT settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Per-process cache of authenticated principals behind get_current_user
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
     
     # OpenAI settings
     OPEN_AI_API_KEY: Optional[str] = None
     OPEN_AI_MODEL: str = "gpt-4o-mini"
     
+    # Blog post section generation: "sequential" (previous section's text as context)
+    # or "parallel" (neighbouring outlines as context, optional stitching pass)
+    SECTION_GENERATION_MODE: str = "sequential"
+    SECTION_CONCURRENCY: int = 4
+    SECTION_STITCHING: bool = True
+    # "auto" (the model router picks the fastest healthy model), or pin "openai" (pydantic_ai agent,
+    # automatic prefix caching), "anthropic" (explicit cache_control) or "fake"
+    SECTION_PROVIDER: str = "auto"
+
+    # Model router: routes are read from ai_providers/ai_models and re-read every REFRESH seconds.
+    # A model is skipped while its error rate over the last WINDOW calls exceeds MAX_ERROR_RATE,
+    # until RETRY seconds pass without a failure
+    MODEL_ROUTER_REFRESH_SECONDS: int = 300
+    MODEL_ROUTER_WINDOW: int = 200
+    MODEL_ROUTER_MIN_SAMPLES: int = 5
+    MODEL_ROUTER_MAX_ERROR_RATE: float = 0.2
+    MODEL_ROUTER_RETRY_SECONDS: int = 30
+    # Minimum AIModel.custom_fields["quality_tier"] per request type
+    MODEL_ROUTER_REQUEST_TIERS: Dict[str, int] = {
+        "content_section": 2,
+        "content_block": 1,
+        "stitch": 1,
+    }
+    
+    # Deadlines: one LLM call may take at most CALL_TIMEOUT seconds, less if the request's own
+    # deadline (a whole post gets POST_DEADLINE seconds) is closer
+    LLM_CALL_TIMEOUT_SECONDS: float = 120.0
+    POST_DEADLINE_SECONDS: float = 600.0
+    # Hedging: if a call hasn't answered (a stream hasn't sent its first token) after the model's
+    # rolling p95, start a second attempt on the next best model and keep whichever finishes first.
+    # The AFTER settings apply until a model has MODEL_ROUTER_MIN_SAMPLES measurements
+    LLM_HEDGING: bool = True
+    LLM_HEDGE_AFTER_SECONDS: float = 30.0
+    LLM_HEDGE_FIRST_TOKEN_AFTER_SECONDS: float = 5.0
+    
+    # Outbound limits per provider (LLM providers by ModelRoute.limiter_key, plus "jina"): an AIMD
+    # concurrency limit between MIN and MAX that halves (BACKOFF) on 429s, 5xx and latency spikes
+    # over LATENCY_TOLERANCE x the usual latency, and grows by one per limit's worth of successes;
+    # plus requests/tokens per minute buckets from RATE_LIMITS (defaults are tier-1 account limits)
+    RATE_LIMITS: Dict[str, Dict[str, float]] = {
+        "openai": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+        "anthropic": {"requests_per_minute": 50, "tokens_per_minute": 40000},
+        "jina": {"requests_per_minute": 200},
+    }
+    RATE_LIMIT_INITIAL_CONCURRENCY: int = 8
+    RATE_LIMIT_MIN_CONCURRENCY: int = 1
+    RATE_LIMIT_MAX_CONCURRENCY: int = 64
+    RATE_LIMIT_BACKOFF: float = 0.5
+    RATE_LIMIT_LATENCY_TOLERANCE: float = 3.0
+    # 429s and 5xx are retried through the limiter; a 429 without Retry-After pauses this long
+    RATE_LIMIT_RETRIES: int = 3
+    RATE_LIMIT_DEFAULT_PAUSE_SECONDS: float = 2.0
+    
+    # LLM response cache: in-process LRU tier in front of a Postgres tier
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PERSISTENT: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    
+    # Shared outbound HTTP transport for the LLM SDK clients
+    LLM_HTTP2: bool = True
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    LLM_HTTP_CONNECT_TIMEOUT: float = 5.0
+    LLM_HTTP_TIMEOUT: float = 600.0
+    # Build the Anthropic/OpenAI SDK clients in the lifespan instead of on first use
+    PRELOAD_LLM_CLIENTS: bool = True
+    
+    # Structured access log: sampling, capped body capture and redaction
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_ERROR_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_BODY_BYTES: int = 1024
+    ACCESS_LOG_BODY_CONTENT_TYPES: str = "application/json"
+    ACCESS_LOG_REDACT_FIELDS: str = "authorization,cookie,set-cookie,stripe-signature,password,token,access_token,api_key,secret"
+    
+    # Uploaded PDF text extraction (process pool size; runs as an SQS job after each upload)
+    PDF_EXTRACTION_WORKERS: int = 2
+    PDF_EXTRACT_ON_UPLOAD: bool = True
+
+    # Retrieval over chunked uploads, sections and briefs ("hashing" is a local, deterministic stand-in for "openai")
+    EMBEDDING_BACKEND: str = "hashing"
+    EMBEDDING_CHUNK_TOKENS: int = 256
+    EMBEDDING_CHUNK_OVERLAP_TOKENS: int = 32
+    # Users with at least this many chunks are searched with the approximate (IVF) index
+    EMBEDDING_ANN_MIN_CHUNKS: int = 20000
+    # Tokens of retrieved reference material added to section prompts; 0 disables retrieval
+    RETRIEVAL_TOKEN_BUDGET: int = 1200
+
+    # Prompt packing: token counts use this `tokenizers` tokenizer, a local tokenizer.json in
+    # TOKENIZER_FILE (the image ships one). Fetching TOKENIZER_NAME from the Hugging Face hub
+    # instead is opt-in, so startup never waits on the network; without either, counts are
+    # estimated. Per-model budgets come from AIModel.custom_fields ("prompt_token_budget", or
+    # "context_window" minus "max_output_tokens")
+    TOKENIZER_NAME: str = "Xenova/gpt-4o"
+    TOKENIZER_FILE: Optional[str] = None
+    TOKENIZER_DOWNLOAD: bool = False
+    DEFAULT_PROMPT_TOKEN_BUDGET: int = 8000
+    # Tokens kept free for the per-section prompt when packing the shared brief context
+    PROMPT_SECTION_RESERVE_TOKENS: int = 2000
+
     # AWS/LocalStack Settings
     USE_LOCALSTACK: bool = os.getenv('USE_LOCALSTACK', 'True').lower() == 'true'
     AWS_REGION: str = os.getenv('AWS_REGION', 'us-west-2')
     SQS_QUEUE_NAME: str = "essay-checker-task-queue"
+    # Records from one SQS batch handled at once by /events
+    SQS_BATCH_CONCURRENCY: int = 5
+    # A record that has failed this many deliveries is dropped instead of retried. The queues'
+    # dead-letter redrive (maxReceiveCount 3) normally takes it first; this covers queues without one
+    SQS_MAX_RECEIVE_COUNT: int = 5
+    # Long-polling worker (python -m app.worker)
+    SQS_WORKER_CONCURRENCY: int = 10
+    SQS_WORKER_VISIBILITY_TIMEOUT: int = 60
+    # Stripe webhooks are stored and acknowledged, then applied by the process_stripe_events
+    # task ("queue") or, without a worker, a background task in the web process ("background")
+    STRIPE_EVENT_PROCESSING: str = "queue"
     
-    @property
+    @cached_property
     def sqs_client(self):
+        # One client per process: building one costs tens of ms, and boto3 clients are thread-safe
         config = {
             'region_name': self.AWS_REGION,
         }
@@ -44,6 +166,8 @@ class Settings(BaseSettings):
                 'aws_secret_access_key': os.getenv('SQS_AWS_SECRET_ACCESS_KEY')
             })
             
+        # boto3 adds hundreds of ms to a cold start; only pay for it when SQS is used
+        import boto3
         return boto3.client('sqs', **config)
 
     @property
@@ -1,14 +1,33 @@
+import re
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from sqlalchemy import text
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
 import os
 from dotenv import load_dotenv
+from .config import settings
 
 load_dotenv()
+logger = logging.getLogger(__name__)
+
+ALEMBIC_VERSIONS_DIR = Path(__file__).resolve().parent.parent / "alembic" / "versions"
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL environment variable is not set")
 
+def get_async_database_url(database_url: str) -> str:
+    """Rewrite a sync PostgreSQL URL to use the asyncpg driver."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if database_url.startswith(prefix):
+            return "postgresql+asyncpg://" + database_url[len(prefix):]
+    return database_url
+
 # Configure engine with PostgreSQL-specific settings
 engine = create_engine(
     DATABASE_URL,
@@ -16,9 +35,63 @@ engine = create_engine(
     pool_recycle=300,    # Recycle connections every 5 minutes
 )
 
+# Async engine is created lazily by SQLAlchemy; no connection is opened until first use
+async_engine = create_async_engine(
+    get_async_database_url(DATABASE_URL),
+    pool_pre_ping=True,
+    pool_recycle=300,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+)
+
 def get_db():
     with Session(engine) as session:
         try:
             yield session
         finally:
             session.close()
+
+async def get_async_db():
+    # expire_on_commit=False so attributes stay readable after commit without an implicit (sync) refresh
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+# Dependency used by routers; flip USE_ASYNC_DB to benchmark the two paths side by side
+get_session = get_async_db if settings.USE_ASYNC_DB else get_db
+
+def get_expected_schema_revision(versions_dir: Path = ALEMBIC_VERSIONS_DIR) -> Optional[str]:
+    """
+    Head revision of the migration scripts, found by reading the revision ids straight from
+    the files rather than loading Alembic. Returns None if the versions dir isn't deployed.
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text()
+        revision = re.search(r"^revision(?::\s*str)?\s*=\s*['\"]([^'\"]+)['\"]", source, re.M)
+        down_revision = re.search(r"^down_revision(?::[^=]+)?=\s*['\"]([^'\"]+)['\"]", source, re.M)
+        if revision:
+            revisions.add(revision.group(1))
+        if down_revision:
+            parents.add(down_revision.group(1))
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+@lru_cache(maxsize=1)
+def check_schema_version() -> bool:
+    """
+    Compare the database's alembic_version with the deployed migrations. Cached for the
+    life of the process so it costs one small query per cold start.
+    """
+    expected = get_expected_schema_revision()
+    if expected is None:
+        logger.warning("Could not determine expected schema revision; skipping schema check")
+        return True
+    with engine.connect() as connection:
+        current = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    if current != expected:
+        logger.error(f"Database schema is at revision {current}, expected {expected}. Run `alembic upgrade head`.")
+        return False
+    return True
+
+def create_db_and_tables():
+    SQLModel.metadata.create_all(engine)
@@ -4,7 +4,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session
 from jose import JWTError, jwt
 
-from .database import engine
+from .database import engine, get_async_db, get_session
 from .config import settings
 from .schemas import TokenData
 
@@ -1,16 +1,19 @@
+import time
+_import_started = time.perf_counter()
+
 import os
 from dotenv import load_dotenv
-from fastapi import FastAPI, Depends, HTTPException, Request, status, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, status, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, OAuth2PasswordBearer, OAuth2PasswordRequestForm
 import logging
 import sys
 from .schemas.user import User
 from .schemas.token import Token
 from .auth import create_access_token, get_current_user
-from .database import engine, get_db
-from sqlmodel import SQLModel
+from .database import async_engine, get_db, create_db_and_tables, check_schema_version
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import auth, content, content_briefs, content_sections, events, uploads, agents, webhooks
+from .routers import auth, content, content_briefs, content_sections, events, uploads, agents, webhooks, jobs
 from .auth import (
     get_current_user,
     create_access_token,
@@ -18,14 +21,71 @@ from .auth import (
 )
 from contextlib import asynccontextmanager
 from .config import settings
+from .access_log import AccessLogMiddleware, start_access_log_listener
+from .clients.http import get_http_client, close_http_client
+from .services.pdf_extraction_service import shutdown_executor as shutdown_pdf_executor
+from .clients.anthropic import get_async_anthropic_client
+from .clients.openai import get_async_openai_client
+from .services.token_service import get_tokenizer
+
+def prepare_schema():
+    # "create_all" reflects every table on each boot; "alembic" trusts migrations and only
+    # checks the recorded revision; "none" skips the database entirely
+    if settings.STARTUP_SCHEMA_MODE == "create_all":
+        create_db_and_tables()
+    elif settings.STARTUP_SCHEMA_MODE == "alembic":
+        try:
+            check_schema_version()
+        except Exception as e:
+            logger.error(f"Schema version check failed: {str(e)}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):    
     print("Starting up...")    
+    timings = {"import": (_lifespan_ready - _import_started) * 1000}
+    access_log_listener = start_access_log_listener()
+
+    started = time.perf_counter()
+    prepare_schema()
+    timings["schema"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    # One shared keep-alive transport for every async LLM client
+    app.state.http_client = get_http_client()
+    timings["http_client"] = (time.perf_counter() - started) * 1000
+
+    # On Lambda the SDK imports would land on every cold start; there the
+    # clients are built by their getters on first use instead
+    started = time.perf_counter()
+    if settings.PRELOAD_LLM_CLIENTS:
+        try:
+            app.state.anthropic_client = get_async_anthropic_client()
+        except ValueError as e:
+            logger.warning(f"Anthropic client not initialised: {str(e)}")
+        try:
+            app.state.openai_client = get_async_openai_client()
+        except ValueError as e:
+            logger.warning(f"OpenAI client not initialised: {str(e)}")
+    timings["llm_clients"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    if settings.PRELOAD_LLM_CLIENTS:
+        # Loaded once so the first prompt budget isn't paid for inside a request
+        get_tokenizer()
+    timings["tokenizer"] = (time.perf_counter() - started) * 1000
+
+    app.state.startup_timings = timings
+    logger.info("Startup phases (ms): " + ", ".join(f"{phase}={ms:.1f}" for phase, ms in timings.items()))
     yield
     print("Shutting down...")    
+    await close_http_client()
+    shutdown_pdf_executor()
+    await async_engine.dispose()
+    # Flush queued access log records
+    access_log_listener.stop()
 
-app = FastAPI(lifespan=lifespan)
+# orjson renders responses several times faster than the stdlib encoder json.dumps uses
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -50,15 +110,8 @@ app.add_middleware(
     expose_headers=["*"],
     max_age=600,
 )
+app.add_middleware(AccessLogMiddleware)
 
-# Database
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
-
-# Update app startup
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
 
 # Security
 security = HTTPBearer()
@@ -75,24 +128,11 @@ app.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
 app.include_router(content.router, prefix="/contents", tags=["contents"])
 app.include_router(content_briefs.router, prefix="/content-briefs", tags=["content-briefs"])
 app.include_router(content_sections.router, prefix="/content-sections", tags=["content-sections"])
+app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 
 @app.get("/")
 async def root():    
     return {"message": "Welcome to Groucho API"}
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logger.info(f"Incoming request: {request.method} {request.url}")
-    logger.info(f"Headers: {dict(request.headers)}")
-    
-    try:
-        if request.method != "OPTIONS":  # Only try to read body for non-OPTIONS requests
-            body = await request.body()
-            logger.info(f"Request body: {body.decode()}")
-    except Exception as e:
-        logger.error(f"Error reading request body: {str(e)}")
-    
-    response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
-    
-    return response
+# End of module-level setup; the lifespan reports the import phase up to here
+_lifespan_ready = time.perf_counter()
@@ -9,6 +9,12 @@ from .ai_model import AIModel
 from .ai_provider import AIProvider
 from .prompt import Prompt
 from .content_series import ContentSeries
+from .llm_cache_entry import LLMCacheEntry
+from .job import Job
+from .stripe_event import StripeEvent
+from .upload import Upload
+from .upload_page import UploadPage
+from .embedding_chunk import EmbeddingChunk
 
 __all__ = [
     "User",
@@ -21,5 +27,11 @@ __all__ = [
     "AIModel",
     "AIProvider",
     "Prompt",
-    "ContentSeries"
+    "ContentSeries",
+    "LLMCacheEntry",
+    "Job",
+    "StripeEvent",
+    "Upload",
+    "UploadPage",
+    "EmbeddingChunk"
 ]
\ No newline at end of file
@@ -1,10 +1,12 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime, UTC
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, JSON, Index
 
 class Content(SQLModel, table=True):
     __tablename__ = "contents"
+    # Backs the keyset-paginated listing: WHERE user_id = ? AND (created_at, id) < (?, ?)
+    __table_args__ = (Index("ix_contents_user_id_created_at_id", "user_id", "created_at", "id"),)
     id: int = Field(primary_key=True)
     content_series_id: Optional[int] = Field(foreign_key="content_series.id", nullable=True)
     user_id: int = Field(foreign_key="users.id", index=True)
@@ -22,6 +22,10 @@ class ContentBrief(SQLModel, table=True):
     custom_data: Dict[str, Any] = Field(
         default_factory=dict, sa_column=Column(JSON)
     )
+    # Token counts of the prompt fields, computed on save (see token_service.brief_token_counts)
+    token_counts: Dict[str, Any] = Field(
+        default_factory=dict, sa_column=Column(JSON)
+    )
 
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -0,0 +1,36 @@
+from typing import Optional
+from datetime import datetime, UTC
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, Index, LargeBinary
+
+class EmbeddingChunkSource:
+    UPLOAD = "upload"
+    CONTENT_SECTION = "content_section"
+    CONTENT_BRIEF = "content_brief"
+
+class EmbeddingChunk(SQLModel, table=True):
+    """
+    One chunk of indexed text and its embedding, stored as raw float32 bytes so a user's
+    whole index loads into a single NumPy matrix.
+    """
+    __tablename__ = "embedding_chunks"
+    # Loading a user's index: WHERE user_id = ? AND embedder = ?
+    __table_args__ = (
+        Index("ix_embedding_chunks_user_id_embedder", "user_id", "embedder"),
+        Index("ix_embedding_chunks_source", "source_type", "source_id"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    source_type: str = Field(max_length=32)
+    source_id: int
+    # Set for sections and briefs so retrieval can leave out the piece being written
+    content_id: Optional[int] = Field(default=None, nullable=True)
+    chunk_index: int = Field(default=0)
+    text: str
+    token_count: int = Field(default=0)
+    # sha256 of the whole source text; unchanged sources are not re-embedded
+    text_sha256: str = Field(max_length=64)
+    embedder: str = Field(max_length=100)
+    dim: int
+    vector: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -0,0 +1,31 @@
+from typing import Optional, Dict, Any
+from datetime import datetime, UTC
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, JSON, DateTime
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(SQLModel, table=True):
+    __tablename__ = "jobs"
+    # uuid4 hex; handed to clients in the 202 response and used to poll GET /jobs/{id}
+    id: str = Field(primary_key=True, max_length=32)
+    user_id: Optional[int] = Field(default=None, foreign_key="users.id", index=True)
+    task: str
+    status: str = Field(default=JobStatus.QUEUED, index=True)
+    # 0.0 - 1.0, updated by the task handler as it goes
+    progress: float = Field(default=0.0)
+    attempts: int = Field(default=0)
+    payload: Dict[str, Any] = Field(
+        default_factory=dict, sa_column=Column(JSON)
+    )
+    result: Optional[Dict[str, Any]] = Field(
+        default=None, sa_column=Column(JSON)
+    )
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=DateTime(timezone=True))
+    started_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    finished_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
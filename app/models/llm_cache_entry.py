@@ -0,0 +1,16 @@
+from typing import Dict, Any
+from datetime import datetime, UTC
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, JSON, DateTime
+
+class LLMCacheEntry(SQLModel, table=True):
+    __tablename__ = "llm_cache_entries"
+    # sha256 of model, prompts, tools and temperature
+    key: str = Field(primary_key=True, max_length=64)
+    model: str
+    response: Dict[str, Any] = Field(
+        default_factory=dict, sa_column=Column(JSON)
+    )
+    hit_count: int = Field(default=0)
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True), index=True)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=DateTime(timezone=True))
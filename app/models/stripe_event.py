@@ -0,0 +1,29 @@
+from typing import Optional, Dict, Any
+from datetime import datetime, UTC
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, JSON, DateTime, Index
+
+class StripeEventStatus:
+    RECEIVED = "received"
+    PROCESSED = "processed"
+    FAILED = "failed"
+
+class StripeEvent(SQLModel, table=True):
+    """Verified webhook events, keyed by Stripe's event id so redeliveries are recognised."""
+    __tablename__ = "stripe_events"
+    # Pending events are drained per customer in Stripe's creation order
+    __table_args__ = (Index("ix_stripe_events_customer_key_status_created", "customer_key", "status", "created"),)
+    id: str = Field(primary_key=True, max_length=255)
+    type: str = Field(index=True)
+    # Stripe customer id, or the event id for events not tied to a customer
+    customer_key: str = Field(max_length=255)
+    payload: Dict[str, Any] = Field(
+        default_factory=dict, sa_column=Column(JSON)
+    )
+    status: str = Field(default=StripeEventStatus.RECEIVED)
+    attempts: int = Field(default=0)
+    error: Optional[str] = None
+    # Stripe's own event timestamp
+    created: datetime = Field(sa_type=DateTime(timezone=True))
+    received_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=DateTime(timezone=True))
+    processed_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
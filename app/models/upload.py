@@ -1,17 +1,26 @@
 from datetime import datetime, UTC
 from typing import Optional
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 
 class Upload(SQLModel, table=True):
     __tablename__ = "uploads"
+    # Backs the keyset-paginated listing: WHERE user_id = ? AND (upload_date, id) < (?, ?)
+    __table_args__ = (Index("ix_uploads_user_id_upload_date_id", "user_id", "upload_date", "id"),)
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")
     file_path: str
     original_filename: str
     file_size: int
+    # Hex SHA-256 of the content; identical uploads share one file under uploads/pdfs/sha256/
+    sha256: Optional[str] = Field(default=None, max_length=64, index=True)
     mime_type: str
     description: Optional[str] = None
     upload_date: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    # Set by the text extraction stage; pages live in upload_pages under the same sha256
+    page_count: Optional[int] = None
+    extracted_at: Optional[datetime] = None
+    extraction_error: Optional[str] = None
     
     # Remove the relationship with User but keep the foreign key 
\ No newline at end of file
@@ -0,0 +1,14 @@
+from datetime import datetime, UTC
+from sqlmodel import SQLModel, Field
+
+class UploadPage(SQLModel, table=True):
+    """
+    Extracted text of one PDF page. Keyed by the content hash rather than the upload, so
+    every Upload with the same sha256 shares one set of pages and a PDF is parsed once.
+    """
+    __tablename__ = "upload_pages"
+    sha256: str = Field(primary_key=True, max_length=64)
+    page_number: int = Field(primary_key=True)
+    text: str
+    char_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -1,5 +1,10 @@
+import asyncio
+from app.config import settings
 from app.schemas import BlogPostRequest, BlogPostResponse
 from app.services import content_brief_service, content_outline_service, content_section_service
+from app.services.content_section_service import PromptCacheUsage
+from app.services.deadline_service import deadline
+from app.orchestrators.section_scheduler import SectionScheduler, ScheduleResult, build_dependencies, SEQUENTIAL, PARALLEL
 
 def create_brief(request: BlogPostRequest):
     return content_brief_service.create_content_brief(request.brief_data)
@@ -7,34 +12,79 @@ def create_brief(request: BlogPostRequest):
 def generate_outline(topic: str, content_brief):
     return content_outline_service.generate_outline(topic, content_brief)
 
-def generate_sections(outline, content_brief):
-    sections = []
-    for idx, outline_section in enumerate(outline.sections):
-        previous_section = sections[idx - 1] if idx > 0 else None
+async def generate_sections(
+    outline,
+    content_brief,
+    mode: str = None,
+    concurrency: int = None,
+    stitch: bool = None,
+    usage: PromptCacheUsage = None
+) -> ScheduleResult:
+    mode = mode or settings.SECTION_GENERATION_MODE
+    concurrency = concurrency or settings.SECTION_CONCURRENCY
+    stitch = settings.SECTION_STITCHING if stitch is None else stitch
+    outline_sections = outline.sections
+
+    async def generate(idx: int, completed: dict) -> str:
+        previous_section = completed.get(idx - 1) if mode == SEQUENTIAL else None
+        previous_outline_section = outline_sections[idx - 1] if idx > 0 else None
         next_outline_section = (
-            outline.sections[idx + 1] if idx < len(outline.sections) - 1 else None
+            outline_sections[idx + 1] if idx < len(outline_sections) - 1 else None
         )
-        section = content_section_service.generate_content_section(
+        section = await content_section_service.generate_content_section(
             content_brief=content_brief,
-            current_outline_section=outline_section,
+            current_outline_section=outline_sections[idx],
             previous_section=previous_section,
-            next_outline_section=next_outline_section
+            next_outline_section=next_outline_section,
+            previous_outline_section=previous_outline_section
         )
-        sections.append(section)
-    return sections
+        if usage is not None:
+            usage.add(section["usage"])
+        return section["content_block"].content_block
+
+    scheduler = SectionScheduler(concurrency=concurrency)
+    result = await scheduler.run(build_dependencies(len(outline_sections), mode), generate)
+
+    if mode == PARALLEL and stitch and len(result.sections) > 1:
+        result.sections = await stitch_sections(result.sections, concurrency)
+    return result
+
+async def stitch_sections(sections: list[str], concurrency: int) -> list[str]:
+    """Smooth the transition at every section boundary; the last section is left as-is."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def stitch(idx: int) -> str:
+        async with semaphore:
+            return await content_section_service.stitch_transition(sections[idx], sections[idx + 1])
+
+    stitched = await asyncio.gather(*(stitch(idx) for idx in range(len(sections) - 1)))
+    return list(stitched) + [sections[-1]]
 
 def assemble_full_content(sections):
     return "\n\n".join(sections)
 
-def generate_blog_post(request: BlogPostRequest) -> BlogPostResponse:
+async def generate_blog_post(request: BlogPostRequest) -> BlogPostResponse:
     brief = create_brief(request)
     outline = generate_outline(request.topic, brief)
-    sections = generate_sections(outline, brief)
-    full_content = assemble_full_content(sections)
-    
+    usage = PromptCacheUsage()
+    # Every section call (and hedge, and stitch) gets what is left of the post's budget
+    with deadline(request.deadline_seconds or settings.POST_DEADLINE_SECONDS):
+        result = await generate_sections(
+            outline,
+            brief,
+            mode=request.section_mode,
+            concurrency=request.section_concurrency,
+            stitch=request.stitch_sections,
+            usage=usage
+        )
+    full_content = assemble_full_content(result.sections)
+
     return BlogPostResponse(
         content_brief=brief,
         outline=outline,
-        sections=sections,
-        full_content=full_content
+        sections=result.sections,
+        full_content=full_content,
+        section_timings=[timing.__dict__ for timing in result.timings],
+        sections_ms=result.total_ms,
+        prompt_cache=usage.as_dict()
     )
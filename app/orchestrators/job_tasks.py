@@ -0,0 +1,39 @@
+import asyncio
+from sqlmodel import Session
+from app.models.job import Job
+from app.services import job_service
+from app.services.job_service import job_task
+
+GENERATE_CONTENT_BLOCK = "generate_content_block"
+GENERATE_CONTENT_SECTION = "generate_content_section"
+EXTRACT_UPLOAD_TEXT = "extract_upload_text"
+
+@job_task
+async def generate_content_block(job: Job, db: Session) -> dict:
+    from app.agents.content_writer_agent import Deps, run_content_writer
+    from app.services.content_section_service import system_prompt
+    from app.services.model_router_service import CONTENT_BLOCK_REQUEST
+    response = await run_content_writer(job.payload["prompt"], CONTENT_BLOCK_REQUEST, deps=Deps(system_prompt=system_prompt))
+    return {"content": response.data.model_dump()}
+
+@job_task
+async def generate_content_section(job: Job, db: Session) -> dict:
+    from app.services.content_section_service import generate_content_section
+    job_service.set_progress(db, job, 0.1)
+    section = await generate_content_section(**job.payload)
+    return {
+        "content_block": section["content_block"].model_dump(),
+        "usage": section["usage"].as_dict()
+    }
+
+@job_task
+async def extract_upload_text(job: Job, db: Session) -> dict:
+    from app.models.embedding_chunk import EmbeddingChunkSource
+    from app.services import embedding_service
+    from app.services.pdf_extraction_service import extract_uploads
+    counts = await extract_uploads(db, upload_ids=[job.payload["upload_id"]])
+    # Make the new text retrievable for briefs straight away
+    counts["chunks"] = await asyncio.to_thread(
+        embedding_service.index_in_background, EmbeddingChunkSource.UPLOAD, job.payload["upload_id"]
+    )
+    return counts
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Set
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SEQUENTIAL = "sequential"
+PARALLEL = "parallel"
+
+@dataclass
+class SectionTiming:
+    index: int
+    queued_ms: float
+    duration_ms: float
+
+@dataclass
+class ScheduleResult:
+    sections: List[str]
+    timings: List[SectionTiming] = field(default_factory=list)
+    total_ms: float = 0.0
+
+def build_dependencies(count: int, mode: str) -> Dict[int, Set[int]]:
+    """
+    Sequential mode chains every section to the one before it (it needs the previous section's text).
+    Parallel mode has no edges: each section is conditioned on its neighbours' outlines instead.
+    """
+    if mode == SEQUENTIAL:
+        return {idx: ({idx - 1} if idx > 0 else set()) for idx in range(count)}
+    if mode == PARALLEL:
+        return {idx: set() for idx in range(count)}
+    raise ValueError(f"Unsupported section generation mode: {mode}")
+
+class SectionScheduler:
+    """
+    Runs section generation as a dependency graph with at most `concurrency` sections in flight.
+    `generate(idx, completed)` receives the texts of all sections finished so far.
+    """
+    def __init__(self, concurrency: int = 4):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+
+    async def run(
+        self,
+        dependencies: Dict[int, Set[int]],
+        generate: Callable[[int, Dict[int, str]], Awaitable[str]],
+    ) -> ScheduleResult:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done: Dict[int, asyncio.Event] = {idx: asyncio.Event() for idx in dependencies}
+        completed: Dict[int, str] = {}
+        timings: Dict[int, SectionTiming] = {}
+        started = time.perf_counter()
+
+        async def run_one(idx: int) -> None:
+            for dependency in dependencies[idx]:
+                await done[dependency].wait()
+            async with semaphore:
+                section_started = time.perf_counter()
+                completed[idx] = await generate(idx, completed)
+                finished = time.perf_counter()
+            timings[idx] = SectionTiming(
+                index=idx,
+                queued_ms=(section_started - started) * 1000,
+                duration_ms=(finished - section_started) * 1000,
+            )
+            logger.info(f"Section {idx} generated in {timings[idx].duration_ms:.0f}ms")
+            done[idx].set()
+
+        tasks = [asyncio.create_task(run_one(idx)) for idx in dependencies]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        order = sorted(dependencies)
+        return ScheduleResult(
+            sections=[completed[idx] for idx in order],
+            timings=[timings[idx] for idx in order],
+            total_ms=(time.perf_counter() - started) * 1000,
+        )
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Request, Depends, BackgroundTasks, HTTPException
+from fastapi import APIRouter, Request, Depends, BackgroundTasks, HTTPException, Query, Response, status
 from sqlmodel import Session
 from ..dependencies import get_db
+from ..auth import get_current_user
+from ..schemas.principal import Principal
 from ..config import settings  # Import settings to check environment
 import json
 import logging
 
 from pydantic import BaseModel
-from app.agents.content_writer_agent import content_writer_agent
+from app.agents.content_writer_agent import Deps, run_content_writer
+from app.services.model_router_service import CONTENT_BLOCK_REQUEST, model_router
+from app.services.llm_cache_service import llm_cache
+from app.services import job_service
+from app.orchestrators.job_tasks import GENERATE_CONTENT_BLOCK
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -38,10 +44,43 @@ n/a
 '''
 
 @router.post("/content-writer-agent/generate-content-block")
-async def generate_content_block():
+async def generate_content_block(
+    response: Response,
+    background: bool = Query(False, description="Enqueue the generation and return 202 with a job id"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    if background:
+        job = await job_service.enqueue(db, GENERATE_CONTENT_BLOCK, {"prompt": prompt}, user_id=current_user.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return job_service.accepted(job)
     try:
-        response = await content_writer_agent.run(prompt)
-        return {"content": response.data}
+        from app.services.content_section_service import system_prompt
+        result = await run_content_writer(prompt, CONTENT_BLOCK_REQUEST, deps=Deps(system_prompt=system_prompt))
+        return {"content": result.data}
     except Exception as e:
         logger.error(f"Error generating content: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/models/routes")
+async def get_model_routes():
+    """Registered models with their rolling p50/p95 latency, error rate and health."""
+    return model_router.snapshot()
+
+@router.get("/models/hedging")
+async def get_hedging_stats():
+    """Per request type: calls, how many were hedged, which attempt won, and the estimated time saved."""
+    from app.services.hedging_service import hedge_stats
+    return hedge_stats.as_dict()
+
+@router.get("/models/limits")
+async def get_rate_limits():
+    """Per provider: the adaptive concurrency limit, requests in flight, outcomes and time spent queueing."""
+    from app.clients.rate_limit import limiter_snapshot
+    return limiter_snapshot()
+
+@router.get("/cache/stats")
+async def get_cache_stats(current_user: Principal = Depends(get_current_user)):
+    """Hit/miss counters for the LLM response cache."""
+    return llm_cache.stats()
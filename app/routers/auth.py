@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status, Request
 from fastapi.responses import RedirectResponse
 from sqlmodel import Session, select
-from app.database import get_db
+from app.database import get_session
+from app.config import settings
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserMeResponse
 from app.auth import (
@@ -14,6 +15,7 @@ from app.auth import (
     ALGORITHM
 )
 from app.schemas.token import Token
+from app.schemas.principal import Principal
 import logging
 import os
 from jose import jwt, JWTError
@@ -25,7 +27,7 @@ logger = logging.getLogger(__name__)
 async def register_user(
     request: Request,
     user: UserCreate, 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     # Log the request details
     body = await request.json()
@@ -36,7 +38,10 @@ async def register_user(
     
     try:
         statement = select(User).where(User.email == user.email)
-        db_user = db.exec(statement).first()
+        if settings.USE_ASYNC_DB:
+            db_user = (await db.exec(statement)).first()
+        else:
+            db_user = db.exec(statement).first()
         
         if db_user:
             logger.warning(f"Attempted registration with existing email: {user.email}")
@@ -44,8 +49,12 @@ async def register_user(
         
         db_user = User(email=user.email)
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        if settings.USE_ASYNC_DB:
+            await db.commit()
+            await db.refresh(db_user)
+        else:
+            db.commit()
+            db.refresh(db_user)
         
         magic_token = create_magic_token(user_id=db_user.id)
         
@@ -65,10 +74,13 @@ async def register_user(
 async def login_user(
     request: Request,
     user: UserLogin, 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     statement = select(User).where(User.email == user.email)
-    db_user = db.exec(statement).first()
+    if settings.USE_ASYNC_DB:
+        db_user = (await db.exec(statement)).first()
+    else:
+        db_user = db.exec(statement).first()
     
     if not db_user:
         raise HTTPException(status_code=400, detail="Email not registered")
@@ -87,14 +99,18 @@ async def login_user(
     return {"msg": "Check your email for your login link."}
 
 @router.get("/verify", response_model=Token)
-async def verify_magic_link(token: str, db: Session = Depends(get_db)):
+async def verify_magic_link(token: str, db: Session = Depends(get_session)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        user = db.exec(select(User).where(User.id == int(user_id))).first()
+        statement = select(User).where(User.id == int(user_id))
+        if settings.USE_ASYNC_DB:
+            user = (await db.exec(statement)).first()
+        else:
+            user = db.exec(statement).first()
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
             
@@ -104,5 +120,5 @@ async def verify_magic_link(token: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=401, detail="Invalid token")
 
 @router.get("/me", response_model=UserMeResponse)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
     return current_user 
\ No newline at end of file
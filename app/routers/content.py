@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from sqlmodel import Session
-from ..dependencies import get_db
+from ..dependencies import get_session
+from ..config import settings
 from ..models.content import Content
+from ..auth import get_current_user
+from ..schemas.principal import Principal
+from ..schemas.content import ContentRead
+from ..services.pagination_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields
+from ..services.export_service import NDJSON, MEDIA_TYPES, export_statement, stream_export
 from ..services import content_service
 import logging
 
@@ -9,13 +17,16 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-@router.post("/", response_model=Content)
+@router.post("/", response_model=ContentRead)
 async def create_content(
     content: Content,
-    db: Session = Depends(get_db) 
+    db: Session = Depends(get_session) 
 ):
     try:
-        content = content_service.create(db=db, content=content)
+        if settings.USE_ASYNC_DB:
+            content = await content_service.create_async(db=db, content=content)
+        else:
+            content = content_service.create(db=db, content=content)
         return content
     except Exception as e:
         logger.error(f"Failed to create content: {str(e)}")
@@ -23,22 +34,52 @@ async def create_content(
 
 @router.get("/")
 async def get_all(
-    db: Session = Depends(get_db)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns; text and custom_data are excluded by default"),
+    db: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
-        contents = content_service.get_all(db=db)
+        if settings.USE_ASYNC_DB:
+            contents = await content_service.list_for_user_async(db=db, user_id=current_user.id, limit=limit, cursor=cursor, fields=fields)
+        else:
+            contents = content_service.list_for_user(db=db, user_id=current_user.id, limit=limit, cursor=cursor, fields=fields)
         return contents
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get all contents: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get all contents")
 
-@router.get("/{content_id}")
+@router.get("/export")
+async def export_contents(
+    format: str = Query(NDJSON, pattern="^(ndjson|json)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns; text and custom_data are excluded by default"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Stream all of the user's contents as NDJSON or a chunked JSON array, without building the list in memory."""
+    statement = export_statement(
+        Content,
+        fields=parse_fields(fields, Content, default=content_service.LIST_FIELDS, required=content_service.KEYSET_FIELDS),
+        filters=[Content.user_id == current_user.id],
+        sort_field="created_at"
+    )
+    return StreamingResponse(
+        stream_export(statement, format=format, use_async=settings.USE_ASYNC_DB),
+        media_type=MEDIA_TYPES[format]
+    )
+
+@router.get("/{content_id}", response_model=ContentRead)
 async def get(
     content_id: int = Path(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     try:
-        content = content_service.get(db=db, content_id=content_id)
+        if settings.USE_ASYNC_DB:
+            content = await content_service.get_async(db=db, content_id=content_id)
+        else:
+            content = content_service.get(db=db, content_id=content_id)
         return content
     except Exception as e:
         logger.error(f"Failed to get content for ID {content_id}: {str(e)}")
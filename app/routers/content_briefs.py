@@ -1,35 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path
 from sqlmodel import Session
-from ..dependencies import get_db
+from ..dependencies import get_session
+from ..config import settings
 from ..models.content_brief import ContentBrief
+from ..schemas.content_brief import ContentBriefRead
 from ..services import content_brief_service
-from ..services.content_brief_service import get_content_brief_by_id
+from ..services.content_brief_service import get_content_brief_by_id, get_content_brief_by_id_async
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-@router.post("/", response_model=ContentBrief)
+@router.post("/", response_model=ContentBriefRead)
 async def create(
     content_brief: ContentBrief,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_session)
 ):
     try:
         # Create a new content brief using the service
-        content_brief = content_brief_service.create(db=db, content_brief=content_brief)
+        if settings.USE_ASYNC_DB:
+            content_brief = await content_brief_service.create_async(db=db, content_brief=content_brief)
+        else:
+            content_brief = content_brief_service.create(db=db, content_brief=content_brief)
+        # Imported here: NumPy stays off the cold-start path
+        from ..models.embedding_chunk import EmbeddingChunkSource
+        from ..services.embedding_service import index_in_background
+        background_tasks.add_task(index_in_background, EmbeddingChunkSource.CONTENT_BRIEF, content_brief.id)
         return content_brief
     except Exception as e:
         logger.error(f"Failed to create content brief: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create content brief")
 
-@router.get("/{content_brief_id}")
+@router.get("/{content_brief_id}", response_model=ContentBriefRead)
 async def get(
     content_brief_id: int = Path(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     try:
-        content_brief = get_content_brief_by_id(db=db, content_brief_id=content_brief_id)
+        if settings.USE_ASYNC_DB:
+            content_brief = await get_content_brief_by_id_async(db=db, content_brief_id=content_brief_id)
+        else:
+            content_brief = get_content_brief_by_id(db=db, content_brief_id=content_brief_id)
         return content_brief
     except Exception as e:
         logger.error(f"Failed to get content brief for ID {content_brief_id}: {str(e)}")
@@ -1,19 +1,110 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
 from sqlmodel import Session
 from ..dependencies import get_db
+from ..auth import get_current_user
+from ..schemas.principal import Principal
 from ..config import settings
+import json
 import logging
+from ..services import job_service
+from ..orchestrators.job_tasks import GENERATE_CONTENT_SECTION
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+class ContentSectionStreamRequest(BaseModel):
+    content_id: int
+    content_outline_section_id: int
+    order: int = 0
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @router.post("/new")
-async def generate_content_section():
+async def generate_content_section(
+    response: Response,
+    background: bool = Query(False, description="Enqueue the generation and return 202 with a job id"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    if background:
+        job = await job_service.enqueue(db, GENERATE_CONTENT_SECTION, user_id=current_user.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return job_service.accepted(job)
     try:
         from app.services.content_section_service import generate_content_section
-        response = await generate_content_section()
-        return {"content_block": response.data}
+        section = await generate_content_section()
+        return {"content_block": section["content_block"]}
     except Exception as e:
         logger.error(f"Error generating content: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stream")
+async def stream_content_section(
+    request: ContentSectionStreamRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Stream a generated section to the client over Server-Sent Events.
+    Emits `token` events with text deltas, then a `done` event once the section is saved.
+    """
+    from app.models.embedding_chunk import EmbeddingChunkSource
+    from app.services import embedding_service
+    from app.services.model_router_service import SECTION_REQUEST, model_router
+    from app.services.content_section_service import (
+        StreamedSection,
+        build_prompts,
+        get_section_context,
+        save_content_section,
+        stream_content_section as stream_section
+    )
+
+    def prepare():
+        # Sync DB queries, retrieval, the index build and tokenizing: all of it off the event loop
+        context = get_section_context(
+            db=db,
+            content_id=request.content_id,
+            content_outline_section_id=request.content_outline_section_id,
+            user_id=current_user.id
+        )
+        route = model_router.select(SECTION_REQUEST)
+        section_system_prompt, _, prompt = build_prompts(model=route.model, **context)
+        return route, section_system_prompt, prompt
+
+    # Resolved before streaming starts so a bad or foreign id is a normal 404, not a broken stream
+    route, section_system_prompt, prompt = await run_in_threadpool(prepare)
+
+    async def event_stream():
+        streamed = StreamedSection()
+        try:
+            async for delta in stream_section(prompt, section_system_prompt, route, streamed):
+                yield sse_event("token", {"text": delta})
+            if streamed.text is None:
+                raise RuntimeError("Stream ended without a result")
+
+            content_section = await run_in_threadpool(
+                save_content_section,
+                content_id=request.content_id,
+                content_outline_section_id=request.content_outline_section_id,
+                order=request.order,
+                text=streamed.text
+            )
+            yield sse_event("done", {"content_section_id": content_section.id})
+            # After "done" so the client isn't kept waiting on embedding the new section
+            await run_in_threadpool(
+                embedding_service.index_in_background, EmbeddingChunkSource.CONTENT_SECTION, content_section.id
+            )
+        except Exception as e:
+            logger.error(f"Error streaming content section: {str(e)}")
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
\ No newline at end of file
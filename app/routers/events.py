@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Request, Depends, BackgroundTasks
 from sqlmodel import Session
 from ..dependencies import get_db
+from ..database import engine
 from ..config import settings  # Import settings to check environment
+import asyncio
 import json
 import logging
+import time
+from ..orchestrators import job_tasks
+from ..services import stripe_event_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -11,33 +16,83 @@ logger.setLevel(logging.INFO)
 
 TASK_HANDLERS = {
     # 'process_essay_evaluation': process_essay_evaluation,
+    job_tasks.GENERATE_CONTENT_BLOCK: job_tasks.generate_content_block,
+    job_tasks.GENERATE_CONTENT_SECTION: job_tasks.generate_content_section,
+    job_tasks.EXTRACT_UPLOAD_TEXT: job_tasks.extract_upload_text,
+    stripe_event_service.PROCESS_STRIPE_EVENTS: stripe_event_service.process_stripe_events_task,
 }
 
+class DiscardMessage(Exception):
+    """The message can never succeed (bad JSON, unknown task); acknowledge it instead of retrying."""
+
+async def run_task(body: str) -> str:
+    """Decode an SQS message body and run its handler with a session of its own. Returns the task name."""
+    try:
+        message = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise DiscardMessage(f"Invalid JSON: {str(e)}")
+    if not isinstance(message, dict):
+        raise DiscardMessage(f"Expected a JSON object, got {type(message).__name__}")
+    task_name = message.get('task')
+    handler = TASK_HANDLERS.get(task_name)
+    if handler is None:
+        raise DiscardMessage(f"Unknown task type: {task_name}")
+    # Records run concurrently, and a sync Session must not be shared between them
+    with Session(engine) as db:
+        await handler(message, db)
+    return task_name
+
+async def process_record(record: dict, semaphore: asyncio.Semaphore) -> dict:
+    """Run one SQS record and return its metrics; never raises."""
+    metrics = {
+        "message_id": record.get('messageId'),
+        "task": None,
+        "receive_count": int(record.get('attributes', {}).get('ApproximateReceiveCount', 1)),
+    }
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            metrics["task"] = await run_task(record['body'])
+            metrics["outcome"] = "succeeded"
+        except DiscardMessage as e:
+            metrics["outcome"] = "discarded"
+            metrics["error"] = str(e)
+        except Exception as e:
+            # Past the limit, retrying would repeat the same (LLM) work until the message expires
+            exhausted = metrics["receive_count"] >= settings.SQS_MAX_RECEIVE_COUNT
+            metrics["outcome"] = "discarded" if exhausted else "failed"
+            metrics["error"] = str(e)
+        metrics["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    log = logger.error if metrics["outcome"] != "succeeded" else logger.info
+    log(json.dumps({"event": "sqs_record", **metrics}))
+    return metrics
+
 @router.post("")
 @router.post("/")
-async def handle_lambda_events(request: Request, db: Session = Depends(get_db)):
-    """Handle events from AWS Lambda Web Adapter"""
+async def handle_lambda_events(request: Request):
+    """
+    Handle events from AWS Lambda Web Adapter. SQS records are processed concurrently and
+    failed ones are reported as batchItemFailures so SQS redelivers only those.
+    """
     event = await request.json()
-    logger.info(f"Received event: {event}")
-    
-    # Process SQS events
-    if 'Records' in event and event.get('Records')[0].get('eventSource') == 'aws:sqs':
-        for record in event['Records']:
-            try:
-                message = json.loads(record['body'])
-                task_name = message.get('task')
-                
-                if task_name in TASK_HANDLERS:
-                    handler = TASK_HANDLERS[task_name]
-                    await handler(message, db)
-                else:
-                    logger.error(f"Unknown task type: {task_name}")
-                
-            except Exception as e:
-                logger.error(f"Error processing task: {str(e)}")
-                continue
-    
-    return {"status": "processed"}
+    records = event.get('Records') or []
+    if not records or records[0].get('eventSource') != 'aws:sqs':
+        logger.info(f"Received non-SQS event: {event}")
+        return {"status": "processed"}
+
+    semaphore = asyncio.Semaphore(settings.SQS_BATCH_CONCURRENCY)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(process_record(record, semaphore) for record in records))
+    failures = [result["message_id"] for result in results if result["outcome"] == "failed"]
+
+    logger.info(json.dumps({
+        "event": "sqs_batch",
+        "records": len(records),
+        "failed": len(failures),
+        "discarded": sum(result["outcome"] == "discarded" for result in results),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }))
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failures]}
 
 @router.post("/local-process")
 async def process_local_events(
@@ -52,37 +107,15 @@ async def process_local_events(
         return {"status": "error", "message": "Only available in local development"}
 
     try:
-        # Get messages from LocalStack SQS
-        response = settings.sqs_client.receive_message(
-            QueueUrl=settings.SQS_QUEUE_URL,
-            MaxNumberOfMessages=10,
-            WaitTimeSeconds=1
-        )
-
-        messages = response.get('Messages', [])
-        for message in messages:
-            try:
-                body = json.loads(message['Body'])
-                task_name = body.get('task')
-
-                if task_name in TASK_HANDLERS:
-                    handler = TASK_HANDLERS[task_name]
-                    await handler(body, db)
-                
-                # Delete message after successful processing
-                settings.sqs_client.delete_message(
-                    QueueUrl=settings.SQS_QUEUE_URL,
-                    ReceiptHandle=message['ReceiptHandle']
-                )
-            except Exception as e:
-                logger.error(f"Error processing message: {str(e)}")
-                continue
-
+        # Deferred: app.worker imports this module for process_record
+        from ..worker import SQSWorker
+        stats = await SQSWorker(wait_seconds=1).run_once()
         return {
             "status": "success",
-            "messages_processed": len(messages)
+            "messages_processed": stats["received"],
+            "stats": stats
         }
 
     except Exception as e:
         logger.error(f"Error in local processing: {str(e)}")
-        return {"status": "error", "message": str(e)} 
\ No newline at end of file
+        return {"status": "error", "message": str(e)} 
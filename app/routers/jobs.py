@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Path
+from sqlmodel import Session
+from ..database import get_db
+from ..auth import get_current_user
+from ..schemas.principal import Principal
+from ..schemas.job import JobRead
+from ..services import job_service
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+@router.get("/{job_id}", response_model=JobRead)
+def get_job(
+    job_id: str = Path(...),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Status, progress, timings and (once finished) the result of one of the user's background jobs."""
+    return job_service.get_job(db, job_id, user_id=current_user.id)
@@ -1,15 +1,23 @@
-from fastapi import APIRouter, UploadFile, HTTPException, Depends, Form
+from fastapi import APIRouter, UploadFile, HTTPException, Depends, Form, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pathlib import Path
 from datetime import datetime, UTC
-import shutil
+from dataclasses import dataclass
+import hashlib
+import os
 import uuid
 import aiofiles
 from typing import Optional
 from ..database import get_db
-from ..models.user import User
 from ..models.upload import Upload
+from ..schemas.principal import Principal
 from ..auth import get_current_user  # Assuming you have auth middleware
+from ..services.pagination_service import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..services.export_service import NDJSON, MEDIA_TYPES, export_statement, stream_export
+from ..services import job_service
+from ..orchestrators.job_tasks import EXTRACT_UPLOAD_TEXT
+from ..config import settings as app_settings
 import logging
 
 router = APIRouter()
@@ -18,39 +26,76 @@ class Settings:
     BASE_DIR = Path(__file__).resolve().parent.parent
     UPLOAD_DIR = BASE_DIR / "uploads"
     PDF_DIR = UPLOAD_DIR / "pdfs"
+    # Content-addressed blobs: pdfs/sha256/<first two hex chars>/<sha256>.pdf, shared by identical uploads
+    BLOB_DIR = PDF_DIR / "sha256"
     TEMP_DIR = UPLOAD_DIR / "temp"
     MAX_FILE_SIZE = 10 * 1024 * 1024
+    CHUNK_SIZE = 1024 * 1024
     ALLOWED_EXTENSIONS = {".pdf"}
+    _initialized = False
     
     @classmethod
     def initialize(cls):
-        for directory in [cls.UPLOAD_DIR, cls.PDF_DIR, cls.TEMP_DIR]:
+        # Called on first use rather than at import so cold starts don't touch the filesystem
+        if cls._initialized:
+            return
+        for directory in [cls.UPLOAD_DIR, cls.PDF_DIR, cls.BLOB_DIR, cls.TEMP_DIR]:
             directory.mkdir(exist_ok=True)
+        cls._initialized = True
 
 settings = Settings()
-settings.initialize()
 
-def generate_unique_filename(original_filename: str) -> str:
-    """Generate a unique filename while preserving the original extension."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    unique_id = str(uuid.uuid4())[:8]
-    extension = Path(original_filename).suffix
-    return f"{timestamp}_{unique_id}{extension}"
+@dataclass
+class StoredFile:
+    path: Path
+    sha256: str
+    size: int
+    deduplicated: bool
 
-async def save_upload_file(upload_file: UploadFile) -> tuple[Path, str]:
-    """Save an uploaded file to the temporary directory and return its path."""
-    temp_path = settings.TEMP_DIR / generate_unique_filename(upload_file.filename)
-    
+def blob_path(sha256: str, extension: str = ".pdf") -> Path:
+    return settings.BLOB_DIR / sha256[:2] / f"{sha256}{extension}"
+
+async def hash_upload_file(upload_file: UploadFile) -> tuple[str, int]:
+    """SHA-256 and size of the upload, read in chunks; fails with 413 as soon as it passes MAX_FILE_SIZE."""
+    digest = hashlib.sha256()
+    size = 0
+    await upload_file.seek(0)
+    while chunk := await upload_file.read(settings.CHUNK_SIZE):
+        size += len(chunk)
+        if size > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE // (1024 * 1024)}MB"
+            )
+        digest.update(chunk)
+    return digest.hexdigest(), size
+
+async def store_upload_file(upload_file: UploadFile) -> StoredFile:
+    """
+    Store the upload under its content hash. Hashing happens first, so content we already
+    have is never written again; new content is streamed into the blob directory and renamed
+    into place atomically.
+    """
+    settings.initialize()
+    sha256, size = await hash_upload_file(upload_file)
+    path = blob_path(sha256, Path(upload_file.filename).suffix.lower())
+    if path.exists():
+        return StoredFile(path=path, sha256=sha256, size=size, deduplicated=True)
+
+    path.parent.mkdir(exist_ok=True)
+    partial_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.partial")
     try:
-        async with aiofiles.open(temp_path, 'wb') as out_file:
-            while content := await upload_file.read(1024 * 1024):  # Read in 1MB chunks
-                await out_file.write(content)
+        await upload_file.seek(0)
+        async with aiofiles.open(partial_path, 'wb') as out_file:
+            while chunk := await upload_file.read(settings.CHUNK_SIZE):
+                await out_file.write(chunk)
+        # Atomic on the same filesystem; a concurrent identical upload just replaces it with the same bytes
+        os.replace(partial_path, path)
     except Exception as e:
-        if temp_path.exists():
-            temp_path.unlink()
+        if partial_path.exists():
+            partial_path.unlink()
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
-    
-    return temp_path, upload_file.filename
+    return StoredFile(path=path, sha256=sha256, size=size, deduplicated=False)
 
 def validate_file(file: UploadFile) -> None:
     """Validate file type and size."""
@@ -69,20 +114,9 @@ def validate_file(file: UploadFile) -> None:
             detail="Invalid content type. Only PDFs are allowed."
         )
 
-def move_to_permanent_storage(temp_path: Path, original_filename: str) -> Path:
-    """Move file from temporary to permanent storage."""
-    permanent_path = settings.PDF_DIR / generate_unique_filename(original_filename)
-    try:
-        shutil.move(str(temp_path), str(permanent_path))
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Failed to move file to permanent storage: {str(e)}"
-        )
-    return permanent_path
-
 def cleanup_temp_files() -> int:
     """Remove all files from temporary directory. Returns count of files removed."""
+    settings.initialize()
     count = 0
     for file_path in settings.TEMP_DIR.glob("*"):
         if file_path.is_file():
@@ -97,22 +131,22 @@ def cleanup_temp_files() -> int:
 logger = logging.getLogger(__name__)
 
 @router.post("/")
-def upload_file(
+async def upload_file(
     file: UploadFile,
     description: Optional[str] = Form(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         validate_file(file)
-        temp_path, original_filename = save_upload_file(file)
-        permanent_path = move_to_permanent_storage(temp_path, original_filename)
+        stored = await store_upload_file(file)
         
         upload = Upload(
             user_id=current_user.id,
-            file_path=str(permanent_path.relative_to(settings.BASE_DIR)),
-            original_filename=original_filename,
-            file_size=permanent_path.stat().st_size,
+            file_path=str(stored.path.relative_to(settings.BASE_DIR)),
+            original_filename=file.filename,
+            file_size=stored.size,
+            sha256=stored.sha256,
             mime_type=file.content_type,
             description=description,
             upload_date=datetime.now(UTC)
@@ -121,10 +155,22 @@ def upload_file(
         db.add(upload)
         db.commit()
         
+        extraction_job_id = None
+        if app_settings.PDF_EXTRACT_ON_UPLOAD:
+            try:
+                job = await job_service.enqueue(db, EXTRACT_UPLOAD_TEXT, {"upload_id": upload.id}, user_id=current_user.id)
+                extraction_job_id = job.id
+            except HTTPException:
+                # The upload itself succeeded; extraction can be re-run with app.commands.extract_pdfs
+                logger.error(f"Could not enqueue text extraction for upload {upload.id}")
+        
         return {
             "message": "File uploaded successfully",
             "upload_id": upload.id,
-            "file_path": upload.file_path
+            "file_path": upload.file_path,
+            "sha256": stored.sha256,
+            "deduplicated": stored.deduplicated,
+            "extraction_job_id": extraction_job_id
         }
         
     except Exception as e:
@@ -135,29 +181,54 @@ def upload_file(
 
 @router.get("/")
 def list_user_uploads(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    """List all uploads for the current user."""
-    uploads = db.query(Upload).filter(Upload.user_id == current_user.id).all()
+    """List the current user's uploads, newest first. Pass `next_cursor` back as `cursor` for the next page."""
+    page = paginate(
+        db,
+        Upload,
+        sort_field="upload_date",
+        fields=["id", "original_filename", "file_size", "upload_date", "description"],
+        filters=[Upload.user_id == current_user.id],
+        limit=limit,
+        cursor=cursor
+    )
     return {
         "uploads": [
             {
-                "id": upload.id,
-                "filename": upload.original_filename,
-                "size": upload.file_size,
-                "uploaded_at": upload.upload_date,
-                "description": upload.description
+                "id": upload["id"],
+                "filename": upload["original_filename"],
+                "size": upload["file_size"],
+                "uploaded_at": upload["upload_date"],
+                "description": upload["description"]
             }
-            for upload in uploads
-        ]
+            for upload in page["items"]
+        ],
+        "next_cursor": page["next_cursor"]
     }
 
+@router.get("/export")
+def export_user_uploads(
+    format: str = Query(NDJSON, pattern="^(ndjson|json)$"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Stream all of the current user's upload records as NDJSON or a chunked JSON array."""
+    statement = export_statement(
+        Upload,
+        fields=["id", "original_filename", "file_size", "mime_type", "upload_date", "description"],
+        filters=[Upload.user_id == current_user.id],
+        sort_field="upload_date"
+    )
+    return StreamingResponse(stream_export(statement, format=format), media_type=MEDIA_TYPES[format])
+
 @router.delete("/{upload_id}")
 def delete_upload(
     upload_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a specific upload."""
     upload = db.query(Upload).filter(
@@ -168,12 +239,18 @@ def delete_upload(
     if not upload:
         raise HTTPException(status_code=404, detail="Upload not found")
     
-    # Delete the physical file
     file_path = settings.BASE_DIR / upload.file_path
-    if file_path.exists():
-        file_path.unlink()
-    
+    sha256 = upload.sha256
     db.delete(upload)
     db.commit()
+    # Its text must stop turning up in retrieval (and in the user's cached index)
+    from ..models.embedding_chunk import EmbeddingChunkSource
+    from ..services import embedding_service
+    embedding_service.delete_source(db, EmbeddingChunkSource.UPLOAD, upload_id)
+    
+    # Content-addressed files are shared; only delete the physical file once nothing references it
+    still_referenced = sha256 and db.query(Upload.id).filter(Upload.sha256 == sha256).first()
+    if not still_referenced and file_path.exists():
+        file_path.unlink()
     
     return {"message": "Upload deleted successfully"}
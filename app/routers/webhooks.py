@@ -1,14 +1,27 @@
-from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi import APIRouter, Request, HTTPException, Depends, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session
-from ..database import get_db
-from ..services.stripe_service import construct_event, handle_stripe_event
+from ..database import get_session
+from ..config import settings
+from ..models.stripe_event import StripeEventStatus
+from ..services.stripe_service import construct_event
+from ..services import stripe_event_service
+import json
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/stripe")
-async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
+async def stripe_webhook(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_session)
+):
+    """
+    Verify, store and acknowledge. The event is applied later, in order with the customer's
+    other events, by the process_stripe_events task (or a background task locally).
+    """
     # Get the stripe signature from headers
     stripe_signature = request.headers.get("stripe-signature")
     if not stripe_signature:
@@ -18,18 +31,34 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     payload = await request.body()
     
     try:
-        # Use the stripe service to verify and construct the event
-        event = construct_event(payload, stripe_signature)
-        
-        # Let the stripe service handle the event
-        handle_stripe_event(event, db)
-        
-        logger.info(f"Successfully processed {event['type']} event")
-        return {"status": "success"}
-    
+        # Use the stripe service to verify the signature; the raw body is what gets stored
+        construct_event(payload, stripe_signature)
+        event = json.loads(payload)
+
+        if settings.USE_ASYNC_DB:
+            stripe_event, created = await db.run_sync(lambda session: stripe_event_service.record_event(session, event))
+        else:
+            stripe_event, created = stripe_event_service.record_event(db, event)
     except ValueError as e:
         logger.error(f"Error processing webhook: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error processing webhook")
\ No newline at end of file
+        logger.error(f"Error storing webhook: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error processing webhook")
+
+    if stripe_event.status == StripeEventStatus.PROCESSED:
+        logger.info(f"Ignoring duplicate {event['type']} event {event['id']}")
+        return {"status": "duplicate"}
+
+    # A redelivered event that is still pending is handed off again; processing is idempotent per event
+    if settings.STRIPE_EVENT_PROCESSING == "queue":
+        try:
+            await run_in_threadpool(stripe_event_service.enqueue_processing, stripe_event.customer_key)
+        except Exception as e:
+            # The event is stored, so acknowledge anyway; the replay command picks it up
+            logger.error(f"Failed to enqueue Stripe event {event['id']}: {str(e)}")
+    else:
+        background_tasks.add_task(stripe_event_service.process_customer_events, stripe_event.customer_key)
+
+    logger.info(f"Accepted {event['type']} event {event['id']}")
+    return {"status": "accepted" if created else "duplicate"}
@@ -5,6 +5,14 @@ from .user import (
     AuthResponse,
     UserMeResponse
 )
+from .blog_post import BlogPostRequest, BlogPostResponse
+from .principal import Principal
+from .content import ContentRead, ContentSeriesRead, ContentSectionRead
+from .content_brief import ContentBriefRead, ContentBriefTemplateRead
+from .content_outline import ContentOutlineRead, ContentOutlineSectionRead
+from .ai import AIProviderRead, AIModelRead, PromptRead
+from .upload import UploadRead
+from .job import JobAccepted, JobRead
 
 __all__ = [
     'Token',
@@ -12,5 +20,21 @@ __all__ = [
     'UserCreate',
     'UserLogin',
     'AuthResponse',
-    'UserMeResponse'
+    'UserMeResponse',
+    'BlogPostRequest',
+    'BlogPostResponse',
+    'Principal',
+    'ContentRead',
+    'ContentSeriesRead',
+    'ContentSectionRead',
+    'ContentBriefRead',
+    'ContentBriefTemplateRead',
+    'ContentOutlineRead',
+    'ContentOutlineSectionRead',
+    'AIProviderRead',
+    'AIModelRead',
+    'PromptRead',
+    'UploadRead',
+    'JobAccepted',
+    'JobRead'
 ]
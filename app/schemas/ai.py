@@ -0,0 +1,34 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+from ..models.prompt import TypeEnum
+
+class AIProviderRead(BaseModel):
+    id: int
+    name: str
+    api_endpoint: str
+    pydantic_ai_wrapper: str
+    is_openai_compatible: bool = False
+    custom_fields: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class AIModelRead(BaseModel):
+    id: int
+    name: str
+    provider_id: int
+    custom_fields: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class PromptRead(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    type: TypeEnum
+    prompt: str
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, List, Optional
+
+class BlogPostRequest(BaseModel):
+    topic: str
+    content_type: str = "blog_post"
+    brief_data: Dict[str, Any] = {}
+    # Overrides for settings.SECTION_GENERATION_MODE / SECTION_CONCURRENCY / SECTION_STITCHING
+    section_mode: Optional[str] = None
+    section_concurrency: Optional[int] = None
+    stitch_sections: Optional[bool] = None
+    # Time budget for generating the sections; settings.POST_DEADLINE_SECONDS if unset
+    deadline_seconds: Optional[float] = None
+
+class SectionTiming(BaseModel):
+    index: int
+    queued_ms: float
+    duration_ms: float
+
+class BlogPostResponse(BaseModel):
+    content_brief: Any
+    outline: Any
+    sections: List[str]
+    full_content: str
+    section_timings: List[SectionTiming] = []
+    sections_ms: float = 0.0
+    # Input tokens across all sections, split into provider-cached vs uncached
+    prompt_cache: Dict[str, int] = {}
+    model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -0,0 +1,38 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class ContentRead(BaseModel):
+    """Column-only view of a contents row; none of the table model's relationships."""
+    id: int
+    user_id: int
+    content_series_id: Optional[int] = None
+    title: Optional[str] = None
+    type: str
+    description: Optional[str] = None
+    text: Optional[str] = None
+    custom_data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class ContentSeriesRead(BaseModel):
+    id: int
+    user_id: int
+    title: str
+    description: Optional[str] = None
+    custom_data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class ContentSectionRead(BaseModel):
+    id: int
+    content_id: int
+    content_outline_section_id: int
+    order: int = 0
+    text: str
+    custom_data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class ContentBriefRead(BaseModel):
+    """Column-only view of a content_briefs row; none of the table model's relationships."""
+    id: int
+    content_id: Optional[int] = None
+    content_brief_template_id: Optional[int] = None
+    user_id: int
+    title: str
+    description: Optional[str] = None
+    primary_keyword: Optional[str] = None
+    secondary_keywords: Optional[str] = None
+    author_instructions: Optional[str] = None
+    writing_sample: Optional[str] = None
+    negative_words: Optional[str] = None
+    suggested_word_count: Optional[int] = None
+    product_info: Optional[str] = None
+    call_to_action: Optional[str] = None
+    custom_data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class ContentBriefTemplateRead(BaseModel):
+    id: int
+    user_id: int
+    title: str
+    description: Optional[str] = None
+    author_instructions: Optional[str] = None
+    writing_sample: Optional[str] = None
+    negative_words: Optional[str] = None
+    product_info: Optional[str] = None
+    call_to_action: Optional[str] = None
+    custom_data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class ContentOutlineRead(BaseModel):
+    id: int
+    content_id: Optional[int] = None
+    user_id: int
+    content_brief_id: int
+    title: str
+    description: Optional[str] = None
+    custom_data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class ContentOutlineSectionRead(BaseModel):
+    id: int
+    content_outline_id: int
+    text: str
+    order: int = 0
+    custom_data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
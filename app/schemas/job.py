@@ -0,0 +1,36 @@
+from pydantic import BaseModel, ConfigDict, computed_field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class JobAccepted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+class JobRead(BaseModel):
+    id: str
+    task: str
+    status: str
+    progress: float
+    attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def queued_ms(self) -> Optional[float]:
+        """Time spent waiting on the queue before a worker picked the job up."""
+        if self.started_at is None:
+            return None
+        return round((self.started_at - self.created_at).total_seconds() * 1000, 2)
+
+    @computed_field
+    @property
+    def run_ms(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return round((self.finished_at - self.started_at).total_seconds() * 1000, 2)
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+class Principal(BaseModel):
+    """
+    The authenticated user as seen by request handlers: the users row's own columns only,
+    none of the selectin relationships the User table model loads.
+    """
+    id: int
+    email: str
+    created_at: datetime
+    stripe_customer_id: Optional[str] = None
+    stripe_subscription_id: Optional[str] = None
+    stripe_product_id: Optional[str] = None
+    stripe_price_id: Optional[str] = None
+    subscription_status: Optional[str] = None
+    subscription_end_date: Optional[datetime] = None
+    lifetime_access: bool = False
+    total_paid: float = 0.0
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    def has_premium_access(self) -> bool:
+        return self.subscription_status == "active" or self.lifetime_access
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+class UploadRead(BaseModel):
+    id: int
+    user_id: int
+    original_filename: str
+    file_size: int
+    sha256: Optional[str] = None
+    mime_type: str
+    description: Optional[str] = None
+    upload_date: datetime
+    page_count: Optional[int] = None
+    extracted_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,7 @@
 from fastapi import HTTPException
-from ..clients.anthropic import AnthropicClient
+from ..clients.anthropic import get_async_anthropic_client, DEFAULT_MODEL
+from .deadline_service import call_timeout
+from .llm_cache_service import llm_cache, make_cache_key
 from typing import Any, Dict, List
 import logging
 
@@ -67,8 +69,9 @@ class AnthropicTools:
         }]
 
 class AnthropicService:
-    def __init__(self):
-        self.client = AnthropicClient()
+    def __init__(self, client=None):
+        # Reuse the process-wide async client instead of building a connection pool per service
+        self.client = client or get_async_anthropic_client()
         self.tools = AnthropicTools()
 
     async def _process_response(self, message: Any, tool_name: str) -> Any:
@@ -91,17 +94,47 @@ class AnthropicService:
                 detail=f"Failed to extract {tool_name} data from response"
             )
 
-    async def generate_email(self, prompt: str) -> Dict[str, Any]:
+    async def _create_tool_response(
+        self,
+        prompt: str,
+        system_prompt: str,
+        tools: List[Dict[str, Any]],
+        tool_choice: Dict[str, Any],
+        tool_name: str,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Call Claude with a forced tool choice, going through the LLM response cache."""
+        async def call() -> Dict[str, Any]:
+            message = await self.client.create_message(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                tools=tools,
+                tool_choice=tool_choice,
+                timeout=call_timeout()
+            )
+            return await self._process_response(message, tool_name)
+
+        key = make_cache_key(
+            model=DEFAULT_MODEL,
+            system_prompt=system_prompt,
+            user_prompt=prompt,
+            tools=tools,
+            tool_choice=tool_choice
+        )
+        return await llm_cache.get_or_call(key, DEFAULT_MODEL, call, use_cache=use_cache)
+
+    async def generate_email(self, prompt: str, use_cache: bool = True) -> Dict[str, Any]:
         """Generate an email using Claude."""
         try:
-            message = self.client.create_message(
+            return await self._create_tool_response(
                 prompt=prompt,
                 system_prompt="""You are an expert email generator for a real estate company. 
                 Generate an email object based on the provided data.""",
                 tools=self.tools.email_tools(),
-                tool_choice={"type": "tool", "name": "generate_email"}
+                tool_choice={"type": "tool", "name": "generate_email"},
+                tool_name="email",
+                use_cache=use_cache
             )
-            return await self._process_response(message, "email")
         except Exception as e:
             logger.error(f"Error generating email: {str(e)}")
             raise HTTPException(
@@ -109,16 +142,17 @@ class AnthropicService:
                 detail=f"Failed to generate email: {str(e)}"
             )
 
-    async def generate_summary(self, prompt: str) -> Dict[str, Any]:
+    async def generate_summary(self, prompt: str, use_cache: bool = True) -> Dict[str, Any]:
         """Generate a summary using Claude."""
         try:
-            message = self.client.create_message(
+            return await self._create_tool_response(
                 prompt=prompt,
                 system_prompt="You are an expert at creating concise, informative summaries.",
                 tools=self.tools.summary_tools(),
-                tool_choice={"type": "tool", "name": "generate_summary"}
+                tool_choice={"type": "tool", "name": "generate_summary"},
+                tool_name="summary",
+                use_cache=use_cache
             )
-            return await self._process_response(message, "summary")
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}")
             raise HTTPException(
@@ -126,16 +160,17 @@ class AnthropicService:
                 detail=f"Failed to generate summary: {str(e)}"
             )
 
-    async def analyze_content(self, prompt: str) -> Dict[str, Any]:
+    async def analyze_content(self, prompt: str, use_cache: bool = True) -> Dict[str, Any]:
         """Analyze content using Claude."""
         try:
-            message = self.client.create_message(
+            return await self._create_tool_response(
                 prompt=prompt,
                 system_prompt="You are an expert content analyzer.",
                 tools=self.tools.analysis_tools(),
-                tool_choice={"type": "tool", "name": "analyze_content"}
+                tool_choice={"type": "tool", "name": "analyze_content"},
+                tool_name="analysis",
+                use_cache=use_cache
             )
-            return await self._process_response(message, "analysis")
         except Exception as e:
             logger.error(f"Error analyzing content: {str(e)}")
             raise HTTPException(
@@ -1,9 +1,11 @@
 from datetime import datetime, UTC
 from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.content_brief import ContentBrief
 from fastapi import Depends, HTTPException, Path
 from ..dependencies import get_db
-from .content_service import create_empty_content
+from .content_service import create_empty_content, create_empty_content_async
+from .token_service import brief_token_counts
 from sqlmodel import select
 
 def create(db: Session, content_brief: ContentBrief) -> ContentBrief:
@@ -14,6 +16,8 @@ def create(db: Session, content_brief: ContentBrief) -> ContentBrief:
         
         content_brief.created_at = datetime.now(UTC)
         content_brief.updated_at = datetime.now(UTC)
+        # Counted once here so every section prompt can be budgeted without re-tokenizing
+        content_brief.token_counts = brief_token_counts(content_brief)
 
         db.add(content_brief)
         db.commit()
@@ -43,3 +47,41 @@ def get_or_create_content_id(db: Session, content_brief: ContentBrief, user_id:
     else:
         content_id = content_brief.content_id    
     return content_id
+
+
+async def create_async(db: AsyncSession, content_brief: ContentBrief) -> ContentBrief:
+    """Create a new content brief on an async session"""
+    try:
+        content_id = await get_or_create_content_id_async(db=db, content_brief=content_brief, user_id=content_brief.user_id)
+        content_brief.content_id = content_id
+
+        content_brief.created_at = datetime.now(UTC)
+        content_brief.updated_at = datetime.now(UTC)
+        # Counted once here so every section prompt can be budgeted without re-tokenizing
+        content_brief.token_counts = brief_token_counts(content_brief)
+
+        db.add(content_brief)
+        await db.commit()
+        await db.refresh(content_brief)
+
+        return content_brief
+    except Exception as e:
+        await db.rollback()
+        raise e
+
+async def get_content_brief_by_id_async(db: AsyncSession, content_brief_id: int) -> ContentBrief:
+    """Get a content brief by its ID on an async session"""
+    content_brief = (await db.exec(select(ContentBrief).where(ContentBrief.id == content_brief_id))).first()
+
+    if not content_brief:
+        raise HTTPException(status_code=404, detail="Content brief not found")
+
+    return content_brief
+
+async def get_or_create_content_id_async(db: AsyncSession, content_brief: ContentBrief, user_id: int) -> int:
+    if not content_brief.content_id:
+        content_id = await create_empty_content_async(db=db, user_id=user_id)
+        content_brief.content_id = content_id
+    else:
+        content_id = content_brief.content_id
+    return content_id
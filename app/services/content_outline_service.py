@@ -1,6 +1,8 @@
 from app.models.content_outline import ContentOutline 
 from app.models.content_outline_section import ContentOutlineSection
 from fastapi import Depends, HTTPException, Path
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..dependencies import get_db
 
 def create(
@@ -37,4 +39,40 @@ def get_content_outline_section_by_id(
     if not content_outline_section:
         raise HTTPException(status_code=404, detail="Content outline section not found")
     
-    return content_outline_section
\ No newline at end of file
+    return content_outline_section
+
+async def create_async(
+    db: AsyncSession,
+    user_id: int
+) -> int:
+    content_outline = ContentOutline()
+    db.add(content_outline)
+    await db.commit()
+    await db.refresh(content_outline)
+    return content_outline.id
+
+async def get_content_outline_by_id_async(
+    db: AsyncSession,
+    content_outline_id: int,
+):
+    content_outline = (await db.exec(
+        select(ContentOutline).where(ContentOutline.id == content_outline_id)
+    )).first()
+
+    if not content_outline:
+        raise HTTPException(status_code=404, detail="Content outline not found")
+
+    return content_outline
+
+async def get_content_outline_section_by_id_async(
+    db: AsyncSession,
+    content_outline_section_id: int,
+):
+    content_outline_section = (await db.exec(
+        select(ContentOutlineSection).where(ContentOutlineSection.id == content_outline_section_id)
+    )).first()
+
+    if not content_outline_section:
+        raise HTTPException(status_code=404, detail="Content outline section not found")
+
+    return content_outline_section
@@ -1,9 +1,30 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from typing import AsyncIterator, List, Optional
 from fastapi import HTTPException
-from sqlmodel import Session
+from sqlmodel import Session, select
 from ..dependencies import get_db
+from ..database import engine
+from ..config import settings
+from ..clients.anthropic import get_async_anthropic_client, DEFAULT_MODEL as ANTHROPIC_DEFAULT_MODEL
+from ..clients.fake import get_fake_llm_client
+from ..clients.rate_limit import estimate_request_tokens, get_limiter
 import logging
 from pydantic import BaseModel
-from app.agents.content_writer_agent import content_writer_agent, Deps
+from app.models.content import Content
+from app.models.content_brief import ContentBrief
+from app.models.content_outline import ContentOutline
+from app.models.content_outline_section import ContentOutlineSection
+from app.models.content_section import ContentSection
+from app.agents.content_writer_agent import get_content_writer_agent, agent_model, run_content_writer, run_tokens, Deps, ContentBlock
+from .hedging_service import hedged_call, hedged_stream
+from .llm_cache_service import llm_cache, make_cache_key
+from . import embedding_service
+from .model_router_service import ModelRoute, SECTION_REQUEST, STITCH_REQUEST, model_router
+from .prompt_packing_service import PromptPart, get_prompt_budget, pack
+from .token_service import cached_field_tokens, count_tokens
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -47,11 +68,412 @@ Negative words:
 n/a
 '''
 
-async def generate_content_section():
+stitch_system_prompt = '''
+You are an expert blog post editor. Sections of this blog post were written independently, so the end of one section may not flow into the start of the next.
+Rewrite only the final paragraph of the current section so it transitions naturally into the next section. Keep the same language, style, markdown formatting and meaning.
+Return only the rewritten paragraph.
+'''
+
+@dataclass
+class PromptCacheUsage:
+    """Input token accounting split by what the provider served from its prompt-prefix cache."""
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+    calls: int = 0
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        return self.input_tokens - self.cached_input_tokens
+
+    def add(self, other: "PromptCacheUsage") -> None:
+        self.input_tokens += other.input_tokens
+        self.cached_input_tokens += other.cached_input_tokens
+        self.cache_write_tokens += other.cache_write_tokens
+        self.calls += other.calls
+
+    def as_dict(self) -> dict:
+        return {
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "uncached_input_tokens": self.uncached_input_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "calls": self.calls,
+        }
+
+def usage_from_anthropic(usage) -> PromptCacheUsage:
+    # Anthropic reports cache reads/writes separately from the uncached input_tokens
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return PromptCacheUsage(
+        input_tokens=usage.input_tokens + cache_read + cache_write,
+        cached_input_tokens=cache_read,
+        cache_write_tokens=cache_write,
+        calls=1
+    )
+
+def usage_from_agent(usage) -> PromptCacheUsage:
+    # OpenAI's automatic prefix caching surfaces as prompt_tokens_details.cached_tokens
+    details = usage.details or {}
+    return PromptCacheUsage(
+        input_tokens=usage.request_tokens or 0,
+        cached_input_tokens=details.get("cached_tokens", 0),
+        calls=1
+    )
+
+def _outline_text(outline_section) -> str:
+    return getattr(outline_section, "text", outline_section)
+
+def brief_prompt_parts(content_brief) -> List[PromptPart]:
+    """
+    Brief fields as packable prompt parts, using the token counts saved with the brief.
+    The writing sample is the first to be cut; negative words are never cut.
+    """
+    fields = [
+        ("writing_sample", "Writing Sample", 4, 200),
+        ("product_info", "Product description", 3, 100),
+        ("author_instructions", "Author instructions", 2, 100),
+    ]
+    parts = []
+    for field, label, priority, min_tokens in fields:
+        if getattr(content_brief, field, None):
+            parts.append(PromptPart(
+                name=field,
+                text=f"{label}:\n{getattr(content_brief, field)}",
+                priority=priority,
+                min_tokens=min_tokens,
+                tokens=count_tokens(f"{label}:\n") + cached_field_tokens(content_brief, field)
+            ))
+    parts.append(PromptPart(
+        name="negative_words",
+        text=f"Negative words:\n{getattr(content_brief, 'negative_words', None) or 'n/a'}"
+    ))
+    return parts
+
+def build_brief_context(content_brief, token_budget: Optional[int] = None) -> str:
+    """
+    The parts of the prompt that are identical for every section of a post. These go
+    right after the static system prompt so providers can serve them from their prefix cache.
+    """
+    parts = brief_prompt_parts(content_brief)
+    if token_budget is None:
+        return "\n\n".join(part.text for part in parts)
+    return pack(parts, token_budget).text()
+
+def build_system_prompt(content_brief, token_budget: Optional[int] = None) -> str:
+    return f"{system_prompt}\n\n{build_brief_context(content_brief, token_budget)}"
+
+def build_user_prompt(
+    content_brief,
+    current_outline_section,
+    previous_section: str = None,
+    next_outline_section=None,
+    previous_outline_section=None,
+    reference_context: str = None,
+    token_budget: Optional[int] = None
+) -> str:
+    """
+    Build the per-section part of the prompt; brief fields live in build_system_prompt.
+    Sequential generation passes the previous section's text; parallel generation passes the
+    previous section's outline instead so sections don't depend on each other. With a
+    token_budget, reference material and then the previous section are cut first.
+    """
+    parts = [PromptPart("outline_section", f"Outline section:\n{_outline_text(current_outline_section)}")]
+    if previous_section:
+        parts.append(PromptPart("previous_section", f"Previous section:\n{previous_section}", priority=3, min_tokens=150))
+    elif previous_outline_section is not None:
+        parts.append(PromptPart(
+            "previous_outline_section",
+            f"Previous section's outline:\n{_outline_text(previous_outline_section)}",
+            priority=1
+        ))
+    if next_outline_section is not None:
+        parts.append(PromptPart(
+            "next_outline_section",
+            f"Next section's outline:\n{_outline_text(next_outline_section)}",
+            priority=1
+        ))
+    if reference_context:
+        parts.append(PromptPart(
+            "reference_context",
+            f"Reference material (use where relevant, don't copy it verbatim):\n{reference_context}",
+            priority=5,
+            min_tokens=100
+        ))
+    if token_budget is None:
+        return "\n\n".join(part.text for part in parts)
+    return pack(parts, token_budget).text()
+
+def build_prompts(content_brief, model: str, **section) -> tuple[str, str, str]:
+    """
+    (system prompt, brief context, user prompt) packed into the model's prompt budget.
+    The brief context is packed against a fixed share of the budget so it comes out the
+    same for every section of a post and stays prefix-cacheable.
+    """
+    budget = get_prompt_budget(model)
+    brief_budget = max(budget - count_tokens(system_prompt) - settings.PROMPT_SECTION_RESERVE_TOKENS, 0)
+    brief_context = build_brief_context(content_brief, brief_budget)
+    section_system_prompt = f"{system_prompt}\n\n{brief_context}"
+    prompt = build_user_prompt(content_brief, token_budget=budget - count_tokens(section_system_prompt), **section)
+    return section_system_prompt, brief_context, prompt
+
+async def _run_openai(section_system_prompt: str, prompt: str, route: Optional[ModelRoute] = None, timeout: float = None) -> dict:
+    deps = Deps(system_prompt=section_system_prompt)
+    response = await get_limiter(route.limiter_key if route else "openai").call(
+        lambda: get_content_writer_agent().run(
+            prompt,
+            deps=deps,
+            model=agent_model(route) if route else None,
+            model_settings={"timeout": timeout} if timeout else None
+        ),
+        tokens=estimate_request_tokens(section_system_prompt, prompt),
+        used=run_tokens
+    )
+    return {
+        "content_block": response.data.model_dump(),
+        "usage": usage_from_agent(response.usage()),
+    }
+
+async def _run_anthropic(brief_context: Optional[str], prompt: str, model: str = ANTHROPIC_DEFAULT_MODEL, timeout: float = None) -> dict:
+    # Two cache breakpoints: the static instructions are shared by every post,
+    # the brief context by every section of this post
+    system_blocks = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+    if brief_context is not None:
+        system_blocks.append({
+            "type": "text",
+            "text": brief_context,
+            "cache_control": {"type": "ephemeral"}
+        })
+    message = await get_async_anthropic_client().create_text_message(prompt=prompt, system=system_blocks, model=model, timeout=timeout)
+    text = "".join(block.text for block in message.content if block.type == "text")
+    return {
+        "content_block": ContentBlock(content_block=text).model_dump(),
+        "usage": usage_from_anthropic(message.usage),
+    }
+
+async def _run_fake(route: ModelRoute, section_system_prompt: str, prompt: str) -> dict:
+    client = get_fake_llm_client(
+        route.model,
+        latency_ms=route.options.get("latency_ms", 0),
+        error_rate=route.options.get("error_rate", 0)
+    )
+    text = await get_limiter(route.limiter_key).call(
+        lambda: client.create_text_message(prompt=prompt, system=section_system_prompt, model=route.model),
+        tokens=estimate_request_tokens(section_system_prompt, prompt)
+    )
+    return {
+        "content_block": ContentBlock(content_block=text).model_dump(),
+        "usage": PromptCacheUsage(input_tokens=count_tokens(section_system_prompt) + count_tokens(prompt), calls=1),
+    }
+
+async def generate_content_section(
+    content_brief=None,
+    current_outline_section=None,
+    previous_section: str = None,
+    next_outline_section=None,
+    previous_outline_section=None,
+    reference_context: str = None,
+    use_cache: bool = True,
+    provider: str = None
+):
+    """
+    Returns {"content_block": ContentBlock, "usage": PromptCacheUsage}. Usage is zero when
+    the response came from the LLM response cache.
+    """
     try:
-        deps = Deps(system_prompt=system_prompt)
-        response = await content_writer_agent.run(user_prompt, deps=deps)
-        return {"content_block": response.data}
+        provider = provider or settings.SECTION_PROVIDER
+        pinned = None if provider == "auto" else provider
+        route = model_router.select(SECTION_REQUEST, provider=pinned)
+        section_system_prompt = system_prompt
+        brief_context = build_brief_context(content_brief) if content_brief is not None else None
+        prompt = user_prompt
+        if current_outline_section is not None:
+            # get_prompt_budget may query the DB and tokenizing is CPU-bound
+            section_system_prompt, brief_context, prompt = await asyncio.to_thread(
+                build_prompts,
+                content_brief,
+                route.model,
+                current_outline_section=current_outline_section,
+                previous_section=previous_section,
+                next_outline_section=next_outline_section,
+                previous_outline_section=previous_outline_section,
+                reference_context=reference_context
+            )
+
+        usage = PromptCacheUsage()
+
+        async def attempt(attempt_route: ModelRoute, timeout: float) -> dict:
+            # A hedge on another model reuses the prompts packed for the primary's budget
+            async with model_router.track(attempt_route):
+                if attempt_route.provider == "anthropic":
+                    return await _run_anthropic(brief_context, prompt, attempt_route.model, timeout)
+                if attempt_route.provider == "fake":
+                    return await _run_fake(attempt_route, section_system_prompt, prompt)
+                return await _run_openai(section_system_prompt, prompt, attempt_route, timeout)
+
+        async def call() -> dict:
+            result = await hedged_call(SECTION_REQUEST, route, attempt, router=model_router, provider=pinned)
+            usage.add(result["usage"])
+            return result["content_block"]
+
+        key = make_cache_key(model=route.key, system_prompt=section_system_prompt, user_prompt=prompt)
+        data = await llm_cache.get_or_call(key, route.key, call, use_cache=use_cache)
+        if usage.calls:
+            logger.info(f"Section prompt tokens: {usage.as_dict()}")
+        return {"content_block": ContentBlock.model_validate(data), "usage": usage}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating content: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def stitch_transition(section_text: str, next_section_text: str) -> str:
+    """Rewrite the last paragraph of a section so it leads into the next one."""
+    paragraphs = section_text.rstrip().split("\n\n")
+    next_opening = "\n\n".join(next_section_text.lstrip().split("\n\n")[:2])
+    prompt = (
+        f"Final paragraph of the current section:\n{paragraphs[-1]}\n\n"
+        f"Opening of the next section:\n{next_opening}"
+    )
+    try:
+        response = await run_content_writer(prompt, STITCH_REQUEST, deps=Deps(system_prompt=stitch_system_prompt))
+        paragraphs[-1] = response.data.content_block.strip()
+        return "\n\n".join(paragraphs)
+    except Exception as e:
+        # Stitching is cosmetic; keep the unstitched section rather than failing the post
+        logger.error(f"Error stitching section transition: {str(e)}")
+        return section_text
+
+
+def get_reference_context(db: Session, content_brief: ContentBrief, outline_section) -> Optional[str]:
+    """
+    The user's most relevant uploads, earlier sections and briefs for this outline section,
+    cut to RETRIEVAL_TOKEN_BUDGET instead of pasting whole documents into the prompt.
+    """
+    if settings.RETRIEVAL_TOKEN_BUDGET <= 0:
+        return None
+    query = "\n".join(filter(None, [_outline_text(outline_section), content_brief.primary_keyword]))
+    try:
+        chunks = embedding_service.retrieve(db, content_brief.user_id, query, exclude_content_id=content_brief.content_id)
+    except Exception as e:
+        # Retrieval only adds context; generate without it rather than fail the section
+        logger.error(f"Failed to retrieve reference material: {str(e)}")
+        return None
+    return embedding_service.format_context(chunks)
+
+def get_section_context(db: Session, content_id: int, content_outline_section_id: int, user_id: Optional[int] = None) -> dict:
+    """
+    Load the brief and the current/neighbouring outline sections needed to prompt for one section.
+    With `user_id`, content that belongs to someone else is a 404.
+    """
+    if user_id is not None:
+        content = db.exec(select(Content).where(Content.id == content_id, Content.user_id == user_id)).first()
+        if not content:
+            raise HTTPException(status_code=404, detail="Content not found")
+
+    current = db.exec(
+        select(ContentOutlineSection)
+        .join(ContentOutline, ContentOutline.id == ContentOutlineSection.content_outline_id)
+        .where(ContentOutlineSection.id == content_outline_section_id, ContentOutline.content_id == content_id)
+    ).first()
+    if not current:
+        raise HTTPException(status_code=404, detail="Content outline section not found")
+
+    content_brief = db.exec(select(ContentBrief).where(ContentBrief.content_id == content_id)).first()
+    if not content_brief:
+        raise HTTPException(status_code=404, detail="Content brief not found")
+
+    siblings = db.exec(
+        select(ContentOutlineSection)
+        .where(ContentOutlineSection.content_outline_id == current.content_outline_id)
+        .order_by(ContentOutlineSection.order, ContentOutlineSection.id)
+    ).all()
+    idx = next(i for i, section in enumerate(siblings) if section.id == current.id)
+
+    return {
+        "content_brief": content_brief,
+        "current_outline_section": current,
+        "previous_outline_section": siblings[idx - 1] if idx > 0 else None,
+        "next_outline_section": siblings[idx + 1] if idx < len(siblings) - 1 else None,
+        "reference_context": get_reference_context(db, content_brief, current),
+    }
+
+@dataclass
+class StreamedSection:
+    """Set once a stream completes: the validated final text, which is what gets saved."""
+    text: Optional[str] = None
+
+async def stream_content_section(
+    prompt: str,
+    section_system_prompt: str = system_prompt,
+    route: Optional[ModelRoute] = None,
+    streamed: Optional[StreamedSection] = None
+) -> AsyncIterator[str]:
+    """
+    Yield the section text as it is generated, as incremental deltas. A stream that hasn't
+    sent anything by the model's time-to-first-token p95 is hedged. The deltas are for
+    display; `streamed.text` holds the final result once the stream is exhausted.
+    """
+    route = route or model_router.select(SECTION_REQUEST)
+
+    def open_stream(attempt_route: ModelRoute, timeout: float) -> AsyncIterator[str]:
+        return _stream_route(prompt, section_system_prompt, attempt_route, timeout, streamed)
+
+    async for delta in hedged_stream(SECTION_REQUEST, route, open_stream, router=model_router):
+        yield delta
+
+async def _stream_route(
+    prompt: str,
+    section_system_prompt: str,
+    route: ModelRoute,
+    timeout: float,
+    streamed: Optional[StreamedSection] = None
+) -> AsyncIterator[str]:
+    deps = Deps(system_prompt=section_system_prompt)
+    sent = ""
+    started = time.perf_counter()
+    # Streams hold their slot until the last token; they aren't retried once text has gone out
+    limiter = get_limiter(route.limiter_key)
+    async with model_router.track(route), limiter.slot(estimate_request_tokens(section_system_prompt, prompt)) as lease:
+        async with get_content_writer_agent().run_stream(
+            prompt,
+            deps=deps,
+            model=agent_model(route),
+            model_settings={"timeout": timeout}
+        ) as result:
+            # debounce_by=None forwards every partial result instead of batching them
+            async for partial in result.stream(debounce_by=None):
+                text = partial.content_block or ""
+                if len(text) > len(sent) and text.startswith(sent):
+                    if not sent:
+                        model_router.record_first_token(route, (time.perf_counter() - started) * 1000)
+                    yield text[len(sent):]
+                    sent = text
+            if streamed is not None:
+                # A partial that rewrote earlier text is never sent as a delta; the final result has it
+                streamed.text = (await result.get_data()).content_block
+        lease.used(run_tokens(result))
+
+def save_content_section(
+    content_id: int,
+    content_outline_section_id: int,
+    order: int,
+    text: str
+) -> ContentSection:
+    """
+    Persist a generated section. Opens its own session because streaming responses
+    outlive the request-scoped session from get_db.
+    """
+    with Session(engine) as db:
+        content_section = ContentSection(
+            content_id=content_id,
+            content_outline_section_id=content_outline_section_id,
+            order=order,
+            text=text,
+            created_at=datetime.now(UTC),
+            updated_at=datetime.now(UTC)
+        )
+        db.add(content_section)
+        db.commit()
+        db.refresh(content_section)
+        return content_section
@@ -1,7 +1,9 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException
 from ..models.content import Content
+from .pagination_service import paginate, paginate_async, parse_fields, DEFAULT_PAGE_SIZE
 from sqlmodel import select
 import logging
 
@@ -32,6 +34,28 @@ def get_all(
     contents = db.exec(select(Content)).all()
     return contents
 
+# List views never need the large text/custom_data columns unless asked for via fields=
+LIST_FIELDS = ["id", "user_id", "content_series_id", "title", "type", "description", "created_at", "updated_at"]
+KEYSET_FIELDS = ["id", "created_at"]
+
+def list_for_user(
+    db: Session,
+    user_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str = None,
+    fields: str = None
+) -> dict:
+    """Newest-first page of a user's contents, keyset-paginated on (created_at, id)."""
+    return paginate(
+        db,
+        Content,
+        sort_field="created_at",
+        fields=parse_fields(fields, Content, default=LIST_FIELDS, required=KEYSET_FIELDS),
+        filters=[Content.user_id == user_id],
+        limit=limit,
+        cursor=cursor
+    )
+
 # create a new empty content object and return the id
 def create_empty_content(
     db: Session,
@@ -44,4 +68,58 @@ def create_empty_content(
     db.add(content)
     db.commit()
     db.refresh(content)
-    return content.id
\ No newline at end of file
+    return content.id
+
+async def create_async(
+    db: AsyncSession,
+    content: Content
+) -> Content:
+    db.add(content)
+    await db.commit()
+    await db.refresh(content)
+    return content
+
+async def get_async(
+    db: AsyncSession,
+    content_id: int
+) -> Content:
+    content = (await db.exec(select(Content).filter(Content.id == content_id))).first()
+    if not content:
+        raise HTTPException(status_code=404, detail="Content not found")
+    return content
+
+async def get_all_async(
+    db: AsyncSession
+) -> list[Content]:
+    contents = (await db.exec(select(Content))).all()
+    return contents
+
+async def list_for_user_async(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str = None,
+    fields: str = None
+) -> dict:
+    return await paginate_async(
+        db,
+        Content,
+        sort_field="created_at",
+        fields=parse_fields(fields, Content, default=LIST_FIELDS, required=KEYSET_FIELDS),
+        filters=[Content.user_id == user_id],
+        limit=limit,
+        cursor=cursor
+    )
+
+async def create_empty_content_async(
+    db: AsyncSession,
+    user_id: int
+) -> int:
+    content = Content(
+        type="blog_post",
+        user_id=user_id
+    )
+    db.add(content)
+    await db.commit()
+    await db.refresh(content)
+    return content.id
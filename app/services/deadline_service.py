@@ -0,0 +1,39 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import HTTPException
+from ..config import settings
+
+# Monotonic time by which the current request must be done. A context variable, so the
+# tasks a request spawns (parallel sections, hedged attempts) inherit it
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+@contextmanager
+def deadline(seconds: float):
+    """Bound the LLM calls made inside the block to `seconds` from now, or the enclosing deadline if sooner."""
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline; None outside of one."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+def call_timeout(limit: Optional[float] = None) -> float:
+    """
+    Seconds one LLM call may take: LLM_CALL_TIMEOUT_SECONDS, cut to what is left of the
+    request's deadline. Raises 504 once the deadline has passed, so no new call is started.
+    """
+    limit = limit or settings.LLM_CALL_TIMEOUT_SECONDS
+    left = remaining()
+    if left is None:
+        return limit
+    if left <= 0:
+        raise HTTPException(status_code=504, detail="Request deadline exceeded")
+    return min(limit, left)
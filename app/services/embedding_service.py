@@ -0,0 +1,375 @@
+import hashlib
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+from ..config import settings
+from ..database import engine
+from ..models.content import Content
+from ..models.content_brief import ContentBrief
+from ..models.content_section import ContentSection
+from ..models.embedding_chunk import EmbeddingChunk, EmbeddingChunkSource
+from ..models.upload import Upload
+from .llm_cache_service import LRUCache
+from .pdf_extraction_service import get_upload_text
+from .token_service import count_tokens
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+EMBED_BATCH_SIZE = 64
+WORD_RE = re.compile(r"\w+")
+# Brief fields worth retrieving later; the writing sample is style, not subject matter
+BRIEF_FIELDS = [
+    "title",
+    "description",
+    "primary_keyword",
+    "secondary_keywords",
+    "author_instructions",
+    "product_info",
+    "call_to_action",
+]
+
+def normalize(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+class HashingEmbedder:
+    """
+    Deterministic local stand-in: signed feature hashing of words and word bigrams. Needs no
+    network or model download, and texts sharing vocabulary still score as similar.
+    """
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = WORD_RE.findall(text.lower())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                vectors[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        return normalize(vectors)
+
+class OpenAIEmbedder:
+    def __init__(self, model: str = "text-embedding-3-small", dim: int = 512):
+        self.model = model
+        self.dim = dim
+        self.name = f"openai:{model}:{dim}"
+        self._client = None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        from ..clients.rate_limit import estimate_request_tokens, get_limiter
+        if self._client is None:
+            from ..clients.openai import get_openai_client
+            self._client = get_openai_client()
+        # text-embedding-3 models can return shortened vectors; 512 float32s is 2 KB per chunk.
+        # Embedding models have their own rate limits, separate from the chat models'
+        response = get_limiter("openai-embeddings").call_sync(
+            lambda: self._client.embeddings.create(model=self.model, input=list(texts), dimensions=self.dim),
+            tokens=estimate_request_tokens(*texts),
+            used=lambda response: response.usage.total_tokens
+        )
+        return normalize([item.embedding for item in sorted(response.data, key=lambda item: item.index)])
+
+EMBEDDERS = {
+    "hashing": HashingEmbedder,
+    "openai": OpenAIEmbedder,
+}
+
+@lru_cache(maxsize=None)
+def get_embedder(name: Optional[str] = None):
+    name = name or settings.EMBEDDING_BACKEND
+    if name not in EMBEDDERS:
+        raise ValueError(f"Unknown embedding backend: {name}")
+    return EMBEDDERS[name]()
+
+def embed_texts(embedder, texts: List[str]) -> np.ndarray:
+    if not texts:
+        return np.zeros((0, embedder.dim), dtype=np.float32)
+    return np.vstack([
+        embedder.embed(texts[start:start + EMBED_BATCH_SIZE])
+        for start in range(0, len(texts), EMBED_BATCH_SIZE)
+    ])
+
+def _split_words(paragraph: str, max_tokens: int, overlap_tokens: int) -> List[str]:
+    """Overlapping word windows of about max_tokens each, for paragraphs too long to be one chunk."""
+    words = paragraph.split()
+    words_per_token = len(words) / count_tokens(paragraph)
+    size = max(1, int(max_tokens * words_per_token))
+    step = max(1, size - int(overlap_tokens * words_per_token))
+    return [" ".join(words[start:start + size]) for start in range(0, max(len(words) - size + step, 1), step)]
+
+def chunk_text(text: str, max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None) -> List[str]:
+    """Pack whole paragraphs into chunks of up to max_tokens; longer paragraphs are split into windows."""
+    max_tokens = max_tokens or settings.EMBEDDING_CHUNK_TOKENS
+    overlap_tokens = settings.EMBEDDING_CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for paragraph in re.split(r"\n\s*\n", text or ""):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        tokens = count_tokens(paragraph)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        if tokens > max_tokens:
+            chunks.extend(_split_words(paragraph, max_tokens, overlap_tokens))
+            continue
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def source_document(db: Session, source_type: str, source_id: int) -> Optional[Dict[str, Any]]:
+    """user_id, content_id and text of an indexable source, or None if it no longer exists."""
+    if source_type == EmbeddingChunkSource.UPLOAD:
+        upload = db.get(Upload, source_id)
+        if upload is None:
+            return None
+        return {"user_id": upload.user_id, "content_id": None, "text": get_upload_text(db, upload)}
+    if source_type == EmbeddingChunkSource.CONTENT_SECTION:
+        row = db.exec(
+            select(ContentSection.text, ContentSection.content_id, Content.user_id)
+            .join(Content, Content.id == ContentSection.content_id)
+            .where(ContentSection.id == source_id)
+        ).first()
+        if row is None:
+            return None
+        return {"user_id": row.user_id, "content_id": row.content_id, "text": row.text}
+    if source_type == EmbeddingChunkSource.CONTENT_BRIEF:
+        brief = db.get(ContentBrief, source_id)
+        if brief is None:
+            return None
+        text = "\n\n".join(
+            f"{field.replace('_', ' ').capitalize()}: {getattr(brief, field)}"
+            for field in BRIEF_FIELDS if getattr(brief, field)
+        )
+        return {"user_id": brief.user_id, "content_id": brief.content_id, "text": text}
+    raise ValueError(f"Unknown source type: {source_type}")
+
+def delete_source(db: Session, source_type: str, source_id: int) -> None:
+    """Drop a source's chunks (for every embedder) once it has been deleted, so retrieval stops returning them."""
+    db.exec(delete(EmbeddingChunk).where(EmbeddingChunk.source_type == source_type, EmbeddingChunk.source_id == source_id))
+    db.commit()
+
+def index_source(db: Session, source_type: str, source_id: int, embedder=None) -> int:
+    """(Re)index one source. Returns the chunks written; 0 when its text is unchanged since the last run."""
+    embedder = embedder or get_embedder()
+    source_filter = (
+        EmbeddingChunk.source_type == source_type,
+        EmbeddingChunk.source_id == source_id,
+        EmbeddingChunk.embedder == embedder.name,
+    )
+    document = source_document(db, source_type, source_id)
+    if document is None:
+        delete_source(db, source_type, source_id)
+        return 0
+
+    text_sha256 = hashlib.sha256(document["text"].encode("utf-8")).hexdigest()
+    indexed_sha256 = db.exec(select(EmbeddingChunk.text_sha256).where(*source_filter).limit(1)).first()
+    if indexed_sha256 == text_sha256:
+        return 0
+
+    chunks = chunk_text(document["text"])
+    vectors = embed_texts(embedder, chunks)
+    db.exec(delete(EmbeddingChunk).where(*source_filter))
+    db.add_all([
+        EmbeddingChunk(
+            user_id=document["user_id"],
+            source_type=source_type,
+            source_id=source_id,
+            content_id=document["content_id"],
+            chunk_index=i,
+            text=chunk,
+            token_count=count_tokens(chunk),
+            text_sha256=text_sha256,
+            embedder=embedder.name,
+            dim=embedder.dim,
+            vector=vector.tobytes()
+        )
+        for i, (chunk, vector) in enumerate(zip(chunks, vectors))
+    ])
+    db.commit()
+    return len(chunks)
+
+def index_in_background(source_type: str, source_id: int) -> int:
+    """BackgroundTasks / post-save hook: indexing failures are logged, never raised to the caller."""
+    try:
+        with Session(engine) as db:
+            return index_source(db, source_type, source_id)
+    except Exception as e:
+        logger.error(f"Failed to index {source_type} {source_id}: {str(e)}")
+        return 0
+
+def user_sources(db: Session, user_id: int) -> List[tuple]:
+    uploads = db.exec(select(Upload.id).where(Upload.user_id == user_id, Upload.extracted_at.is_not(None))).all()
+    sections = db.exec(
+        select(ContentSection.id).join(Content, Content.id == ContentSection.content_id).where(Content.user_id == user_id)
+    ).all()
+    briefs = db.exec(select(ContentBrief.id).where(ContentBrief.user_id == user_id)).all()
+    return (
+        [(EmbeddingChunkSource.UPLOAD, source_id) for source_id in uploads]
+        + [(EmbeddingChunkSource.CONTENT_SECTION, source_id) for source_id in sections]
+        + [(EmbeddingChunkSource.CONTENT_BRIEF, source_id) for source_id in briefs]
+    )
+
+def index_user(db: Session, user_id: int, embedder=None) -> Dict[str, int]:
+    """Bring a user's whole index up to date. Sources whose text has not changed are skipped."""
+    counts = {"sources": 0, "indexed": 0, "unchanged": 0, "chunks": 0}
+    for source_type, source_id in user_sources(db, user_id):
+        counts["sources"] += 1
+        written = index_source(db, source_type, source_id, embedder)
+        counts["indexed" if written else "unchanged"] += 1
+        counts["chunks"] += written
+    return counts
+
+def _top_k(ids: np.ndarray, scores: np.ndarray, k: int):
+    if k < len(scores):
+        top = np.argpartition(-scores, k)[:k]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top])]
+    return ids[top], scores[top]
+
+class FlatIndex:
+    """Exact search: one matrix-vector product over every chunk."""
+    def __init__(self, ids: np.ndarray, vectors: np.ndarray):
+        self.ids = ids
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: np.ndarray, k: int):
+        return _top_k(self.ids, self.vectors @ query, k)
+
+class IVFIndex:
+    """
+    Approximate search for large users: k-means splits the chunks into ~sqrt(n) lists and a
+    query scans only the `nprobe` lists with the nearest centroids.
+    """
+    def __init__(self, ids: np.ndarray, vectors: np.ndarray, nlist: Optional[int] = None, nprobe: int = 8, iterations: int = 10, seed: int = 0):
+        self.ids = ids
+        self.vectors = vectors
+        nlist = min(nlist or max(1, int(math.sqrt(len(ids)))), len(ids))
+        self.nprobe = min(nprobe, nlist)
+
+        # Train on a sample; the assignment below is the only full pass over the vectors
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), size=min(len(vectors), nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=nlist)[:, None]
+            centroids = normalize(np.where(counts > 0, sums / np.maximum(counts, 1), centroids))
+        self.centroids = centroids
+
+        assignment = np.concatenate([
+            np.argmax(vectors[start:start + 8192] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), 8192)
+        ])
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        self.lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: np.ndarray, k: int):
+        probe = np.argpartition(-(self.centroids @ query), self.nprobe - 1)[:self.nprobe]
+        candidates = np.concatenate([self.lists[c] for c in probe])
+        return _top_k(self.ids[candidates], self.vectors[candidates] @ query, k)
+
+def build_index(ids: np.ndarray, vectors: np.ndarray):
+    if len(ids) >= settings.EMBEDDING_ANN_MIN_CHUNKS:
+        return IVFIndex(ids, vectors)
+    return FlatIndex(ids, vectors)
+
+# (user_id, embedder) -> (fingerprint, index); only ids and vectors are kept in memory
+_indexes = LRUCache(max_entries=64, ttl_seconds=3600)
+
+def load_index(db: Session, user_id: int, embedder_name: str):
+    """A user's index, rebuilt only when their chunks have changed since it was loaded."""
+    user_filter = (EmbeddingChunk.user_id == user_id, EmbeddingChunk.embedder == embedder_name)
+    # Chunks are replaced rather than updated, so any write changes the count or the max id
+    fingerprint = tuple(db.exec(select(func.count(), func.max(EmbeddingChunk.id)).where(*user_filter)).one())
+    cached = _indexes.get(f"{user_id}:{embedder_name}")
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    rows = db.exec(select(EmbeddingChunk.id, EmbeddingChunk.vector).where(*user_filter).order_by(EmbeddingChunk.id)).all()
+    ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+    vectors = np.frombuffer(b"".join(row.vector for row in rows), dtype=np.float32).reshape(len(rows), -1)
+    index = build_index(ids, vectors)
+    _indexes.set(f"{user_id}:{embedder_name}", (fingerprint, index))
+    return index
+
+def retrieve(
+    db: Session,
+    user_id: int,
+    query: str,
+    token_budget: Optional[int] = None,
+    source_types: Optional[Iterable[str]] = None,
+    exclude_content_id: Optional[int] = None,
+    min_score: float = 0.05,
+    embedder=None
+) -> List[Dict[str, Any]]:
+    """
+    The chunks most similar to `query`, best first, taken while they fit in `token_budget`
+    (a chunk that doesn't fit is skipped in favour of smaller ones further down).
+    """
+    token_budget = settings.RETRIEVAL_TOKEN_BUDGET if token_budget is None else token_budget
+    if token_budget <= 0 or not query.strip():
+        return []
+    embedder = embedder or get_embedder()
+    index = load_index(db, user_id, embedder.name)
+    if not len(index):
+        return []
+
+    # Over-fetch: filters are applied afterwards and some candidates won't fit the budget
+    k = 4 * math.ceil(token_budget / settings.EMBEDDING_CHUNK_TOKENS) + 8
+    ids, scores = index.search(embedder.embed([query])[0], k)
+
+    statement = select(EmbeddingChunk).where(EmbeddingChunk.id.in_(ids.tolist()))
+    if source_types:
+        statement = statement.where(EmbeddingChunk.source_type.in_(list(source_types)))
+    if exclude_content_id is not None:
+        statement = statement.where(
+            (EmbeddingChunk.content_id.is_(None)) | (EmbeddingChunk.content_id != exclude_content_id)
+        )
+    chunks = {chunk.id: chunk for chunk in db.exec(statement).all()}
+
+    selected, used = [], 0
+    for chunk_id, score in zip(ids.tolist(), scores.tolist()):
+        chunk = chunks.get(chunk_id)
+        if chunk is None or score < min_score or used + chunk.token_count > token_budget:
+            continue
+        used += chunk.token_count
+        selected.append({
+            "id": chunk.id,
+            "source_type": chunk.source_type,
+            "source_id": chunk.source_id,
+            "chunk_index": chunk.chunk_index,
+            "text": chunk.text,
+            "token_count": chunk.token_count,
+            "score": round(score, 4),
+        })
+    return selected
+
+def format_context(chunks: List[Dict[str, Any]]) -> Optional[str]:
+    if not chunks:
+        return None
+    return "\n\n".join(f"[{chunk['source_type']} {chunk['source_id']}]\n{chunk['text']}" for chunk in chunks)
@@ -0,0 +1,66 @@
+from typing import AsyncIterator, Iterable, Iterator, List, Type
+import orjson
+from sqlmodel import SQLModel, Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import engine, async_engine
+
+NDJSON = "ndjson"
+JSON_ARRAY = "json"
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    JSON_ARRAY: "application/json",
+}
+EXPORT_BATCH_SIZE = 500
+
+def export_statement(model: Type[SQLModel], fields: List[str], filters: list, sort_field: str):
+    columns = [getattr(model, field) for field in fields]
+    sort_column = getattr(model, sort_field)
+    statement = select(*columns).where(*filters).order_by(sort_column.desc(), model.id.desc())
+    # yield_per makes psycopg2/asyncpg use a server-side cursor and buffer only one batch at a time
+    return statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+def iter_rows(statement) -> Iterator[dict]:
+    """
+    Rows from a server-side cursor. The session is opened here rather than taken from the
+    request: yield dependencies are closed before a streaming body is sent.
+    """
+    with Session(engine) as db:
+        for row in db.exec(statement):
+            yield dict(row._mapping)
+
+async def iter_rows_async(statement) -> AsyncIterator[dict]:
+    async with AsyncSession(async_engine) as db:
+        result = await db.stream(statement)
+        async for row in result:
+            yield dict(row._mapping)
+
+def encode_ndjson(rows: Iterable[dict]) -> Iterator[bytes]:
+    for row in rows:
+        yield orjson.dumps(row) + b"\n"
+
+def encode_json_array(rows: Iterable[dict]) -> Iterator[bytes]:
+    """Chunked JSON array: `[`, one encoded row per chunk separated by commas, then `]`."""
+    separator = b"["
+    for row in rows:
+        yield separator + orjson.dumps(row)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+async def encode_ndjson_async(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield orjson.dumps(row) + b"\n"
+
+async def encode_json_array_async(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    separator = b"["
+    async for row in rows:
+        yield separator + orjson.dumps(row)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+def stream_export(statement, format: str = NDJSON, use_async: bool = False):
+    """Byte iterator for a StreamingResponse; memory stays bounded by EXPORT_BATCH_SIZE rows."""
+    if use_async:
+        encode = encode_ndjson_async if format == NDJSON else encode_json_array_async
+        return encode(iter_rows_async(statement))
+    encode = encode_ndjson if format == NDJSON else encode_json_array
+    return encode(iter_rows(statement))
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from fastapi import HTTPException
+from ..config import settings
+from .deadline_service import call_timeout
+from .model_router_service import ModelRoute, ModelRouter, model_router
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+T = TypeVar("T")
+
+class HedgeStats:
+    """Per request type: how many calls were hedged, which attempt won and the time hedging saved."""
+    FIELDS = ("calls", "hedged", "hedge_wins", "primary_wins", "timeouts", "time_saved_ms")
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, request_type: str, name: str, value: float = 1) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(request_type, dict.fromkeys(self.FIELDS, 0))
+            counters[name] += value
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                request_type: {**counters, "time_saved_ms": round(counters["time_saved_ms"], 1)}
+                for request_type, counters in self._counters.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+hedge_stats = HedgeStats()
+
+def hedge_delay(router: ModelRouter, route: ModelRoute, first_token: bool = False) -> Optional[float]:
+    """
+    Seconds to wait on a route before hedging: its rolling p95 (time to first token for
+    streams), or the configured default until it has enough samples. None when disabled.
+    """
+    if not settings.LLM_HEDGING:
+        return None
+    stats = router.stats_for(route)
+    if first_token:
+        samples, p95, default = stats.first_token_samples, stats.first_token_percentile(0.95), settings.LLM_HEDGE_FIRST_TOKEN_AFTER_SECONDS
+    else:
+        samples, p95, default = stats.samples, stats.percentile(0.95), settings.LLM_HEDGE_AFTER_SECONDS
+    if len(samples) >= settings.MODEL_ROUTER_MIN_SAMPLES and p95:
+        return p95 / 1000
+    return default
+
+async def _first_success(tasks: List[asyncio.Task]) -> asyncio.Task:
+    """The first task to finish without an error; if all of them fail, the primary's error is raised."""
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task in done and task.exception() is None:
+                return task
+    tasks[0].result()
+
+async def _race(
+    request_type: str,
+    route: ModelRoute,
+    start: Callable[[ModelRoute, float], Awaitable[T]],
+    delay: Optional[float],
+    router: ModelRouter,
+    provider: Optional[str],
+    first_token: bool = False
+) -> T:
+    timeout = call_timeout()
+    started = time.monotonic()
+    tasks = [asyncio.create_task(start(route, timeout))]
+    hedge_route = None
+    hedge_stats.add(request_type, "calls")
+    try:
+        async with asyncio.timeout(timeout):
+            if delay is not None and delay < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    hedge_route = router.fallback(request_type, route, provider)
+                    hedge_stats.add(request_type, "hedged")
+                    logger.info(f"{route.key} slower than {delay:.2f}s, hedging on {hedge_route.key}")
+                    tasks.append(asyncio.create_task(start(hedge_route, timeout - (time.monotonic() - started))))
+            winner = await _first_success(tasks)
+    except TimeoutError:
+        hedge_stats.add(request_type, "timeouts")
+        raise HTTPException(status_code=504, detail=f"{route.key} did not respond within {timeout:.1f}s")
+    finally:
+        # Cancel the loser (or everything, on timeout) and let it unwind before going on
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if hedge_route is not None:
+        if winner is tasks[0]:
+            hedge_stats.add(request_type, "primary_wins")
+        else:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            hedge_stats.add(request_type, "hedge_wins")
+            # Without the hedge we would have waited for the primary: estimate how much longer
+            # from its past calls that ran at least this long
+            expected_ms = router.stats_for(route).expected_latency(elapsed_ms, first_token)
+            if expected_ms is not None:
+                hedge_stats.add(request_type, "time_saved_ms", expected_ms - elapsed_ms)
+            # The cancelled primary took at least this long; without the sample, a model that
+            # turned slow would keep its old p95 and be picked (and hedged) on every call.
+            # A stream only got as far as its first token, so that is the series it goes in
+            if first_token:
+                router.record_first_token(route, elapsed_ms)
+            else:
+                router.record(route, elapsed_ms, ok=True)
+    return winner.result()
+
+async def hedged_call(
+    request_type: str,
+    route: ModelRoute,
+    attempt: Callable[[ModelRoute, float], Awaitable[T]],
+    router: ModelRouter = None,
+    provider: Optional[str] = None
+) -> T:
+    """
+    Run `attempt(route, timeout)` within the call deadline. If it hasn't returned by the
+    route's p95 latency, start `attempt` on the next best model (or the same one) and
+    return whichever result comes first; the other attempt is cancelled.
+    """
+    router = router or model_router
+    return await _race(request_type, route, attempt, hedge_delay(router, route), router, provider)
+
+async def hedged_stream(
+    request_type: str,
+    route: ModelRoute,
+    open_stream: Callable[[ModelRoute, float], AsyncIterator[str]],
+    router: ModelRouter = None,
+    provider: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of hedged_call: attempts race to their first chunk, measured
+    against the route's time-to-first-token p95, and the rest is read from the winner.
+    """
+    router = router or model_router
+    streams: List[AsyncIterator[str]] = []
+
+    async def first_chunk(attempt_route: ModelRoute, timeout: float) -> Tuple[AsyncIterator[str], Optional[str]]:
+        stream = open_stream(attempt_route, timeout)
+        streams.append(stream)
+        return stream, await anext(stream, None)
+
+    try:
+        stream, chunk = await _race(
+            request_type, route, first_chunk, hedge_delay(router, route, first_token=True), router, provider,
+            first_token=True
+        )
+        while chunk is not None:
+            yield chunk
+            chunk = await anext(stream, None)
+    finally:
+        for opened in streams:
+            await opened.aclose()
@@ -1,15 +1,20 @@
 import os
 import httpx
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential, RetryError
 from typing import Tuple, Optional
+from ..clients.rate_limit import get_limiter
 
 logger = logging.getLogger(__name__)
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+async def _fetch(client: httpx.AsyncClient, url: str, headers: dict) -> httpx.Response:
+    response = await client.get('https://r.jina.ai/' + url, headers=headers)
+    # Raised inside the limiter's slot, so a 429 or 5xx backs it off and is retried behind the pause
+    response.raise_for_status()
+    return response
+
 async def scrape_url(url: str) -> Tuple[Optional[str], Optional[str]]:
     """
-    Scrape content from a URL using Jina's API.
+    Scrape content from a URL using Jina's API, through the "jina" rate limiter.
     Returns a tuple of (content, error).
     """
     api_key = os.getenv("JINA_API_KEY")
@@ -21,8 +26,7 @@ async def scrape_url(url: str) -> Tuple[Optional[str], Optional[str]]:
     try:
         logger.info(f"Attempting to scrape URL: {url}")
         async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.get('https://r.jina.ai/' + url, headers=headers)
-            response.raise_for_status()
+            response = await get_limiter("jina").call(lambda: _fetch(client, url, headers))
             
         logger.info(f"Successfully scraped URL: {url}")
         return response.text, None
@@ -0,0 +1,122 @@
+import asyncio
+import functools
+import json
+import logging
+import uuid
+from datetime import datetime, UTC
+from typing import Any, Awaitable, Callable, Dict, Optional
+from fastapi import HTTPException
+from sqlmodel import Session
+from ..config import settings
+from ..models.job import Job, JobStatus
+from ..schemas.job import JobAccepted
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+def create_job(
+    db: Session,
+    task: str,
+    payload: Optional[Dict[str, Any]] = None,
+    user_id: Optional[int] = None
+) -> Job:
+    job = Job(id=uuid.uuid4().hex, task=task, payload=payload or {}, user_id=user_id)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+def send_job_message(job: Job) -> None:
+    # The message only carries the job id; the payload lives on the jobs row
+    settings.sqs_client.send_message(
+        QueueUrl=settings.SQS_QUEUE_URL,
+        MessageBody=json.dumps({"task": job.task, "job_id": job.id})
+    )
+
+async def enqueue(
+    db: Session,
+    task: str,
+    payload: Optional[Dict[str, Any]] = None,
+    user_id: Optional[int] = None
+) -> Job:
+    """Record a queued job and hand it to SQS. The job is marked failed if the send fails."""
+    job = create_job(db, task, payload, user_id)
+    try:
+        await asyncio.to_thread(send_job_message, job)
+    except Exception as e:
+        fail_job(db, job, f"Failed to enqueue: {str(e)}")
+        logger.error(f"Failed to enqueue job {job.id} ({task}): {str(e)}")
+        raise HTTPException(status_code=503, detail="Failed to enqueue job")
+    logger.info(f"Enqueued job {job.id} ({task})")
+    return job
+
+def accepted(job: Job) -> JobAccepted:
+    return JobAccepted(job_id=job.id, status=job.status, status_url=f"/jobs/{job.id}")
+
+def get_job(db: Session, job_id: str, user_id: Optional[int] = None) -> Job:
+    """The job; with `user_id`, only if that user enqueued it (anyone else gets a 404)."""
+    job = db.get(Job, job_id)
+    if not job or (user_id is not None and job.user_id != user_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+def start_job(db: Session, job: Job) -> Job:
+    job.status = JobStatus.RUNNING
+    job.attempts += 1
+    job.started_at = datetime.now(UTC)
+    job.error = None
+    db.add(job)
+    db.commit()
+    return job
+
+def set_progress(db: Session, job: Job, progress: float) -> Job:
+    job.progress = max(0.0, min(1.0, progress))
+    db.add(job)
+    db.commit()
+    return job
+
+def finish_job(db: Session, job: Job, result: Optional[Dict[str, Any]] = None) -> Job:
+    job.status = JobStatus.SUCCEEDED
+    job.progress = 1.0
+    job.result = result
+    job.finished_at = datetime.now(UTC)
+    db.add(job)
+    db.commit()
+    return job
+
+def fail_job(db: Session, job: Job, error: str) -> Job:
+    job.status = JobStatus.FAILED
+    job.error = error
+    job.finished_at = datetime.now(UTC)
+    db.add(job)
+    db.commit()
+    return job
+
+def job_task(handler: Callable[[Job, Session], Awaitable[Optional[Dict[str, Any]]]]):
+    """
+    Adapt `handler(job, db)` to the TASK_HANDLERS signature `(message, db)`, keeping the
+    jobs row's status, timings and result in step. Errors are recorded and re-raised so
+    the SQS message is retried.
+    """
+    @functools.wraps(handler)
+    async def run(message: Dict[str, Any], db: Session) -> None:
+        job = db.get(Job, message.get("job_id"))
+        if job is None:
+            logger.error(f"Job {message.get('job_id')} for task {message.get('task')} not found")
+            return
+        if job.status == JobStatus.SUCCEEDED:
+            # SQS is at-least-once; a redelivered message for a finished job is a no-op
+            logger.info(f"Job {job.id} already succeeded; skipping")
+            return
+
+        start_job(db, job)
+        try:
+            result = await handler(job, db)
+        except Exception as e:
+            db.rollback()
+            fail_job(db, job, str(e))
+            logger.error(f"Job {job.id} ({job.task}) failed: {str(e)}")
+            raise
+        finish_job(db, job, result)
+        logger.info(f"Job {job.id} ({job.task}) succeeded")
+    return run
@@ -0,0 +1,178 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, UTC
+from typing import Any, Awaitable, Callable, Dict, Optional
+from sqlmodel import Session, delete
+from ..config import settings
+from ..database import engine
+from ..models.llm_cache_entry import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+def make_cache_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    tools: Any = None,
+    temperature: Optional[float] = None,
+    **extra: Any
+) -> str:
+    """Content-addressed key: identical model/prompt/tool/temperature inputs hash to the same key."""
+    payload = {
+        "model": model,
+        "system_prompt": system_prompt,
+        "user_prompt": user_prompt,
+        "tools": tools,
+        "temperature": temperature,
+        **extra,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class LRUCache:
+    """In-process LRU with a per-entry TTL."""
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class LLMResponseCache:
+    """
+    Two-tier cache for JSON-serialisable LLM responses: an LRU in front of the
+    llm_cache_entries table. Database errors are logged and treated as misses.
+    Callers get their own copy of a response, so mutating it never changes the cached entry.
+    """
+    def __init__(
+        self,
+        max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = settings.LLM_CACHE_TTL_SECONDS,
+        persistent: bool = settings.LLM_CACHE_PERSISTENT,
+        enabled: bool = settings.LLM_CACHE_ENABLED
+    ):
+        self.memory = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self.enabled = enabled
+        self.counters = {"memory_hits": 0, "db_hits": 0, "misses": 0, "bypassed": 0, "errors": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["memory_hits"] + self.counters["db_hits"] + self.counters["misses"]
+        hits = self.counters["memory_hits"] + self.counters["db_hits"]
+        return {
+            **self.counters,
+            "memory_entries": len(self.memory),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def _db_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with Session(engine) as db:
+            entry = db.get(LLMCacheEntry, key)
+            if entry is None:
+                return None
+            if entry.expires_at <= datetime.now(UTC):
+                db.delete(entry)
+                db.commit()
+                return None
+            entry.hit_count += 1
+            db.commit()
+            return entry.response
+
+    def _db_set(self, key: str, model: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        with Session(engine) as db:
+            db.merge(LLMCacheEntry(
+                key=key,
+                model=model,
+                response=value,
+                expires_at=datetime.now(UTC) + timedelta(seconds=ttl_seconds)
+            ))
+            db.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the persistent tier. Returns the number removed."""
+        with Session(engine) as db:
+            result = db.exec(delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= datetime.now(UTC)))
+            db.commit()
+            return result.rowcount
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.counters["memory_hits"] += 1
+            return copy.deepcopy(value)
+
+        if self.persistent:
+            try:
+                value = await asyncio.to_thread(self._db_get, key)
+            except Exception as e:
+                self.counters["errors"] += 1
+                logger.error(f"LLM cache lookup failed: {str(e)}")
+            if value is not None:
+                self.counters["db_hits"] += 1
+                self.memory.set(key, copy.deepcopy(value))
+                return value
+
+        self.counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, model: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.memory.set(key, copy.deepcopy(value), ttl)
+        if self.persistent:
+            try:
+                await asyncio.to_thread(self._db_set, key, model, value, ttl)
+            except Exception as e:
+                self.counters["errors"] += 1
+                logger.error(f"LLM cache write failed: {str(e)}")
+
+    async def get_or_call(
+        self,
+        key: str,
+        model: str,
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+        use_cache: bool = True,
+        ttl_seconds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Return the cached response for `key`, or run `call` and cache its result."""
+        if not (use_cache and self.enabled):
+            self.counters["bypassed"] += 1
+            return await call()
+
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        value = await call()
+        await self.set(key, model, value, ttl_seconds)
+        return value
+
+llm_cache = LLMResponseCache()
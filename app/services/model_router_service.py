@@ -0,0 +1,275 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from sqlmodel import Session, select
+from ..config import settings
+from ..database import engine
+from ..models.ai_model import AIModel
+from ..models.ai_provider import AIProvider
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SECTION_REQUEST = "content_section"
+CONTENT_BLOCK_REQUEST = "content_block"
+STITCH_REQUEST = "stitch"
+
+# Environment variables that make a provider usable; the fake provider needs none
+PROVIDER_API_KEYS = {
+    "openai": ["OPEN_AI_API_KEY", "OPENAI_API_KEY"],
+    "anthropic": ["ANTHROPIC_API_KEY"],
+    "fake": [],
+}
+
+@dataclass
+class ModelRoute:
+    provider: str
+    model: str
+    quality_tier: int = 1
+    # Request types this model may serve; empty means any
+    request_types: List[str] = field(default_factory=list)
+    # OpenAI-compatible endpoint other than OpenAI's own
+    base_url: Optional[str] = None
+    api_key_env: Optional[str] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    @property
+    def limiter_key(self) -> str:
+        """Rate limits are per account: OpenAI-compatible endpoints other than OpenAI's get their own."""
+        return self.base_url or self.provider
+
+    def serves(self, request_type: str) -> bool:
+        required_tier = settings.MODEL_ROUTER_REQUEST_TIERS.get(request_type, 1)
+        return self.quality_tier >= required_tier and (not self.request_types or request_type in self.request_types)
+
+    def available(self) -> bool:
+        names = [self.api_key_env] if self.api_key_env else PROVIDER_API_KEYS.get(self.provider, [])
+        return not names or any(os.getenv(name) for name in names)
+
+def default_routes() -> List[ModelRoute]:
+    """Used until the ai_models table has rows: the models the app was hardcoded to."""
+    from ..clients.anthropic import DEFAULT_MODEL as ANTHROPIC_DEFAULT_MODEL
+    return [
+        ModelRoute(provider="openai", model="gpt-4o-mini", quality_tier=2),
+        ModelRoute(provider="anthropic", model=ANTHROPIC_DEFAULT_MODEL, quality_tier=3),
+    ]
+
+def route_from_rows(provider: AIProvider, ai_model: AIModel) -> ModelRoute:
+    """
+    custom_fields on the provider: "kind" ("openai", "anthropic", "fake"; defaults to the
+    pydantic_ai wrapper), "api_key_env". On the model: "quality_tier", "request_types",
+    "enabled", plus anything provider-specific (e.g. the fake provider's "latency_ms").
+    A model without a "quality_tier" is taken to meet every request type's tier, so rows
+    registered before tiers existed don't leave a request type with no model at all.
+    """
+    provider_fields = provider.custom_fields or {}
+    model_fields = ai_model.custom_fields or {}
+    top_tier = max(settings.MODEL_ROUTER_REQUEST_TIERS.values(), default=1)
+    kind = provider_fields.get("kind") or ("openai" if provider.is_openai_compatible else provider.pydantic_ai_wrapper.lower())
+    return ModelRoute(
+        provider=kind,
+        model=ai_model.name,
+        quality_tier=int(model_fields.get("quality_tier", top_tier)),
+        request_types=list(model_fields.get("request_types", [])),
+        base_url=provider.api_endpoint if provider.is_openai_compatible and provider.api_endpoint else None,
+        api_key_env=provider_fields.get("api_key_env"),
+        options=model_fields
+    )
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+class ModelStats:
+    """Latency and outcome of a model's last `window` calls, and time to first token of its streams."""
+    def __init__(self, window: int):
+        self.samples: deque = deque(maxlen=window)
+        self.first_token_samples: deque = deque(maxlen=window)
+        self.last_failure_at: Optional[float] = None
+        self.calls = 0
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        self.samples.append((latency_ms, ok))
+        self.calls += 1
+        if not ok:
+            self.last_failure_at = time.monotonic()
+
+    def record_first_token(self, latency_ms: float) -> None:
+        self.first_token_samples.append(latency_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        return _percentile([latency for latency, ok in self.samples if ok], q)
+
+    def first_token_percentile(self, q: float) -> Optional[float]:
+        return _percentile(list(self.first_token_samples), q)
+
+    def expected_latency(self, elapsed_ms: float, first_token: bool = False) -> Optional[float]:
+        """Median latency (time to first token for streams) of the successful calls that took longer than `elapsed_ms`, if any did."""
+        latencies = self.first_token_samples if first_token else [latency for latency, ok in self.samples if ok]
+        return _percentile([latency for latency in latencies if latency > elapsed_ms], 0.5)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def healthy(self) -> bool:
+        if len(self.samples) < settings.MODEL_ROUTER_MIN_SAMPLES or self.error_rate <= settings.MODEL_ROUTER_MAX_ERROR_RATE:
+            return True
+        # Half-open: once no call has failed for RETRY seconds, let traffic back to see if it recovered
+        return time.monotonic() - self.last_failure_at >= settings.MODEL_ROUTER_RETRY_SECONDS
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "window": len(self.samples),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "first_token_p95_ms": self.first_token_percentile(0.95),
+            "error_rate": round(self.error_rate, 4),
+            "healthy": self.healthy(),
+        }
+
+class ModelRouter:
+    """
+    In-memory registry of the models in ai_providers/ai_models, re-read every
+    MODEL_ROUTER_REFRESH_SECONDS, that sends each request type to the healthy model with
+    the lowest rolling p95 latency among those meeting its quality tier.
+    """
+    def __init__(self, routes: Optional[List[ModelRoute]] = None):
+        # Fixed routes (tests, scripts) are never replaced by a refresh
+        self._fixed = routes is not None
+        self.routes: List[ModelRoute] = routes or []
+        self.stats: Dict[str, ModelStats] = {}
+        self.loaded_at: Optional[float] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Optional[Session] = None) -> None:
+        try:
+            if db is None:
+                with Session(engine) as session:
+                    rows = session.exec(select(AIProvider, AIModel).join(AIModel, AIModel.provider_id == AIProvider.id)).all()
+            else:
+                rows = db.exec(select(AIProvider, AIModel).join(AIModel, AIModel.provider_id == AIProvider.id)).all()
+            routes = [
+                route_from_rows(provider, ai_model)
+                for provider, ai_model in rows
+                if (ai_model.custom_fields or {}).get("enabled", True)
+            ]
+        except Exception as e:
+            # Keep routing on what we had; try again after the next interval
+            logger.error(f"Failed to refresh model registry: {str(e)}")
+            routes = self.routes or default_routes()
+        with self._lock:
+            self.routes = routes or default_routes()
+            self.loaded_at = time.monotonic()
+        logger.info(f"Model registry: {[route.key for route in self.routes]}")
+
+    def _maybe_refresh(self) -> None:
+        if self._fixed:
+            return
+        if self.loaded_at is None:
+            # Nothing to route on yet: the first load of the process is waited for
+            self.refresh()
+            return
+        if time.monotonic() - self.loaded_at < settings.MODEL_ROUTER_REFRESH_SECONDS:
+            return
+        # Stale: keep routing on the current registry while a thread re-reads it, so select()
+        # never blocks the event loop on the query
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="model-router-refresh", daemon=True).start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def stats_for(self, route: ModelRoute) -> ModelStats:
+        with self._lock:
+            if route.key not in self.stats:
+                self.stats[route.key] = ModelStats(settings.MODEL_ROUTER_WINDOW)
+            return self.stats[route.key]
+
+    def candidates(self, request_type: str, provider: Optional[str] = None) -> List[ModelRoute]:
+        self._maybe_refresh()
+        return [
+            route for route in self.routes
+            if route.serves(request_type) and route.available() and (provider is None or route.provider == provider)
+        ]
+
+    def select(self, request_type: str, provider: Optional[str] = None) -> ModelRoute:
+        candidates = self.candidates(request_type, provider)
+        if not candidates:
+            raise HTTPException(status_code=503, detail=f"No model available for {request_type}")
+
+        healthy = [route for route in candidates if self.stats_for(route).healthy()]
+        if not healthy:
+            # Everything is failing: the least bad model beats refusing outright
+            return min(candidates, key=lambda route: self.stats_for(route).error_rate)
+        return min(healthy, key=self._rank)
+
+    def fallback(self, request_type: str, route: ModelRoute, provider: Optional[str] = None) -> ModelRoute:
+        """The best healthy model other than `route` for a second attempt; `route` itself if there is none."""
+        others = [
+            candidate for candidate in self.candidates(request_type, provider)
+            if candidate.key != route.key and self.stats_for(candidate).healthy()
+        ]
+        return min(others, key=self._rank) if others else route
+
+    def _rank(self, route: ModelRoute) -> tuple:
+        stats = self.stats_for(route)
+        # Models without enough samples sort first, so new ones get measured
+        if len(stats.samples) < settings.MODEL_ROUTER_MIN_SAMPLES:
+            return (0.0, route.quality_tier)
+        return (stats.percentile(0.95) or 0.0, route.quality_tier)
+
+    def record(self, route: ModelRoute, latency_ms: float, ok: bool) -> None:
+        self.stats_for(route).record(latency_ms, ok)
+
+    def record_first_token(self, route: ModelRoute, latency_ms: float) -> None:
+        self.stats_for(route).record_first_token(latency_ms)
+
+    @asynccontextmanager
+    async def track(self, route: ModelRoute):
+        """Time the wrapped call and record it against the route; exceptions count as errors."""
+        started = time.perf_counter()
+        try:
+            yield route
+        except Exception:
+            self.record(route, (time.perf_counter() - started) * 1000, ok=False)
+            raise
+        self.record(route, (time.perf_counter() - started) * 1000, ok=True)
+
+    def snapshot(self) -> List[dict]:
+        self._maybe_refresh()
+        return [
+            {
+                "provider": route.provider,
+                "model": route.model,
+                "quality_tier": route.quality_tier,
+                "available": route.available(),
+                **self.stats_for(route).as_dict(),
+            }
+            for route in self.routes
+        ]
+
+model_router = ModelRouter()
@@ -1,7 +1,9 @@
 from fastapi import HTTPException
 from typing import List
 from pydantic import BaseModel
-from ..clients.openai import OpenAIClient
+from ..clients.openai import get_async_openai_client
+from .deadline_service import call_timeout
+from .llm_cache_service import llm_cache, make_cache_key
 
 # Model definitions
 class ExampleModel(BaseModel):
@@ -17,8 +19,9 @@ class ExampleData(BaseModel):
     questions: List[QuestionModel]
 
 class OpenAIService:
-    def __init__(self):
-        self.client = OpenAIClient()
+    def __init__(self, client=None):
+        # Reuse the process-wide async client instead of building a connection pool per service
+        self.client = client or get_async_openai_client()
 
     def _create_topic_messages(self, topic: str) -> list[dict]:
         """Create the messages for topic generation."""
@@ -39,16 +42,31 @@ class OpenAIService:
             }
         ]
 
-    async def generate_example_data(self, topic: str) -> ExampleData:
+    async def generate_example_data(self, topic: str, use_cache: bool = True) -> ExampleData:
         """Generate structured topic data using OpenAI."""
         try:
             messages = self._create_topic_messages(topic)
-            return self.client.get_completion(
-                response_model=ExampleData,
-                messages=messages,
+
+            async def call() -> dict:
+                data = await self.client.get_structured_response(
+                    response_model=ExampleData,
+                    system_prompt=messages[0]["content"],
+                    user_prompt=messages[1]["content"],
+                    model="gpt-4o-mini",
+                    temperature=0.7,
+                    timeout=call_timeout()
+                )
+                return data.model_dump()
+
+            key = make_cache_key(
                 model="gpt-4o-mini",
-                temperature=0.7
+                system_prompt=messages[0]["content"],
+                user_prompt=messages[1]["content"],
+                temperature=0.7,
+                response_format=ExampleData.__name__
             )
+            data = await llm_cache.get_or_call(key, "gpt-4o-mini", call, use_cache=use_cache)
+            return ExampleData.model_validate(data)
         except Exception as e:
             raise HTTPException(
                 status_code=500, 
@@ -0,0 +1,90 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlmodel import SQLModel, Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    payload = json.dumps({"s": sort_value.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["s"]), int(payload["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_fields(
+    fields: Optional[str],
+    model: Type[SQLModel],
+    default: List[str],
+    required: List[str]
+) -> List[str]:
+    """
+    Resolve a `fields=a,b,c` projection against the model's columns. The keyset
+    columns in `required` are always selected so the next cursor can be built.
+    """
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else list(default)
+    columns = set(model.__table__.columns.keys())
+    unknown = [field for field in selected if field not in columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(required + selected))
+
+def _page_statement(
+    model: Type[SQLModel],
+    sort_field: str,
+    fields: List[str],
+    filters: list,
+    limit: int,
+    cursor: Optional[str]
+):
+    sort_column = getattr(model, sort_field)
+    statement = select(*[getattr(model, field) for field in fields]).where(*filters)
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        # Row-value comparison walks the (…, sort_field, id) index from where the last page stopped
+        statement = statement.where(tuple_(sort_column, model.id) < tuple_(sort_value, row_id))
+    # Fetch one extra row to know whether there is a next page
+    return statement.order_by(sort_column.desc(), model.id.desc()).limit(limit + 1)
+
+def _build_page(rows: list, sort_field: str, limit: int) -> Dict[str, Any]:
+    items = [dict(row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last[sort_field], last["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+def paginate(
+    db: Session,
+    model: Type[SQLModel],
+    sort_field: str,
+    fields: List[str],
+    filters: list,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Newest-first keyset page over (sort_field, id). Returns {"items": [...], "next_cursor": ...}."""
+    statement = _page_statement(model, sort_field, fields, filters, limit, cursor)
+    return _build_page(db.exec(statement).all(), sort_field, limit)
+
+async def paginate_async(
+    db: AsyncSession,
+    model: Type[SQLModel],
+    sort_field: str,
+    fields: List[str],
+    filters: list,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    statement = _page_statement(model, sort_field, fields, filters, limit, cursor)
+    return _build_page((await db.exec(statement)).all(), sort_field, limit)
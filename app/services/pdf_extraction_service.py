@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import func, update, delete
+from sqlmodel import Session, select
+from ..config import settings
+from ..models.upload import Upload
+from ..models.upload_page import UploadPage
+from .pdf_text import extract_pages
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Upload.file_path is relative to the app package, as written by the uploads router
+UPLOADS_BASE_DIR = Path(__file__).resolve().parent.parent
+
+_executor: Optional[Executor] = None
+
+def get_executor() -> Executor:
+    """
+    Process pool shared by the process. "spawn" rather than fork: the parent runs an event
+    loop and several threads, which are unsafe to fork. Where no pool can be created (AWS
+    Lambda has no /dev/shm for its locks) extraction falls back to threads.
+    """
+    global _executor
+    if _executor is None:
+        try:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PDF_EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"No process pool for PDF extraction, using threads: {str(e)}")
+            _executor = ThreadPoolExecutor(max_workers=settings.PDF_EXTRACTION_WORKERS)
+    return _executor
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def pending_uploads(db: Session, upload_ids: Optional[Iterable[int]] = None, incremental: bool = True) -> Dict[str, str]:
+    """sha256 -> file path for uploads that need extracting. One entry per content hash."""
+    statement = select(Upload.sha256, Upload.file_path).where(Upload.sha256.is_not(None))
+    if upload_ids is not None:
+        statement = statement.where(Upload.id.in_(list(upload_ids)))
+    if incremental:
+        statement = statement.where(Upload.extracted_at.is_(None))
+    return {row.sha256: row.file_path for row in db.exec(statement).all()}
+
+def cached_page_counts(db: Session, hashes: Iterable[str]) -> Dict[str, int]:
+    """Hashes whose pages were already extracted (e.g. for another upload of the same PDF)."""
+    rows = db.exec(
+        select(UploadPage.sha256, func.count())
+        .where(UploadPage.sha256.in_(list(hashes)))
+        .group_by(UploadPage.sha256)
+    ).all()
+    return {sha256: count for sha256, count in rows}
+
+def mark_extracted(db: Session, sha256: str, page_count: int) -> None:
+    db.exec(
+        update(Upload)
+        .where(Upload.sha256 == sha256)
+        .values(page_count=page_count, extracted_at=datetime.now(UTC), extraction_error=None)
+    )
+    db.commit()
+
+def mark_failed(db: Session, sha256: str, error: str) -> None:
+    db.exec(update(Upload).where(Upload.sha256 == sha256).values(extraction_error=error[:1000]))
+    db.commit()
+
+def save_pages(db: Session, sha256: str, pages: list[str]) -> None:
+    db.exec(delete(UploadPage).where(UploadPage.sha256 == sha256))
+    db.add_all([
+        UploadPage(sha256=sha256, page_number=number, text=text, char_count=len(text))
+        for number, text in enumerate(pages, start=1)
+    ])
+    mark_extracted(db, sha256, len(pages))
+
+async def extract_uploads(
+    db: Session,
+    upload_ids: Optional[Iterable[int]] = None,
+    incremental: bool = True,
+    executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """
+    Extract page text for uploads on the process pool. Incremental mode only looks at uploads
+    never extracted, and reuses pages already stored for the same content hash; full mode
+    re-parses every selected PDF.
+    """
+    started = time.perf_counter()
+    pending = pending_uploads(db, upload_ids, incremental)
+    counts = {"pdfs": len(pending), "cached": 0, "parsed": 0, "failed": 0, "pages": 0}
+
+    if incremental and pending:
+        for sha256, page_count in cached_page_counts(db, pending).items():
+            mark_extracted(db, sha256, page_count)
+            del pending[sha256]
+            counts["cached"] += 1
+
+    if pending:
+        executor = executor or get_executor()
+    loop = asyncio.get_running_loop()
+
+    async def extract(sha256: str, path: str):
+        try:
+            return sha256, await loop.run_in_executor(executor, extract_pages, str(UPLOADS_BASE_DIR / path)), None
+        except Exception as e:
+            return sha256, None, e
+
+    # Pages are saved as each PDF finishes rather than after the slowest one
+    for finished in asyncio.as_completed([extract(sha256, path) for sha256, path in pending.items()]):
+        sha256, pages, error = await finished
+        if error is not None:
+            mark_failed(db, sha256, str(error))
+            counts["failed"] += 1
+            logger.error(f"Failed to extract text for {sha256}: {str(error)}")
+            continue
+        save_pages(db, sha256, pages)
+        counts["parsed"] += 1
+        counts["pages"] += len(pages)
+
+    elapsed = time.perf_counter() - started
+    counts["elapsed_seconds"] = round(elapsed, 3)
+    counts["pages_per_second"] = round(counts["pages"] / elapsed, 1) if elapsed else 0.0
+    logger.info(f"PDF extraction: {counts}")
+    return counts
+
+def get_upload_text(db: Session, upload: Upload, max_chars: Optional[int] = None) -> str:
+    """Concatenated page text for an upload, e.g. as context for a brief."""
+    pages = db.exec(
+        select(UploadPage.text).where(UploadPage.sha256 == upload.sha256).order_by(UploadPage.page_number)
+    ).all()
+    text = "\n\n".join(pages)
+    return text[:max_chars] if max_chars else text
@@ -0,0 +1,20 @@
+"""
+Page text extraction that runs inside ProcessPoolExecutor workers. Kept free of app imports
+so spawned workers start quickly and never touch settings or the database.
+"""
+import re
+
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines; PDF text layers are full of both."""
+    text = _SPACES.sub(" ", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return "\n".join(line.strip() for line in text.split("\n")).strip()
+
+def extract_pages(path: str) -> list[str]:
+    """Text of every page in the PDF at `path`, in page order."""
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    return [normalize_text(page.extract_text() or "") for page in reader.pages]
@@ -0,0 +1,58 @@
+import threading
+import logging
+from typing import Optional
+from cachetools import TTLCache
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..config import settings
+from ..models.user import User
+from ..schemas.principal import Principal
+
+logger = logging.getLogger(__name__)
+
+# Cache is per process: the Stripe webhook invalidates entries on the instance that
+# handled it, and the short TTL bounds staleness everywhere else
+_cache: TTLCache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+_lock = threading.Lock()
+
+PRINCIPAL_COLUMNS = [getattr(User, field) for field in Principal.model_fields]
+
+def _principal_statement(user_id: int):
+    # Column select so no relationship loaders run
+    return select(*PRINCIPAL_COLUMNS).where(User.id == user_id)
+
+def _from_row(row) -> Optional[Principal]:
+    return Principal.model_validate(dict(row._mapping)) if row is not None else None
+
+def _cached(user_id: int) -> Optional[Principal]:
+    with _lock:
+        return _cache.get(user_id)
+
+def _store(principal: Optional[Principal]) -> Optional[Principal]:
+    if principal is not None:
+        with _lock:
+            _cache[principal.id] = principal
+    return principal
+
+def get_principal(db: Session, user_id: int) -> Optional[Principal]:
+    principal = _cached(user_id)
+    if principal is not None:
+        return principal
+    return _store(_from_row(db.exec(_principal_statement(user_id)).first()))
+
+async def get_principal_async(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    principal = _cached(user_id)
+    if principal is not None:
+        return principal
+    return _store(_from_row((await db.exec(_principal_statement(user_id))).first()))
+
+def invalidate(user_id: int) -> None:
+    with _lock:
+        _cache.pop(user_id, None)
+
+def clear() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,119 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session, select
+from ..config import settings
+from ..database import engine
+from ..models.ai_model import AIModel
+from .llm_cache_service import LRUCache
+from .token_service import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Priorities: parts with a higher number are truncated, then dropped, first
+REQUIRED = 0
+
+@dataclass
+class PromptPart:
+    name: str
+    text: str
+    priority: int = REQUIRED
+    # Truncating below this many tokens drops the part instead
+    min_tokens: int = 0
+    # Precomputed count (e.g. cached on the brief); counted on demand otherwise
+    tokens: Optional[int] = None
+
+    def __post_init__(self):
+        if self.tokens is None:
+            self.tokens = count_tokens(self.text)
+
+@dataclass
+class PackedPrompt:
+    parts: List[PromptPart]
+    budget: int
+    tokens: int = 0
+    truncated: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.tokens > self.budget
+
+    def text(self, separator: str = "\n\n") -> str:
+        return separator.join(part.text for part in self.parts if part.text)
+
+    def as_dict(self) -> dict:
+        return {
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "truncated": self.truncated,
+            "dropped": self.dropped,
+        }
+
+def pack(parts: List[PromptPart], budget: int) -> PackedPrompt:
+    """
+    Fit `parts` into `budget` tokens. Starting with the lowest priority, each part is
+    truncated just enough to cover the overflow, or dropped if that would leave it under
+    its min_tokens. Required parts are never touched, so a prompt can still end up over
+    budget; callers get `over_budget` rather than an exception.
+    """
+    packed = PackedPrompt(parts=[PromptPart(**part.__dict__) for part in parts], budget=budget)
+    total = sum(part.tokens for part in packed.parts)
+    for part in sorted(packed.parts, key=lambda part: part.priority, reverse=True):
+        overflow = total - budget
+        if overflow <= 0 or part.priority == REQUIRED:
+            break
+        if not part.tokens:
+            continue
+        keep = part.tokens - overflow
+        if keep >= max(part.min_tokens, 1):
+            part.text = truncate_to_tokens(part.text, keep)
+            packed.truncated.append(part.name)
+            new_tokens = count_tokens(part.text)
+        else:
+            part.text = ""
+            packed.dropped.append(part.name)
+            new_tokens = 0
+        total -= part.tokens - new_tokens
+        part.tokens = new_tokens
+    packed.tokens = total
+    if packed.truncated or packed.dropped:
+        logger.info(f"Packed prompt: {packed.as_dict()}")
+    if packed.over_budget:
+        logger.warning(f"Prompt still over budget after packing: {packed.as_dict()}")
+    return packed
+
+# Model name -> prompt token budget; AIModel rows change rarely
+_budgets = LRUCache(max_entries=256, ttl_seconds=300)
+
+def budget_from_custom_fields(custom_fields: Dict[str, Any]) -> Optional[int]:
+    """
+    An explicit `prompt_token_budget`, or what's left of `context_window` after
+    `max_output_tokens`.
+    """
+    if custom_fields.get("prompt_token_budget"):
+        return int(custom_fields["prompt_token_budget"])
+    if custom_fields.get("context_window"):
+        return int(custom_fields["context_window"]) - int(custom_fields.get("max_output_tokens", 0))
+    return None
+
+def get_prompt_budget(model: str) -> int:
+    """
+    Prompt token budget for a model from its AIModel.custom_fields, falling back to
+    DEFAULT_PROMPT_TOKEN_BUDGET. Accepts pydantic_ai names like "openai:gpt-4o-mini".
+    """
+    name = model.split(":", 1)[-1]
+    budget = _budgets.get(name)
+    if budget is not None:
+        return budget
+    budget = settings.DEFAULT_PROMPT_TOKEN_BUDGET
+    try:
+        with Session(engine) as db:
+            ai_model = db.exec(select(AIModel).where(AIModel.name == name)).first()
+        if ai_model is not None:
+            budget = budget_from_custom_fields(ai_model.custom_fields or {}) or budget
+    except Exception as e:
+        logger.error(f"Failed to load prompt budget for {name}: {str(e)}")
+    _budgets.set(name, budget)
+    return budget
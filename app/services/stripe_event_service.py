@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, UTC
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+from ..config import settings
+from ..database import engine
+from ..models.stripe_event import StripeEvent, StripeEventStatus
+from . import principal_service
+from .stripe_service import handle_stripe_event
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+PROCESS_STRIPE_EVENTS = "process_stripe_events"
+
+def event_customer_key(event: Dict[str, Any]) -> str:
+    """Events are ordered per Stripe customer; events without one are processed on their own."""
+    obj = event.get("data", {}).get("object", {})
+    customer = obj.get("id") if obj.get("object") == "customer" else obj.get("customer")
+    if isinstance(customer, dict):
+        customer = customer.get("id")
+    return customer or event["id"]
+
+def record_event(db: Session, event: Dict[str, Any]) -> tuple[StripeEvent, bool]:
+    """
+    Store a verified event. Returns (row, created); created is False when Stripe redelivered
+    an event we already have.
+    """
+    statement = insert(StripeEvent).values(
+        id=event["id"],
+        type=event["type"],
+        customer_key=event_customer_key(event),
+        payload=event,
+        status=StripeEventStatus.RECEIVED,
+        attempts=0,
+        created=datetime.fromtimestamp(event.get("created", 0), UTC),
+        received_at=datetime.now(UTC)
+    ).on_conflict_do_nothing(index_elements=["id"])
+    created = db.exec(statement).rowcount == 1
+    db.commit()
+    return db.get(StripeEvent, event["id"]), created
+
+def process_pending_events(db: Session, customer_key: str) -> int:
+    """
+    Apply a customer's unprocessed events in Stripe's creation order. A Postgres advisory
+    lock makes concurrent workers for the same customer take turns. Stops at the first
+    failure so later events are never applied ahead of it; the error is re-raised.
+    """
+    processed = 0
+    with db.get_bind().connect() as lock_connection:
+        # Session-level lock on its own connection: the Session commits (and may swap connections) per event
+        lock_connection.execute(text("SELECT pg_advisory_lock(hashtext(:key))"), {"key": f"stripe:{customer_key}"})
+        try:
+            events = db.exec(
+                select(StripeEvent)
+                .where(
+                    StripeEvent.customer_key == customer_key,
+                    StripeEvent.status != StripeEventStatus.PROCESSED
+                )
+                .order_by(StripeEvent.created, StripeEvent.received_at)
+            ).all()
+            for stripe_event in events:
+                apply_event(db, stripe_event)
+                processed += 1
+        finally:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": f"stripe:{customer_key}"})
+            lock_connection.commit()
+    return processed
+
+def apply_event(db: Session, stripe_event: StripeEvent) -> None:
+    """
+    Apply one event and mark it processed in a single transaction, so a crash in between
+    can't leave the change applied but the event pending (and applied again on replay).
+    """
+    stripe_event.attempts += 1
+    attempts = stripe_event.attempts
+    try:
+        user_id = handle_stripe_event(stripe_event.payload, db)
+        stripe_event.status = StripeEventStatus.PROCESSED
+        stripe_event.error = None
+        stripe_event.processed_at = datetime.now(UTC)
+        db.add(stripe_event)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        stripe_event.attempts = attempts
+        stripe_event.status = StripeEventStatus.FAILED
+        stripe_event.error = str(e)
+        db.add(stripe_event)
+        db.commit()
+        logger.error(f"Failed to process Stripe event {stripe_event.id} ({stripe_event.type}): {str(e)}")
+        raise
+    if user_id is not None:
+        principal_service.invalidate(user_id)
+    logger.info(f"Processed Stripe event {stripe_event.id} ({stripe_event.type})")
+
+def process_customer_events(customer_key: str) -> int:
+    with Session(engine) as db:
+        return process_pending_events(db, customer_key)
+
+async def process_stripe_events_task(message: Dict[str, Any], db: Session) -> None:
+    """TASK_HANDLERS entry. Runs in a thread since it may wait on another worker's advisory lock."""
+    await asyncio.to_thread(process_customer_events, message["customer_key"])
+
+def enqueue_processing(customer_key: str) -> None:
+    settings.sqs_client.send_message(
+        QueueUrl=settings.SQS_QUEUE_URL,
+        MessageBody=json.dumps({"task": PROCESS_STRIPE_EVENTS, "customer_key": customer_key})
+    )
+
+def replay_events(
+    db: Session,
+    event_ids: Optional[Iterable[str]] = None,
+    event_type: Optional[str] = None,
+    customer_key: Optional[str] = None,
+    since: Optional[datetime] = None,
+    statuses: Iterable[str] = (StripeEventStatus.RECEIVED, StripeEventStatus.FAILED)
+) -> Dict[str, int]:
+    """
+    Re-run stored events matching the filters, per customer and in creation order. Events
+    that have already been processed are included only if "processed" is among `statuses`.
+    """
+    statement = select(StripeEvent).where(StripeEvent.status.in_(list(statuses)))
+    if event_ids:
+        statement = statement.where(StripeEvent.id.in_(list(event_ids)))
+    if event_type:
+        statement = statement.where(StripeEvent.type == event_type)
+    if customer_key:
+        statement = statement.where(StripeEvent.customer_key == customer_key)
+    if since:
+        statement = statement.where(StripeEvent.created >= since)
+    events = db.exec(statement.order_by(StripeEvent.customer_key, StripeEvent.created, StripeEvent.received_at)).all()
+
+    # Reset the selection to pending, then drain each customer through the normal ordered path
+    for stripe_event in events:
+        stripe_event.status = StripeEventStatus.RECEIVED
+        db.add(stripe_event)
+    db.commit()
+
+    counts = {"selected": len(events), "processed": 0, "failed_customers": 0}
+    for key in dict.fromkeys(stripe_event.customer_key for stripe_event in events):
+        try:
+            counts["processed"] += process_pending_events(db, key)
+        except Exception:
+            counts["failed_customers"] += 1
+    return counts
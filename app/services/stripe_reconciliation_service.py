@@ -0,0 +1,162 @@
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Union
+from sqlalchemy import DateTime, Integer, String, column, or_, update, values
+from sqlmodel import Session, select
+from ..models.user import User
+from . import principal_service
+from .stripe_service import get_stripe
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_BATCH_SIZE = 500
+
+class StripeSubscriptionSource:
+    """Pages through every subscription in the Stripe account, any status."""
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE):
+        self.page_size = page_size
+
+    def pages(self) -> Iterator[List[Dict[str, Any]]]:
+        stripe = get_stripe()
+        starting_after = None
+        while True:
+            params = {"limit": self.page_size, "status": "all"}
+            if starting_after:
+                params["starting_after"] = starting_after
+            page = stripe.Subscription.list(**params)
+            subscriptions = [subscription.to_dict() for subscription in page.data]
+            if subscriptions:
+                yield subscriptions
+            if not page.has_more or not subscriptions:
+                return
+            starting_after = subscriptions[-1]["id"]
+
+class FixtureSubscriptionSource:
+    """Stripe-shaped subscriptions from a list or a JSON file, for tests and dry runs."""
+    def __init__(self, subscriptions: Union[List[Dict[str, Any]], str, Path], page_size: int = DEFAULT_PAGE_SIZE):
+        if isinstance(subscriptions, (str, Path)):
+            subscriptions = json.loads(Path(subscriptions).read_text())
+        self.subscriptions = subscriptions
+        self.page_size = page_size
+
+    def pages(self) -> Iterator[List[Dict[str, Any]]]:
+        for offset in range(0, len(self.subscriptions), self.page_size):
+            yield self.subscriptions[offset:offset + self.page_size]
+
+def subscription_row(subscription: Dict[str, Any], user_id: int) -> Dict[str, Any]:
+    """The users columns a subscription implies, matching the webhook handlers."""
+    if subscription["status"] == "canceled":
+        # Same end state as handle_subscription_deleted
+        return {
+            "user_id": user_id,
+            "subscription_id": None,
+            "product_id": None,
+            "price_id": None,
+            "status": "canceled",
+            "end_date": datetime.fromtimestamp(subscription.get("canceled_at") or subscription["current_period_end"]),
+        }
+    price = subscription["items"]["data"][0]["price"]
+    return {
+        "user_id": user_id,
+        "subscription_id": subscription["id"],
+        "product_id": price["product"],
+        "price_id": price["id"],
+        "status": subscription["status"],
+        "end_date": datetime.fromtimestamp(subscription["current_period_end"]),
+    }
+
+def resolve_users(db: Session, subscriptions: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Map subscription id -> user id with a single IN (...) query over both Stripe id columns.
+    A user already linked to the subscription wins over one matched by customer id.
+    """
+    subscription_ids = [subscription["id"] for subscription in subscriptions]
+    customer_ids = [subscription["customer"] for subscription in subscriptions if subscription.get("customer")]
+    rows = db.exec(
+        select(User.id, User.stripe_customer_id, User.stripe_subscription_id).where(
+            or_(
+                User.stripe_subscription_id.in_(subscription_ids),
+                User.stripe_customer_id.in_(customer_ids)
+            )
+        )
+    ).all()
+    by_subscription = {row.stripe_subscription_id: row.id for row in rows if row.stripe_subscription_id}
+    by_customer = {row.stripe_customer_id: row.id for row in rows if row.stripe_customer_id}
+
+    resolved = {}
+    for subscription in subscriptions:
+        user_id = by_subscription.get(subscription["id"]) or by_customer.get(subscription.get("customer"))
+        if user_id is not None:
+            resolved[subscription["id"]] = user_id
+    return resolved
+
+def apply_updates(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """One UPDATE users ... FROM (VALUES ...) for the whole batch, and one commit."""
+    if not rows:
+        return 0
+    batch = values(
+        column("user_id", Integer),
+        column("subscription_id", String),
+        column("product_id", String),
+        column("price_id", String),
+        column("status", String),
+        column("end_date", DateTime),
+        name="reconciled",
+    ).data([
+        (row["user_id"], row["subscription_id"], row["product_id"], row["price_id"], row["status"], row["end_date"])
+        for row in rows
+    ])
+    statement = (
+        update(User)
+        .where(User.id == batch.c.user_id)
+        .values(
+            stripe_subscription_id=batch.c.subscription_id,
+            stripe_product_id=batch.c.product_id,
+            stripe_price_id=batch.c.price_id,
+            subscription_status=batch.c.status,
+            subscription_end_date=batch.c.end_date,
+        )
+    )
+    updated = db.exec(statement).rowcount
+    db.commit()
+    for row in rows:
+        principal_service.invalidate(row["user_id"])
+    return updated
+
+def reconcile(db: Session, source, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """Bring users' subscription columns in line with `source`. Returns counts and rows/sec."""
+    counts = {"seen": 0, "matched": 0, "updated": 0, "unmatched": 0}
+    pending: Dict[int, Dict[str, Any]] = {}
+    # Status already chosen per user this run, so a later (older) subscription can't overwrite a live one
+    chosen: Dict[int, str] = {}
+    started = time.perf_counter()
+
+    def flush() -> None:
+        counts["updated"] += apply_updates(db, list(pending.values()))
+        pending.clear()
+
+    for page in source.pages():
+        counts["seen"] += len(page)
+        user_ids = resolve_users(db, page)
+        counts["matched"] += len(user_ids)
+        counts["unmatched"] += len(page) - len(user_ids)
+        for subscription in page:
+            user_id = user_ids.get(subscription["id"])
+            if user_id is None:
+                continue
+            # Stripe lists newest first: keep the first subscription seen unless it was canceled and a live one follows
+            if user_id not in chosen or (chosen[user_id] == "canceled" and subscription["status"] != "canceled"):
+                chosen[user_id] = subscription["status"]
+                pending[user_id] = subscription_row(subscription, user_id)
+        if len(pending) >= batch_size:
+            flush()
+    flush()
+
+    counts["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    counts["rows_per_second"] = round(counts["seen"] / counts["elapsed_seconds"], 1) if counts["elapsed_seconds"] else 0.0
+    return counts
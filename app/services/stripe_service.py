@@ -1,57 +1,67 @@
-import app.services.stripe_service as stripe_service
 from sqlalchemy.orm import Session
 from app import models
 from datetime import datetime
+from typing import Optional
+from functools import lru_cache
 from dotenv import load_dotenv
 import os
 
 # Load environment variables
 load_dotenv()
 
-# Configure Stripe with your secret key
-stripe_service.api_key = os.getenv("STRIPE_SECRET_KEY")
-stripe_service.webhook_secret = os.getenv("STRIPE_WEBHOOK_SECRET")
+@lru_cache(maxsize=1)
+def get_stripe():
+    """Import and configure the Stripe SDK on first use to keep it off the cold-start path."""
+    import stripe
+    # Configure Stripe with your secret key
+    stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
+    return stripe
 
 def construct_event(payload, sig_header):
     """
     Construct a Stripe event from the webhook payload and signature.
     """
+    stripe = get_stripe()
     try:
-        event = stripe_service.Webhook.construct_event(
-            payload, sig_header, stripe_service.webhook_secret
+        event = stripe.Webhook.construct_event(
+            payload, sig_header, os.getenv("STRIPE_WEBHOOK_SECRET")
         )
         return event
     except ValueError as e:
         # Invalid payload
         raise ValueError("Invalid payload")
-    except stripe_service.error.SignatureVerificationError as e:
+    except stripe.error.SignatureVerificationError as e:
         # Invalid signature
         raise ValueError("Invalid signature")
 
-def handle_stripe_event(event, db: Session):
+def handle_stripe_event(event, db: Session) -> Optional[int]:
     """
-    Handle different types of Stripe events.
+    Handle different types of Stripe events. Changes are flushed but not committed, so the
+    caller can commit them together with its own bookkeeping; returns the id of the user
+    whose cached principal must be invalidated once it has.
     """
     event_type = event['type']
     
     if event_type == 'customer.created':
-        handle_customer_created(event['data']['object'], db)
+        return handle_customer_created(event['data']['object'], db)
     elif event_type == 'customer.subscription.created':
-        handle_subscription_created(event['data']['object'], db)
+        return handle_subscription_created(event['data']['object'], db)
     elif event_type == 'customer.subscription.updated':
-        handle_subscription_updated(event['data']['object'], db)
+        return handle_subscription_updated(event['data']['object'], db)
     elif event_type == 'customer.subscription.deleted':
-        handle_subscription_deleted(event['data']['object'], db)
+        return handle_subscription_deleted(event['data']['object'], db)
+    return None
         
-def handle_checkout_completed(checkout_session, db: Session):
+def handle_checkout_completed(checkout_session, db: Session) -> Optional[int]:
     if checkout_session['mode'] == 'payment':
         # This is a one-off payment
-        handle_one_off_payment(checkout_session, db)
+        return handle_one_off_payment(checkout_session, db)
     elif checkout_session['mode'] == 'subscription':
         # This is a subscription
-        handle_subscription_payment(checkout_session, db)
+        return handle_subscription_payment(checkout_session, db)
+    return None
 
-def handle_customer_created(customer, db: Session):
+def handle_customer_created(customer, db: Session) -> Optional[int]:
     # Check if the user already exists in our database
     user = db.query(models.User).filter(models.User.email == customer['email']).first()
     
@@ -66,15 +76,16 @@ def handle_customer_created(customer, db: Session):
         )
         db.add(user)
     
-    db.commit()
+    db.flush()
+    return user.id
     
-def handle_one_off_payment(payment_data, db: Session):
+def handle_one_off_payment(payment_data, db: Session) -> Optional[int]:
     """
     Handle one-off payments and update user's lifetime access status and total paid amount.
     """
     customer_id = payment_data.get('customer')
     if not customer_id:
-        return  # No customer associated with this payment
+        return None  # No customer associated with this payment
 
     # Get the amount paid in cents
     amount_paid = payment_data.get('amount_total', 0)  # For Checkout Session
@@ -88,16 +99,17 @@ def handle_one_off_payment(payment_data, db: Session):
     if user:
         user.lifetime_access = True
         user.total_paid = (user.total_paid or 0) + amount_paid_dollars
-        db.commit()
+        db.flush()
         print(f"Updated lifetime access and total paid for user: {user.email}. New total: ${user.total_paid:.2f}")
-    else:
-        print(f"User not found for Stripe customer ID: {customer_id}")
+        return user.id
+    print(f"User not found for Stripe customer ID: {customer_id}")
+    return None
         
-def handle_subscription_payment(payment_data, db: Session):
+def handle_subscription_payment(payment_data, db: Session) -> Optional[int]:
     # Existing subscription payment logic
-    pass
+    return None
 
-def handle_subscription_created(subscription, db: Session):
+def handle_subscription_created(subscription, db: Session) -> Optional[int]:
     user = db.query(models.User).filter(models.User.stripe_customer_id == subscription['customer']).first()
     
     if user:
@@ -106,9 +118,11 @@ def handle_subscription_created(subscription, db: Session):
         user.stripe_price_id = subscription['items']['data'][0]['price']['id']
         user.subscription_status = subscription['status']
         user.subscription_end_date = datetime.fromtimestamp(subscription['current_period_end'])
-        db.commit()
+        db.flush()
+        return user.id
+    return None
 
-def handle_subscription_updated(subscription, db: Session):
+def handle_subscription_updated(subscription, db: Session) -> Optional[int]:
     user = db.query(models.User).filter(models.User.stripe_subscription_id == subscription['id']).first()
     
     if user:
@@ -116,9 +130,11 @@ def handle_subscription_updated(subscription, db: Session):
         user.stripe_price_id = subscription['items']['data'][0]['price']['id']
         user.subscription_status = subscription['status']
         user.subscription_end_date = datetime.fromtimestamp(subscription['current_period_end'])
-        db.commit()
+        db.flush()
+        return user.id
+    return None
 
-def handle_subscription_deleted(subscription, db: Session):
+def handle_subscription_deleted(subscription, db: Session) -> Optional[int]:
     user = db.query(models.User).filter(models.User.stripe_subscription_id == subscription['id']).first()
     
     if user:
@@ -127,6 +143,8 @@ def handle_subscription_deleted(subscription, db: Session):
         user.stripe_price_id = None
         user.subscription_status = 'canceled'
         user.subscription_end_date = datetime.fromtimestamp(subscription['canceled_at'])
-        db.commit()
+        db.flush()
+        return user.id
+    return None
 
 # Add more helper functions as needed
@@ -0,0 +1,103 @@
+import logging
+import math
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Brief fields that go into section prompts; their counts are cached on the brief when it is saved
+BRIEF_PROMPT_FIELDS = ["writing_sample", "product_info", "author_instructions", "negative_words"]
+
+def estimate_tokens(text: str) -> int:
+    # Fallback when no tokenizer is available: roughly four characters per token for English text
+    return math.ceil(len(text) / 4) if text else 0
+
+@lru_cache(maxsize=1)
+def get_tokenizer():
+    """
+    The `tokenizers` tokenizer used for budgeting, loaded once per process from TOKENIZER_FILE,
+    or from the Hugging Face hub if TOKENIZER_DOWNLOAD allows it. None (and character
+    estimates) if it can't be loaded.
+    """
+    try:
+        from tokenizers import Tokenizer
+        if settings.TOKENIZER_FILE and os.path.exists(settings.TOKENIZER_FILE):
+            return Tokenizer.from_file(settings.TOKENIZER_FILE)
+        if not settings.TOKENIZER_DOWNLOAD:
+            logger.warning(f"No tokenizer file at {settings.TOKENIZER_FILE}, estimating token counts")
+            return None
+        return Tokenizer.from_pretrained(settings.TOKENIZER_NAME)
+    except Exception as e:
+        logger.warning(f"Tokenizer not loaded, estimating token counts: {str(e)}")
+        return None
+
+def tokenizer_name() -> str:
+    return (settings.TOKENIZER_FILE or settings.TOKENIZER_NAME) if get_tokenizer() is not None else "estimate"
+
+def count_tokens(text: Optional[str]) -> int:
+    if not text:
+        return 0
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+def count_tokens_batch(texts: List[str]) -> List[int]:
+    """Counts for many texts in one call; the Rust tokenizer encodes a batch in parallel."""
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return [estimate_tokens(text) for text in texts]
+    return [len(encoding.ids) for encoding in tokenizer.encode_batch(texts, add_special_tokens=False)]
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " [...]") -> str:
+    """Cut `text` to at most `max_tokens`, preferring a paragraph, sentence or word boundary."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    # Leave room for the marker
+    limit = max(max_tokens - count_tokens(marker), 1)
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        end = limit * 4
+    else:
+        end = tokenizer.encode(text, add_special_tokens=False).offsets[limit - 1][1]
+
+    cut = text[:end]
+    # Back off to a natural boundary if one is reasonably close to the cut
+    for boundary in ("\n\n", ". ", "\n", " "):
+        position = cut.rfind(boundary)
+        if position >= len(cut) * 0.8:
+            cut = cut[:position + (1 if boundary == ". " else 0)]
+            break
+    return cut.rstrip() + marker
+
+def brief_token_counts(content_brief) -> Dict[str, Any]:
+    """Token counts of a brief's prompt fields, stored on the brief at save time."""
+    texts = {field: getattr(content_brief, field, None) for field in BRIEF_PROMPT_FIELDS}
+    texts = {field: text for field, text in texts.items() if text}
+    counts = count_tokens_batch(list(texts.values()))
+    return {
+        "tokenizer": tokenizer_name(),
+        "fields": {
+            field: {"tokens": tokens, "chars": len(text)}
+            for (field, text), tokens in zip(texts.items(), counts)
+        }
+    }
+
+def cached_field_tokens(content_brief, field: str) -> int:
+    """
+    A brief field's token count from the counts saved with the brief, recounted if the
+    field has changed since (its length no longer matches) or the tokenizer differs.
+    """
+    text = getattr(content_brief, field, None)
+    if not text:
+        return 0
+    token_counts = getattr(content_brief, "token_counts", None) or {}
+    cached = token_counts.get("fields", {}).get(field)
+    if cached and cached["chars"] == len(text) and token_counts.get("tokenizer") == tokenizer_name():
+        return cached["tokens"]
+    return count_tokens(text)
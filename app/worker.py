@@ -0,0 +1,155 @@
+"""
+Standalone SQS worker for local development and long-running hosts:
+
+    python -m app.worker
+
+Long-polls the task queue, runs up to SQS_WORKER_CONCURRENCY handlers from TASK_HANDLERS at
+once, keeps slow messages invisible while they run, and acknowledges finished ones with
+delete_message_batch.
+"""
+import asyncio
+import logging
+import signal
+import sys
+import time
+from typing import Optional
+from .config import settings
+from .routers.events import process_record
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# SQS limits: 20s max long-poll wait, 10 messages per receive / delete batch
+MAX_WAIT_SECONDS = 20
+MAX_MESSAGES = 10
+DELETE_FLUSH_SECONDS = 1.0
+
+class SQSWorker:
+    def __init__(
+        self,
+        queue_url: Optional[str] = None,
+        client=None,
+        concurrency: int = settings.SQS_WORKER_CONCURRENCY,
+        wait_seconds: int = MAX_WAIT_SECONDS,
+        visibility_timeout: int = settings.SQS_WORKER_VISIBILITY_TIMEOUT
+    ):
+        self.queue_url = queue_url or settings.SQS_QUEUE_URL
+        self.client = client or settings.sqs_client
+        self.concurrency = concurrency
+        self.wait_seconds = wait_seconds
+        self.visibility_timeout = visibility_timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.stats = {"received": 0, "succeeded": 0, "failed": 0, "discarded": 0, "deleted": 0, "visibility_extensions": 0}
+        self._pending_deletes: list[str] = []
+        self._last_flush = time.monotonic()
+
+    async def receive(self, max_messages: int) -> list[dict]:
+        response = await asyncio.to_thread(
+            self.client.receive_message,
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=self.wait_seconds,
+            VisibilityTimeout=self.visibility_timeout,
+            AttributeNames=["ApproximateReceiveCount"]
+        )
+        messages = response.get("Messages", [])
+        self.stats["received"] += len(messages)
+        return messages
+
+    async def _keep_visible(self, receipt_handle: str) -> None:
+        """Push the message's visibility timeout out every half-timeout until cancelled."""
+        interval = max(self.visibility_timeout / 2, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(
+                    self.client.change_message_visibility,
+                    QueueUrl=self.queue_url,
+                    ReceiptHandle=receipt_handle,
+                    VisibilityTimeout=self.visibility_timeout
+                )
+                self.stats["visibility_extensions"] += 1
+            except Exception as e:
+                logger.error(f"Failed to extend visibility: {str(e)}")
+
+    async def handle(self, message: dict) -> None:
+        # Same shape as a Lambda SQS record so /events and the worker share process_record
+        record = {
+            "messageId": message["MessageId"],
+            "body": message["Body"],
+            "attributes": message.get("Attributes", {}),
+        }
+        heartbeat = asyncio.create_task(self._keep_visible(message["ReceiptHandle"]))
+        try:
+            metrics = await process_record(record, self.semaphore)
+        finally:
+            heartbeat.cancel()
+        self.stats[metrics["outcome"]] += 1
+        # Failed messages are left to reappear after the visibility timeout and be retried
+        if metrics["outcome"] != "failed":
+            self._pending_deletes.append(message["ReceiptHandle"])
+
+    async def flush_deletes(self, force: bool = False) -> None:
+        """Delete acknowledged messages in batches of 10, once a full batch is pending or a second has passed."""
+        if not self._pending_deletes:
+            return
+        if not force and len(self._pending_deletes) < MAX_MESSAGES and time.monotonic() - self._last_flush < DELETE_FLUSH_SECONDS:
+            return
+        while self._pending_deletes:
+            batch, self._pending_deletes = self._pending_deletes[:MAX_MESSAGES], self._pending_deletes[MAX_MESSAGES:]
+            response = await asyncio.to_thread(
+                self.client.delete_message_batch,
+                QueueUrl=self.queue_url,
+                Entries=[{"Id": str(i), "ReceiptHandle": handle} for i, handle in enumerate(batch)]
+            )
+            self.stats["deleted"] += len(response.get("Successful", []))
+            for failure in response.get("Failed", []):
+                logger.error(f"Failed to delete message: {failure.get('Message')}")
+        self._last_flush = time.monotonic()
+
+    async def run_once(self) -> dict:
+        """Receive a single batch, process it and acknowledge it."""
+        messages = await self.receive(min(MAX_MESSAGES, self.concurrency))
+        await asyncio.gather(*(self.handle(message) for message in messages))
+        await self.flush_deletes(force=True)
+        return self.stats
+
+    async def run(self, stop: Optional[asyncio.Event] = None, max_messages: Optional[int] = None) -> dict:
+        """
+        Poll until `stop` is set (or `max_messages` have been received), keeping up to
+        `concurrency` handlers in flight. Receives are sized to the free slots.
+        """
+        stop = stop or asyncio.Event()
+        in_flight: set[asyncio.Task] = set()
+        logger.info(f"Worker polling {self.queue_url} with concurrency {self.concurrency}")
+
+        while not stop.is_set() and (max_messages is None or self.stats["received"] < max_messages):
+            free = self.concurrency - len(in_flight)
+            if free <= 0:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                for message in await self.receive(min(MAX_MESSAGES, free)):
+                    in_flight.add(asyncio.create_task(self.handle(message)))
+                in_flight = {task for task in in_flight if not task.done()}
+            await self.flush_deletes()
+
+        if in_flight:
+            await asyncio.wait(in_flight)
+        await self.flush_deletes(force=True)
+        logger.info(f"Worker stopped: {self.stats}")
+        return self.stats
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await SQSWorker().run(stop)
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stdout
+    )
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""
+Fire concurrent requests at a running API to compare the sync and async database paths.
+
+Start the API twice, once with USE_ASYNC_DB=False and once with USE_ASYNC_DB=True, and run:
+
+    python -m benchmarks.db_concurrency --url http://localhost:8020/contents/ --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+async def run(url: str, total: int, concurrency: int, token: str | None) -> None:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async with httpx.AsyncClient(timeout=60.0, headers=headers) as client:
+        async def one() -> None:
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"requests={total} concurrency={concurrency} errors={errors}")
+    print(f"throughput={total / elapsed:.1f} req/s")
+    print(f"p50={statistics.median(latencies):.1f}ms p95={latencies[int(len(latencies) * 0.95) - 1]:.1f}ms max={latencies[-1]:.1f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8020/contents/")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--token", default=None, help="Bearer token for authenticated endpoints")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.concurrency, args.token))
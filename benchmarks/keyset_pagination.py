@@ -0,0 +1,93 @@
+"""
+Compare keyset and OFFSET pagination over a user's contents.
+
+Seeds up to --rows contents for one user (reusing any already there), then times fetching
+pages at increasing depth with both strategies, directly against DATABASE_URL:
+
+    python -m benchmarks.keyset_pagination --rows 100000 --user-id 1
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import func, insert
+from sqlmodel import Session, select
+from app.database import engine
+from app.models.content import Content
+from app.services import content_service
+from app.services.content_service import LIST_FIELDS
+
+def seed(db: Session, user_id: int, rows: int, batch_size: int = 5000) -> None:
+    existing = db.exec(select(func.count()).select_from(Content).where(Content.user_id == user_id)).one()
+    missing = rows - existing
+    if missing <= 0:
+        return
+    started = datetime.now(UTC)
+    for offset in range(0, missing, batch_size):
+        batch = [
+            {
+                "user_id": user_id,
+                "title": f"Benchmark content {existing + i}",
+                "type": "blog_post",
+                "description": "Seeded by benchmarks.keyset_pagination",
+                "text": "lorem ipsum " * 200,
+                "custom_data": {},
+                "created_at": started - timedelta(seconds=existing + i),
+                "updated_at": started,
+            }
+            for i in range(offset, min(offset + batch_size, missing))
+        ]
+        db.execute(insert(Content), batch)
+        db.commit()
+    print(f"seeded {missing} contents for user {user_id}")
+
+def time_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+def offset_page(db: Session, user_id: int, limit: int, offset: int) -> list:
+    columns = [getattr(Content, field) for field in LIST_FIELDS]
+    statement = (
+        select(*columns)
+        .where(Content.user_id == user_id)
+        .order_by(Content.created_at.desc(), Content.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    return db.exec(statement).all()
+
+def run(rows: int, user_id: int, limit: int, repeats: int) -> None:
+    with Session(engine) as db:
+        seed(db, user_id, rows)
+
+        # Walk the keyset pages once, remembering the cursor at each depth we want to sample
+        depths = [0, 10, 100, 1000, (rows // limit) - 1]
+        cursors = {0: None}
+        cursor = None
+        for page_number in range(1, max(depths) + 1):
+            cursor = content_service.list_for_user(db, user_id, limit=limit, cursor=cursor)["next_cursor"]
+            if cursor is None:
+                break
+            if page_number in depths:
+                cursors[page_number] = cursor
+
+        print(f"rows={rows} page_size={limit} repeats={repeats}")
+        for depth in depths:
+            if depth not in cursors:
+                continue
+            keyset = [time_ms(lambda: content_service.list_for_user(db, user_id, limit=limit, cursor=cursors[depth])) for _ in range(repeats)]
+            offset = [time_ms(lambda: offset_page(db, user_id, limit, depth * limit)) for _ in range(repeats)]
+            print(
+                f"page {depth:>6}: keyset p50={statistics.median(keyset):7.2f}ms  "
+                f"offset p50={statistics.median(offset):7.2f}ms"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.user_id, args.limit, args.repeats)
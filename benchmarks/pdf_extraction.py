@@ -0,0 +1,73 @@
+"""
+Pages/sec of PDF text extraction on a process pool at different worker counts.
+
+Uses the PDFs in --dir, or generates --synthetic text PDFs of --pages pages each:
+
+    python -m benchmarks.pdf_extraction --synthetic 40 --pages 50 --workers 1 2 4 8
+    python -m benchmarks.pdf_extraction --dir app/uploads/pdfs/sha256 --workers 1 2 4
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from app.services.pdf_text import extract_pages
+
+def make_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """A minimal valid PDF with a Helvetica text layer on every page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(pages):
+        lines = b"".join(
+            b"(Page %d line %d: the quick brown fox jumps over the lazy dog.) Tj 0 -14 Td " % (page + 1, line)
+            for line in range(lines_per_page)
+        )
+        stream = b"BT /F1 11 Tf 50 780 Td " + lines + b"ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    body = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    body += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(body)
+
+def run(paths: list[str], workers: int) -> None:
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pages = sum(len(result) for result in executor.map(extract_pages, paths))
+    elapsed = time.perf_counter() - started
+    print(f"workers={workers:<3} pdfs={len(paths)} pages={pages} elapsed={elapsed:6.2f}s pages/sec={pages / elapsed:8.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", help="Directory of PDFs to extract (searched recursively)")
+    parser.add_argument("--synthetic", type=int, default=40, help="Number of generated PDFs when --dir is not given")
+    parser.add_argument("--pages", type=int, default=50, help="Pages per generated PDF")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dir:
+            paths = [str(path) for path in Path(args.dir).rglob("*.pdf")]
+        else:
+            pdf = make_pdf(args.pages)
+            paths = []
+            for i in range(args.synthetic):
+                path = Path(tmp) / f"synthetic_{i}.pdf"
+                path.write_bytes(pdf)
+                paths.append(str(path))
+        for workers in args.workers:
+            run(paths, workers)
@@ -0,0 +1,69 @@
+"""
+Serialization throughput for a content brief with large writing_sample/product_info fields.
+
+Compares the old response path (ContentBrief table model as response_model, rendered by
+JSONResponse) with the new one (ContentBriefRead rendered by ORJSONResponse). No database needed:
+
+    python -m benchmarks.serialization --sample-kb 64 --iterations 2000
+"""
+import argparse
+import time
+from datetime import datetime, UTC
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from app.models.content_brief import ContentBrief
+from app.schemas.content_brief import ContentBriefRead
+
+def make_brief(sample_kb: int) -> ContentBrief:
+    paragraph = "The quick brown fox jumps over the lazy dog. " * 20 + "\n\n"
+    body = (paragraph * (sample_kb * 1024 // len(paragraph) + 1))[:sample_kb * 1024]
+    return ContentBrief(
+        id=1,
+        user_id=1,
+        title="Benchmark brief",
+        description="A brief with large free-text fields",
+        primary_keyword="serialization",
+        secondary_keywords="orjson, pydantic, fastapi",
+        author_instructions="Keep it short.",
+        writing_sample=body,
+        product_info=body,
+        call_to_action="Sign up today",
+        custom_data={"tone": "friendly", "audience": ["developers", "founders"]},
+        created_at=datetime.now(UTC),
+        updated_at=datetime.now(UTC),
+    )
+
+def measure(label: str, render, iterations: int, payload_bytes: int) -> None:
+    render()  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<28} {iterations / elapsed:10.0f} responses/s  "
+        f"{payload_bytes * iterations / elapsed / 1024 / 1024:8.1f} MB/s"
+    )
+
+def run(sample_kb: int, iterations: int) -> None:
+    brief = make_brief(sample_kb)
+    table_adapter = TypeAdapter(ContentBrief)
+    read_adapter = TypeAdapter(ContentBriefRead)
+
+    # Mirrors FastAPI's serialize_response: validate against response_model, dump to JSON types, render
+    def before() -> bytes:
+        return JSONResponse(table_adapter.dump_python(table_adapter.validate_python(brief), mode="json")).body
+
+    def after() -> bytes:
+        return ORJSONResponse(read_adapter.dump_python(read_adapter.validate_python(brief, from_attributes=True), mode="json")).body
+
+    payload_bytes = len(after())
+    print(f"brief payload={payload_bytes / 1024:.0f}KB iterations={iterations}")
+    measure("table model + JSONResponse", before, iterations, payload_bytes)
+    measure("read schema + ORJSONResponse", after, iterations, payload_bytes)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sample-kb", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.sample_kb, args.iterations)
@@ -0,0 +1,71 @@
+"""
+Throughput of the long-polling SQS worker against LocalStack.
+
+Enqueues --messages messages for a benchmark task that sleeps --task-ms, then drains them
+with SQSWorker. --legacy drains them the way /events/local-process used to: one receive with
+a 1s wait, handlers run one at a time, and one delete_message call per message.
+
+    python -m benchmarks.sqs_worker --messages 500 --task-ms 50 --concurrency 10
+    python -m benchmarks.sqs_worker --messages 500 --task-ms 50 --legacy
+"""
+import argparse
+import asyncio
+import json
+import time
+from app.config import settings
+from app.routers import events
+from app.worker import SQSWorker
+
+TASK = "benchmark_sleep"
+
+def enqueue(client, queue_url: str, count: int) -> None:
+    for offset in range(0, count, 10):
+        client.send_message_batch(
+            QueueUrl=queue_url,
+            Entries=[
+                {"Id": str(i), "MessageBody": json.dumps({"task": TASK, "n": offset + i})}
+                for i in range(min(10, count - offset))
+            ]
+        )
+
+async def drain_legacy(client, queue_url: str, count: int) -> None:
+    processed = 0
+    while processed < count:
+        response = client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10, WaitTimeSeconds=1)
+        for message in response.get("Messages", []):
+            body = json.loads(message["Body"])
+            await events.TASK_HANDLERS[body["task"]](body, None)
+            client.delete_message(QueueUrl=queue_url, ReceiptHandle=message["ReceiptHandle"])
+            processed += 1
+
+def run(messages: int, task_ms: int, concurrency: int, legacy: bool) -> None:
+    async def sleep_task(message, db):
+        await asyncio.sleep(task_ms / 1000)
+    events.TASK_HANDLERS[TASK] = sleep_task
+
+    client = settings.sqs_client
+    queue_url = client.create_queue(QueueName=settings.SQS_QUEUE_NAME)["QueueUrl"]
+    client.purge_queue(QueueUrl=queue_url)
+    enqueue(client, queue_url, messages)
+
+    started = time.perf_counter()
+    if legacy:
+        asyncio.run(drain_legacy(client, queue_url, messages))
+        stats = {"received": messages}
+    else:
+        worker = SQSWorker(queue_url=queue_url, client=client, concurrency=concurrency)
+        stats = asyncio.run(worker.run(max_messages=messages))
+    elapsed = time.perf_counter() - started
+
+    print(f"mode={'legacy' if legacy else 'worker'} messages={messages} task_ms={task_ms} concurrency={1 if legacy else concurrency}")
+    print(f"elapsed={elapsed:.2f}s throughput={messages / elapsed:.1f} msg/s")
+    print(f"stats={stats}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--task-ms", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=settings.SQS_WORKER_CONCURRENCY)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+    run(args.messages, args.task_ms, args.concurrency, args.legacy)
@@ -0,0 +1,47 @@
+"""
+Exact (FlatIndex) vs approximate (IVFIndex) chunk search: build time, queries/sec and
+recall@k against the exact results, on random unit vectors.
+
+    python -m benchmarks.vector_search --chunks 20000 100000 --dim 512
+"""
+import argparse
+import time
+import numpy as np
+from app.services.embedding_service import FlatIndex, IVFIndex, normalize
+
+def run(chunks: int, dim: int, queries: int, k: int, nprobe: int) -> None:
+    rng = np.random.default_rng(0)
+    # Clustered data, closer to real embeddings than uniform noise
+    centers = normalize(rng.standard_normal((64, dim)))
+    vectors = normalize(centers[rng.integers(0, 64, chunks)] + 0.8 * rng.standard_normal((chunks, dim)) / np.sqrt(dim))
+    ids = np.arange(chunks, dtype=np.int64)
+    query_vectors = normalize(vectors[rng.integers(0, chunks, queries)] + 0.1 * rng.standard_normal((queries, dim)) / np.sqrt(dim))
+
+    flat = FlatIndex(ids, vectors)
+    started = time.perf_counter()
+    exact = [set(flat.search(query, k)[0].tolist()) for query in query_vectors]
+    flat_qps = queries / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    ivf = IVFIndex(ids, vectors, nprobe=nprobe)
+    build = time.perf_counter() - started
+    started = time.perf_counter()
+    approximate = [set(ivf.search(query, k)[0].tolist()) for query in query_vectors]
+    ivf_qps = queries / (time.perf_counter() - started)
+    recall = np.mean([len(a & e) / k for a, e in zip(approximate, exact)])
+
+    print(
+        f"chunks={chunks:<7} memory={vectors.nbytes / 2**20:6.1f}MB flat_qps={flat_qps:8.1f} "
+        f"ivf_build={build:5.2f}s ivf_qps={ivf_qps:8.1f} recall@{k}={recall:.3f}"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, nargs="+", default=[20000, 100000])
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=8)
+    args = parser.parse_args()
+    for chunks in args.chunks:
+        run(chunks, args.dim, args.queries, args.k, args.nprobe)
@@ -23,9 +23,18 @@ export class ApiStack extends cdk.Stack {
             removalPolicy: cdk.RemovalPolicy.RETAIN,
         });
 
-        // Create SQS queue
+        // Create SQS queue. Messages that keep failing move to the dead-letter queue instead of
+        // being retried (and their LLM calls repeated) until retention expires
+        const deadLetterQueue = new sqs.Queue(this, 'TaskDeadLetterQueue', {
+            queueName: 'essay-checker-task-dlq',
+            retentionPeriod: cdk.Duration.days(14),
+        });
         const queue = new sqs.Queue(this, 'TaskQueue', {
             queueName: 'essay-checker-task-queue',
+            deadLetterQueue: {
+                queue: deadLetterQueue,
+                maxReceiveCount: 3,
+            },
         });
 
         // Create Docker image asset
@@ -41,6 +50,33 @@ export class ApiStack extends cdk.Stack {
             ],
         });
 
+        // Origin of the web app; the only one allowed to call the stream Function URL
+        const frontendUrl = process.env.FRONTEND_URL ?? 'http://localhost:3007';
+
+        const environment = {
+            LAMBDA_AWS_REGION: this.region,
+            S3_AWS_STATIC_BUCKET_NAME: staticBucket.bucketName,
+            S3_AWS_STORAGE_BUCKET_NAME: storageBucket.bucketName,
+            SQS_AWS_QUEUE_URL: queue.queueUrl,
+            USE_LOCALSTACK: 'False',
+            AWS_LAMBDA_EXEC_WRAPPER: '/opt/extensions/lambda-adapter',
+            PORT: '8080',
+            FRONTEND_URL: frontendUrl,
+            // Build the LLM SDK clients on first use, not in the lifespan of every cold start
+            PRELOAD_LLM_CLIENTS: 'False',
+            // The image runs `alembic upgrade head` before uvicorn; don't create_all on top of it
+            STARTUP_SCHEMA_MODE: 'alembic',
+        };
+        const logPolicy = new cdk.aws_iam.PolicyStatement({
+            effect: cdk.aws_iam.Effect.ALLOW,
+            actions: [
+                'logs:CreateLogGroup',
+                'logs:CreateLogStream',
+                'logs:PutLogEvents'
+            ],
+            resources: ['*']
+        });
+
         // Create Lambda function
         const handler = new lambda.DockerImageFunction(this, 'ApiHandler', {
             code: lambda.DockerImageCode.fromEcr(dockerImage.repository, {
@@ -48,27 +84,40 @@ export class ApiStack extends cdk.Stack {
             }),
             memorySize: 1024,
             timeout: cdk.Duration.seconds(30),
+            environment,
+            logRetention: cdk.aws_logs.RetentionDays.ONE_WEEK,
+            initialPolicy: [logPolicy]
+        });
+
+        // Same image behind a response-streaming Function URL, so SSE endpoints
+        // (e.g. /content-sections/stream) aren't buffered or cut off by API Gateway's 30s limit.
+        // The adapter can only stream when invoked with InvokeWithResponseStream, so this can't
+        // be the API Gateway handler
+        const streamHandler = new lambda.DockerImageFunction(this, 'StreamHandler', {
+            code: lambda.DockerImageCode.fromEcr(dockerImage.repository, {
+                tagOrDigest: dockerImage.imageTag,
+            }),
+            memorySize: 1024,
+            timeout: cdk.Duration.seconds(300),
             environment: {
-                LAMBDA_AWS_REGION: this.region,
-                S3_AWS_STATIC_BUCKET_NAME: staticBucket.bucketName,
-                S3_AWS_STORAGE_BUCKET_NAME: storageBucket.bucketName,
-                SQS_AWS_QUEUE_URL: queue.queueUrl,
-                USE_LOCALSTACK: 'False',
-                AWS_LAMBDA_EXEC_WRAPPER: '/opt/extensions/lambda-adapter',
-                PORT: '8080',
+                ...environment,
+                AWS_LWA_INVOKE_MODE: 'response_stream',
             },
             logRetention: cdk.aws_logs.RetentionDays.ONE_WEEK,
-            initialPolicy: [
-                new cdk.aws_iam.PolicyStatement({
-                    effect: cdk.aws_iam.Effect.ALLOW,
-                    actions: [
-                        'logs:CreateLogGroup',
-                        'logs:CreateLogStream',
-                        'logs:PutLogEvents'
-                    ],
-                    resources: ['*']
-                })
-            ]
+            initialPolicy: [logPolicy]
+        });
+        // Called straight from the browser, which can't SigV4-sign requests, so no IAM auth:
+        // the endpoint requires the app's bearer token and CORS limits it to the frontend
+        const streamUrl = streamHandler.addFunctionUrl({
+            authType: lambda.FunctionUrlAuthType.NONE,
+            invokeMode: lambda.InvokeMode.RESPONSE_STREAM,
+            cors: {
+                allowedOrigins: [frontendUrl],
+                allowedMethods: [lambda.HttpMethod.POST],
+                allowedHeaders: ['authorization', 'content-type'],
+                allowCredentials: true,
+                maxAge: cdk.Duration.seconds(600),
+            },
         });
 
         // After creating the Lambda but before creating the API Gateway
@@ -99,22 +148,28 @@ export class ApiStack extends cdk.Stack {
         });
 
         // Grant permissions
-        staticBucket.grantReadWrite(handler);
-        storageBucket.grantReadWrite(handler);
-        queue.grant(handler,
-            'sqs:ChangeMessageVisibility',
-            'sqs:DeleteMessage',
-            'sqs:GetQueueAttributes',
-            'sqs:GetQueueUrl',
-            'sqs:ReceiveMessage',
-            'sqs:SendMessage'
-        );
+        for (const fn of [handler, streamHandler]) {
+            staticBucket.grantReadWrite(fn);
+            storageBucket.grantReadWrite(fn);
+            queue.grant(fn,
+                'sqs:ChangeMessageVisibility',
+                'sqs:DeleteMessage',
+                'sqs:GetQueueAttributes',
+                'sqs:GetQueueUrl',
+                'sqs:ReceiveMessage',
+                'sqs:SendMessage'
+            );
+        }
 
         // Output the API URL
         new cdk.CfnOutput(this, 'ApiUrl', {
             value: api.apiEndpoint,
         });
 
+        new cdk.CfnOutput(this, 'StreamUrl', {
+            value: streamUrl.url,
+        });
+
         // Output other resource names/URLs
         new cdk.CfnOutput(this, 'StaticBucketName', {
             value: staticBucket.bucketName,
@@ -0,0 +1,65 @@
+import json
+import logging
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.access_log import AccessLogMiddleware, access_logger, redact_body, redact_headers, REDACTED
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(json.loads(record.getMessage()))
+
+@pytest.fixture
+def access_records():
+    handler = ListHandler()
+    access_logger.addHandler(handler)
+    access_logger.setLevel(logging.INFO)
+    yield handler.records
+    access_logger.removeHandler(handler)
+
+def make_app(**options) -> FastAPI:
+    test_app = FastAPI()
+
+    @test_app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        return {"size": len(body)}
+
+    test_app.add_middleware(AccessLogMiddleware, **options)
+    return test_app
+
+def test_redaction():
+    assert redact_body('{"email": "a@b.c", "password": "hunter2"}', {"password"}) == f'{{"email": "a@b.c", "password": "{REDACTED}"}}'
+    headers = redact_headers([(b"Authorization", b"Bearer x"), (b"Accept", b"*/*")], {"authorization"})
+    assert headers == {"authorization": REDACTED, "accept": "*/*"}
+
+def test_body_is_capped_and_sizes_recorded(access_records):
+    # Test only the first N bytes are captured while the app still sees the full body
+    client = TestClient(make_app(sample_rate=1.0, body_bytes=16, body_content_types="application/json", redact_fields="password"))
+    payload = json.dumps({"password": "x", "text": "a" * 500})
+    response = client.post("/echo", content=payload, headers={"Content-Type": "application/json"})
+
+    assert response.json() == {"size": len(payload)}
+    record = access_records[-1]
+    assert record["status"] == 200
+    assert record["request_bytes"] == len(payload)
+    assert record["response_bytes"] == len(response.content)
+    assert record["body_truncated"] is True
+    assert record["body"] == f'{{"password": "{REDACTED}"'
+    assert record["duration_ms"] >= 0
+
+def test_sampling_and_content_type_filter(access_records):
+    client = TestClient(make_app(sample_rate=0.0, body_content_types="application/json"))
+    client.post("/echo", content=b"%PDF-1.4", headers={"Content-Type": "application/pdf"})
+    assert access_records == []
+
+    client = TestClient(make_app(sample_rate=1.0, body_content_types="application/json"))
+    client.post("/echo", content=b"%PDF-1.4", headers={"Content-Type": "application/pdf"})
+    assert "body" not in access_records[-1]
@@ -0,0 +1,49 @@
+import pytest
+from app.clients.http import get_http_client, close_http_client
+from app.clients.anthropic import AsyncAnthropicClient, get_async_anthropic_client
+from app.clients.openai import AsyncOpenAIClient, get_async_openai_client
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared():
+    # Test the transport is created once per process and rebuilt after close
+    client = get_http_client()
+    assert get_http_client() is client
+
+    await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+    await close_http_client()
+
+@pytest.mark.asyncio
+async def test_async_llm_clients_share_transport(monkeypatch):
+    # Test both SDK clients are built on the same keep-alive transport
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OPEN_AI_API_KEY", "test-key")
+
+    anthropic_client = AsyncAnthropicClient()
+    openai_client = AsyncOpenAIClient()
+    shared = get_http_client()
+    assert anthropic_client.client._client is shared
+    assert openai_client.client._client is shared
+    await close_http_client()
+
+@pytest.mark.asyncio
+async def test_sdk_clients_are_rebuilt_after_close(monkeypatch):
+    # Test no SDK client keeps the closed transport once the lifespan has shut it down
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OPEN_AI_API_KEY", "test-key")
+
+    anthropic_client = get_async_anthropic_client()
+    openai_client = get_async_openai_client()
+    await close_http_client()
+
+    shared = get_http_client()
+    assert get_async_anthropic_client() is not anthropic_client
+    assert get_async_anthropic_client().client._client is shared
+    assert get_async_openai_client() is not openai_client
+    assert get_async_openai_client().client._client is shared
+    await close_http_client()
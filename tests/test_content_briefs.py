@@ -103,4 +103,37 @@ def test_get_or_create_content_id(test_db, test_user, test_content):
     # Verify new content was created
     new_content = test_db.exec(select(Content).where(Content.id == new_content_id)).first()
     assert new_content is not None
-    assert new_content.user_id == test_user.id
\ No newline at end of file
+    assert new_content.user_id == test_user.id
+
+@pytest.mark.asyncio
+async def test_create_content_brief_async(async_test_db, test_content_brief_data):
+    # Test creating a content brief through the async session
+    from app.services.content_brief_service import create_async, get_content_brief_by_id_async
+
+    content_brief = ContentBrief(**test_content_brief_data)
+    result = await create_async(async_test_db, content_brief)
+    assert result.id is not None
+    assert result.content_id is not None
+
+    brief = await get_content_brief_by_id_async(async_test_db, result.id)
+    assert brief.title == test_content_brief_data["title"]
+
+def test_content_brief_read_schema(test_content_brief):
+    # The read schema carries the columns only, never the relationships
+    from app.schemas.content_brief import ContentBriefRead
+    brief = ContentBriefRead.model_validate(test_content_brief).model_dump()
+    assert brief["id"] == test_content_brief.id
+    assert brief["custom_data"] == {"key": "value"}
+    assert not {"user", "outline", "content"} & set(brief)
+
+def test_read_schemas_accept_null_custom_data(test_content_brief):
+    # Rows written before custom_data had a default hold NULL in the column
+    from app.schemas.content_brief import ContentBriefRead
+    test_content_brief.custom_data = None
+    assert ContentBriefRead.model_validate(test_content_brief).custom_data is None
+
+def test_create_content_brief_endpoint_returns_read_schema(authorized_client, test_user):
+    response = authorized_client.post("/content-briefs/", json={"user_id": test_user.id, "title": "API brief"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["title"] == "API brief"
@@ -0,0 +1,75 @@
+import pytest
+from types import SimpleNamespace
+from app.models.content import Content
+from app.models.content_brief import ContentBrief
+from app.models.user import User
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def section_brief():
+    return ContentBrief(
+        user_id=1,
+        title="Test Brief Title",
+        writing_sample="A long writing sample.",
+        product_info="A product description.",
+        negative_words="cheap"
+    )
+
+def test_system_prompt_is_stable_across_sections(section_brief):
+    # Test the brief context sits in the shared prefix and not in the per-section prompt
+    from app.services.content_section_service import build_system_prompt, build_user_prompt
+
+    first = build_user_prompt(section_brief, "Section one", next_outline_section="Section two")
+    second = build_user_prompt(section_brief, "Section two", previous_outline_section="Section one")
+
+    assert "Writing Sample" not in first
+    assert "Outline section:\nSection one" in first
+    assert "Previous section's outline:\nSection one" in second
+    assert build_system_prompt(section_brief).endswith("Negative words:\ncheap")
+
+def test_usage_from_anthropic_counts_cache_reads():
+    from app.services.content_section_service import usage_from_anthropic
+
+    usage = usage_from_anthropic(SimpleNamespace(
+        input_tokens=100,
+        cache_read_input_tokens=1500,
+        cache_creation_input_tokens=0
+    ))
+    assert usage.input_tokens == 1600
+    assert usage.cached_input_tokens == 1500
+    assert usage.uncached_input_tokens == 100
+
+def test_usage_from_agent_reads_openai_cached_tokens():
+    from app.services.content_section_service import usage_from_agent, PromptCacheUsage
+
+    total = PromptCacheUsage()
+    total.add(usage_from_agent(SimpleNamespace(request_tokens=2000, details={"cached_tokens": 1024})))
+    total.add(usage_from_agent(SimpleNamespace(request_tokens=2100, details=None)))
+    assert total.as_dict() == {
+        "input_tokens": 4100,
+        "cached_input_tokens": 1024,
+        "uncached_input_tokens": 3076,
+        "cache_write_tokens": 0,
+        "calls": 2,
+    }
+
+def test_stream_requires_auth(client):
+    response = client.post("/content-sections/stream", json={"content_id": 1, "content_outline_section_id": 1})
+    assert response.status_code == 401
+
+def test_stream_rejects_other_users_content(authorized_client, test_db):
+    other = User(email="other@example.com")
+    test_db.add(other)
+    test_db.commit()
+    content = Content(user_id=other.id, title="Not yours")
+    test_db.add(content)
+    test_db.commit()
+
+    response = authorized_client.post(
+        "/content-sections/stream",
+        json={"content_id": content.id, "content_outline_section_id": 1}
+    )
+    assert response.status_code == 404
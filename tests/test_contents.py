@@ -46,3 +46,60 @@ def test_create_content(test_db, test_user):
     assert content is not None
     assert content.user_id == test_user.id
     assert content.type == "blog_post"
+
+
+@pytest.mark.asyncio
+async def test_get_content_async(async_test_db, test_content):
+    # Test getting an existing content through the async session
+    from app.services.content_service import get_async
+    content = await get_async(async_test_db, test_content.id)
+    assert content.id == test_content.id
+    assert content.user_id == test_content.user_id
+
+@pytest.mark.asyncio
+async def test_create_empty_content_async(async_test_db, test_user):
+    # Test creating an empty content object through the async session
+    from app.services.content_service import create_empty_content_async, get_async
+    content_id = await create_empty_content_async(async_test_db, test_user.id)
+    content = await get_async(async_test_db, content_id)
+    assert content.user_id == test_user.id
+    assert content.type == "blog_post"
+
+def test_list_for_user_keyset_pages(test_db, test_user):
+    # Walk every page and check rows come back newest-first without gaps or repeats
+    from app.services.content_service import list_for_user
+    for i in range(5):
+        test_db.add(Content(user_id=test_user.id, title=f"Content {i}", text="body"))
+    test_db.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = list_for_user(test_db, test_user.id, limit=2, cursor=cursor)
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert len({item["id"] for item in seen}) == 5
+    assert [(item["created_at"], item["id"]) for item in seen] == sorted(
+        [(item["created_at"], item["id"]) for item in seen], reverse=True
+    )
+    # Heavy columns are left out of list views by default
+    assert "text" not in seen[0]
+
+def test_list_for_user_fields(test_db, test_content):
+    from app.services.content_service import list_for_user
+    page = list_for_user(test_db, test_content.user_id, fields="title")
+    assert set(page["items"][0]) == {"id", "created_at", "title"}
+
+    with pytest.raises(HTTPException) as exc_info:
+        list_for_user(test_db, test_content.user_id, fields="title,not_a_column")
+    assert exc_info.value.status_code == 400
+
+def test_list_for_user_invalid_cursor(test_db, test_user):
+    from app.services.content_service import list_for_user
+    with pytest.raises(HTTPException) as exc_info:
+        list_for_user(test_db, test_user.id, cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor"
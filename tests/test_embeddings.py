@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from app.models.content import Content
+from app.models.content_section import ContentSection
+from app.models.embedding_chunk import EmbeddingChunk
+from app.models.upload import Upload
+from app.models.upload_page import UploadPage
+from app.models.embedding_chunk import EmbeddingChunkSource
+from app.services import embedding_service
+from app.services.token_service import count_tokens
+from app.services.embedding_service import FlatIndex, HashingEmbedder, IVFIndex, chunk_text, normalize
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def test_chunk_text_packs_paragraphs_within_budget():
+    text = "\n\n".join(f"Paragraph {i} " + "word " * 30 for i in range(10))
+    chunks = chunk_text(text, max_tokens=100, overlap_tokens=0)
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 100 for chunk in chunks)
+    # Every paragraph survives intact
+    assert sum(chunk.count("Paragraph") for chunk in chunks) == 10
+
+def test_chunk_text_splits_long_paragraph_with_overlap():
+    words = [f"w{i}" for i in range(400)]
+    chunks = chunk_text(" ".join(words), max_tokens=100, overlap_tokens=20)
+    assert len(chunks) > 1
+    assert chunks[0].split()[-1] in chunks[1].split()
+    assert chunks[-1].split()[-1] == "w399"
+
+def test_hashing_embedder_is_deterministic_and_topical():
+    embedder = HashingEmbedder()
+    vectors = embedder.embed([
+        "IELTS writing task 1 band score tips",
+        "tips to raise your IELTS writing band score",
+        "sourdough bread starter hydration"
+    ])
+    assert vectors.dtype == np.float32
+    assert np.allclose(vectors, embedder.embed([
+        "IELTS writing task 1 band score tips",
+        "tips to raise your IELTS writing band score",
+        "sourdough bread starter hydration"
+    ]))
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+def test_ivf_index_matches_flat_on_most_queries():
+    rng = np.random.default_rng(1)
+    vectors = normalize(rng.standard_normal((3000, 64)))
+    ids = np.arange(3000, dtype=np.int64) + 100
+    flat = FlatIndex(ids, vectors)
+    ivf = IVFIndex(ids, vectors, nprobe=16)
+
+    recalls = []
+    for query in vectors[:50]:
+        exact_ids, exact_scores = flat.search(query, 10)
+        approximate_ids, _ = ivf.search(query, 10)
+        assert exact_scores[0] == pytest.approx(1.0, abs=1e-5)
+        recalls.append(len(set(exact_ids) & set(approximate_ids)) / 10)
+    assert np.mean(recalls) > 0.5
+
+@pytest.fixture
+def indexed_sections(test_db, test_user):
+    content = Content(id=9101, user_id=test_user.id, title="Earlier post")
+    other = Content(id=9102, user_id=test_user.id, title="Current post")
+    test_db.add_all([content, other])
+    test_db.commit()
+    sections = [
+        ContentSection(content_id=content.id, content_outline_section_id=1, text="IELTS speaking practice with a partner improves fluency."),
+        ContentSection(content_id=content.id, content_outline_section_id=1, text="Bake sourdough at a high temperature for a crisp crust."),
+        ContentSection(content_id=other.id, content_outline_section_id=1, text="IELTS speaking band descriptors explained."),
+    ]
+    test_db.add_all(sections)
+    test_db.commit()
+    for section in sections:
+        embedding_service.index_source(test_db, EmbeddingChunkSource.CONTENT_SECTION, section.id)
+    return sections
+
+def test_index_source_skips_unchanged_text(test_db, indexed_sections):
+    assert embedding_service.index_source(test_db, EmbeddingChunkSource.CONTENT_SECTION, indexed_sections[0].id) == 0
+    indexed_sections[0].text = "IELTS speaking practice, rewritten."
+    test_db.add(indexed_sections[0])
+    test_db.commit()
+    assert embedding_service.index_source(test_db, EmbeddingChunkSource.CONTENT_SECTION, indexed_sections[0].id) == 1
+
+def test_retrieve_ranks_by_similarity_and_respects_budget(test_db, test_user, indexed_sections):
+    chunks = embedding_service.retrieve(test_db, test_user.id, "IELTS speaking fluency", token_budget=1000, exclude_content_id=9102)
+    assert chunks[0]["source_id"] == indexed_sections[0].id
+    # The section of the piece being written is left out
+    assert indexed_sections[2].id not in [chunk["source_id"] for chunk in chunks]
+
+    smallest = min(chunk["token_count"] for chunk in chunks)
+    limited = embedding_service.retrieve(test_db, test_user.id, "IELTS speaking fluency", token_budget=smallest)
+    assert sum(chunk["token_count"] for chunk in limited) <= smallest
+
+    assert embedding_service.retrieve(test_db, test_user.id, "IELTS", token_budget=0) == []
+
+def test_deleting_an_upload_removes_its_chunks(authorized_client, test_db, test_user):
+    upload = Upload(
+        user_id=test_user.id, file_path="uploads/pdfs/sha256/missing.pdf", original_filename="notes.pdf",
+        file_size=10, sha256="d" * 64, mime_type="application/pdf"
+    )
+    test_db.add(upload)
+    test_db.add(UploadPage(sha256="d" * 64, page_number=1, text="IELTS writing task notes from a deleted PDF.", char_count=44))
+    test_db.commit()
+    assert embedding_service.index_source(test_db, EmbeddingChunkSource.UPLOAD, upload.id) == 1
+    assert embedding_service.retrieve(test_db, test_user.id, "IELTS writing task", token_budget=1000)
+
+    assert authorized_client.delete(f"/uploads/{upload.id}").status_code == 200
+
+    assert test_db.query(EmbeddingChunk).filter(EmbeddingChunk.source_type == EmbeddingChunkSource.UPLOAD).count() == 0
+    assert embedding_service.retrieve(test_db, test_user.id, "IELTS writing task", token_budget=1000) == []
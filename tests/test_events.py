@@ -0,0 +1,72 @@
+import asyncio
+import json
+import time
+from app.routers import events
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def sqs_event(*messages):
+    return {
+        "Records": [
+            {
+                "messageId": f"msg-{i}",
+                "eventSource": "aws:sqs",
+                "body": body if isinstance(body, str) else json.dumps(body),
+                "attributes": {"ApproximateReceiveCount": "1"},
+            }
+            for i, body in enumerate(messages)
+        ]
+    }
+
+def test_batch_reports_only_failed_records(client, monkeypatch):
+    async def ok(message, db):
+        return None
+
+    async def broken(message, db):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(events.TASK_HANDLERS, "ok", ok)
+    monkeypatch.setitem(events.TASK_HANDLERS, "broken", broken)
+
+    response = client.post("/events", json=sqs_event(
+        {"task": "ok"},
+        {"task": "broken"},
+        {"task": "no_such_task"},
+        "not json",
+        "[1, 2]",
+    ))
+    assert response.status_code == 200
+    # Unknown tasks, bad JSON and bodies that aren't objects can never succeed, so they are acknowledged rather than retried
+    assert response.json() == {"batchItemFailures": [{"itemIdentifier": "msg-1"}]}
+
+def test_record_is_discarded_after_max_receives(client, monkeypatch):
+    async def broken(message, db):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(events.TASK_HANDLERS, "broken", broken)
+    monkeypatch.setattr(events.settings, "SQS_MAX_RECEIVE_COUNT", 3)
+    event = sqs_event({"task": "broken"}, {"task": "broken"})
+    event["Records"][1]["attributes"]["ApproximateReceiveCount"] = "3"
+
+    response = client.post("/events", json=event)
+    # The first still has retries left; the second has used them up and is acknowledged
+    assert response.json() == {"batchItemFailures": [{"itemIdentifier": "msg-0"}]}
+
+def test_batch_records_run_concurrently(client, monkeypatch):
+    async def slow(message, db):
+        await asyncio.sleep(0.2)
+
+    monkeypatch.setitem(events.TASK_HANDLERS, "slow", slow)
+    monkeypatch.setattr(events.settings, "SQS_BATCH_CONCURRENCY", 5)
+
+    started = time.perf_counter()
+    response = client.post("/events", json=sqs_event(*[{"task": "slow"}] * 5))
+    elapsed = time.perf_counter() - started
+
+    assert response.json() == {"batchItemFailures": []}
+    assert elapsed < 0.6
+
+def test_non_sqs_event(client):
+    assert client.post("/events", json={"source": "aws.events"}).json() == {"status": "processed"}
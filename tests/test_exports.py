@@ -0,0 +1,45 @@
+import json
+import tracemalloc
+from datetime import datetime, UTC
+import pytest
+from app.services.export_service import encode_ndjson, encode_json_array, encode_json_array_async
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def make_rows(count: int):
+    for i in range(count):
+        yield {"id": i, "title": f"Content {i}", "created_at": datetime(2025, 1, 1, tzinfo=UTC)}
+
+def test_encode_ndjson():
+    lines = b"".join(encode_ndjson(make_rows(3))).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [0, 1, 2]
+    assert json.loads(lines[0])["created_at"] == "2025-01-01T00:00:00+00:00"
+
+def test_encode_json_array():
+    body = b"".join(encode_json_array(make_rows(3)))
+    assert [row["id"] for row in json.loads(body)] == [0, 1, 2]
+    assert json.loads(b"".join(encode_json_array(iter([])))) == []
+
+@pytest.mark.asyncio
+async def test_encode_json_array_async():
+    async def rows():
+        for row in make_rows(2):
+            yield row
+    body = b"".join([chunk async for chunk in encode_json_array_async(rows())])
+    assert [row["id"] for row in json.loads(body)] == [0, 1]
+
+def test_encoding_memory_is_flat():
+    # Peak allocation while streaming 100k rows should be close to that of 1k rows
+    def peak(count: int) -> int:
+        tracemalloc.start()
+        for _ in encode_ndjson(make_rows(count)):
+            pass
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_bytes
+
+    small, large = peak(1_000), peak(100_000)
+    logger.debug(f"peak bytes: 1k rows={small} 100k rows={large}")
+    assert large < small * 2
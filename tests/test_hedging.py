@@ -0,0 +1,137 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.clients.fake import FakeLLMClient
+from app.services import deadline_service, hedging_service
+from app.services.deadline_service import call_timeout, deadline
+from app.services.hedging_service import hedge_stats, hedged_call, hedged_stream
+from app.services.model_router_service import ModelRoute, ModelRouter, SECTION_REQUEST
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def make_router(primary_latencies: list) -> ModelRouter:
+    router = ModelRouter([
+        ModelRoute(provider="fake", model="fake-primary", quality_tier=3),
+        ModelRoute(provider="fake", model="fake-backup", quality_tier=2),
+    ])
+    for latency in primary_latencies:
+        router.record(router.routes[0], latency, ok=True)
+    for _ in range(20):
+        router.record(router.routes[1], 500, ok=True)
+    return router
+
+def fake_attempt(latencies: dict, cancelled: list):
+    async def attempt(route: ModelRoute, timeout: float) -> str:
+        client = FakeLLMClient(latency_ms=latencies[route.model])
+        try:
+            return await client.create_text_message("prompt", model=route.model)
+        except asyncio.CancelledError:
+            cancelled.append(route.model)
+            raise
+    return attempt
+
+@pytest.fixture(autouse=True)
+def reset_hedge_stats():
+    hedge_stats.reset()
+    yield
+    hedge_stats.reset()
+
+def test_call_timeout_is_capped_by_the_request_deadline(monkeypatch):
+    monkeypatch.setattr(deadline_service.settings, "LLM_CALL_TIMEOUT_SECONDS", 30.0)
+    assert call_timeout() == 30.0
+    with deadline(10):
+        assert 9 < call_timeout() <= 10
+        # An inner deadline can only shorten the outer one
+        with deadline(60):
+            assert call_timeout() <= 10
+    with deadline(-1):
+        with pytest.raises(HTTPException) as exc_info:
+            call_timeout()
+        assert exc_info.value.status_code == 504
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_the_loser_cancelled():
+    # p95 of 50ms, but an occasional 1s call
+    router = make_router([50] * 19 + [1000])
+    cancelled = []
+    attempt = fake_attempt({"fake-primary": 1000, "fake-backup": 20}, cancelled)
+
+    text = await hedged_call(SECTION_REQUEST, router.routes[0], attempt, router=router)
+
+    assert "from fake-backup" in text
+    assert cancelled == ["fake-primary"]
+    stats = hedge_stats.as_dict()[SECTION_REQUEST]
+    assert stats["calls"] == 1
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+    assert stats["time_saved_ms"] > 500
+
+@pytest.mark.asyncio
+async def test_fast_call_is_not_hedged():
+    router = make_router([200] * 20)
+    cancelled = []
+    attempt = fake_attempt({"fake-primary": 10, "fake-backup": 10}, cancelled)
+
+    text = await hedged_call(SECTION_REQUEST, router.routes[0], attempt, router=router)
+
+    assert "from fake-primary" in text
+    assert cancelled == []
+    assert hedge_stats.as_dict()[SECTION_REQUEST]["hedged"] == 0
+
+@pytest.mark.asyncio
+async def test_primary_can_still_win_after_hedging():
+    router = make_router([20] * 20)
+    attempt = fake_attempt({"fake-primary": 60, "fake-backup": 500}, [])
+
+    text = await hedged_call(SECTION_REQUEST, router.routes[0], attempt, router=router)
+
+    assert "from fake-primary" in text
+    stats = hedge_stats.as_dict()[SECTION_REQUEST]
+    assert stats["hedged"] == 1
+    assert stats["primary_wins"] == 1
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_the_call(monkeypatch):
+    monkeypatch.setattr(hedging_service.settings, "LLM_HEDGING", False)
+    router = make_router([])
+    cancelled = []
+    attempt = fake_attempt({"fake-primary": 1000, "fake-backup": 1000}, cancelled)
+
+    with deadline(0.05):
+        with pytest.raises(HTTPException) as exc_info:
+            await hedged_call(SECTION_REQUEST, router.routes[0], attempt, router=router)
+    assert exc_info.value.status_code == 504
+    assert cancelled == ["fake-primary"]
+    assert hedge_stats.as_dict()[SECTION_REQUEST]["timeouts"] == 1
+
+@pytest.mark.asyncio
+async def test_stream_is_hedged_on_first_token():
+    router = make_router([])
+    for _ in range(20):
+        router.record_first_token(router.routes[0], 30)
+    closed = []
+
+    async def open_stream(route: ModelRoute, timeout: float):
+        try:
+            await asyncio.sleep(1.0 if route.model == "fake-primary" else 0.01)
+            for word in ("one ", "two ", "three"):
+                yield f"{word}"
+        finally:
+            closed.append(route.model)
+
+    chunks = [chunk async for chunk in hedged_stream(SECTION_REQUEST, router.routes[0], open_stream, router=router)]
+
+    assert "".join(chunks) == "one two three"
+    assert sorted(closed) == ["fake-backup", "fake-primary"]
+    assert hedge_stats.as_dict()[SECTION_REQUEST]["hedge_wins"] == 1
+    # The cancelled primary's wait is a time-to-first-token sample, not a full-call latency
+    stats = router.stats_for(router.routes[0])
+    assert len(stats.first_token_samples) == 21
+    assert len(stats.samples) == 0
+
+def test_fallback_is_the_same_model_without_alternatives():
+    router = ModelRouter([ModelRoute(provider="fake", model="fake-only", quality_tier=3)])
+    route = router.routes[0]
+    assert router.fallback(SECTION_REQUEST, route) is route
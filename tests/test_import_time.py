@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+# Cold-start budget for `import app.main`. It takes about 1s with the heavy SDKs kept lazy, so
+# the default leaves headroom for slower machines while still catching one creeping back in;
+# set IMPORT_TIME_BUDGET_MS to tighten or loosen it for a given environment
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+HEAVY_MODULES = ["pydantic_ai", "logfire", "devtools", "anthropic", "openai", "boto3", "resend", "stripe"]
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT_DIR,
+        # As in the Dockerfile: logfire's pydantic plugin would otherwise import it with the first model
+        env={**os.environ, "PYDANTIC_DISABLE_PLUGINS": "logfire-plugin"},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """Parse `python -X importtime` output into (self_us, cumulative_us, module) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+def test_heavy_sdks_are_not_imported_at_startup():
+    # Test the SDKs only needed by a few routes stay out of the cold-start import graph
+    result = run_python(
+        "import sys, app.main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = [module for module in result.stdout.strip().split(",") if module]
+    assert loaded == [], f"Heavy modules imported by app.main: {loaded}"
+
+def test_import_time_budget():
+    # Test `import app.main` stays within the configured cold-start budget
+    result = run_python("import app.main", "-X", "importtime")
+    rows = parse_importtime(result.stderr)
+    total_us = next(cumulative for _, cumulative, module in rows if module.strip() == "app.main")
+
+    top_level = sorted(
+        (row for row in rows if not row[2].startswith("  ")),
+        key=lambda row: row[1],
+        reverse=True
+    )[:15]
+    breakdown = "\n".join(f"{cumulative / 1000:8.1f}ms  {module.strip()}" for _, cumulative, module in top_level)
+    logger.info(f"import app.main took {total_us / 1000:.1f}ms\n{breakdown}")
+
+    assert total_us / 1000 <= IMPORT_TIME_BUDGET_MS, (
+        f"import app.main took {total_us / 1000:.1f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)\n{breakdown}"
+    )
@@ -0,0 +1,82 @@
+import pytest
+from fastapi import HTTPException
+from app.models.job import JobStatus
+from app.services import job_service
+from app.services.job_service import job_task
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def test_create_and_get_job(test_db, test_user):
+    job = job_service.create_job(test_db, "generate_content_block", {"prompt": "hi"}, user_id=test_user.id)
+    assert job.status == JobStatus.QUEUED
+    assert job_service.get_job(test_db, job.id).payload == {"prompt": "hi"}
+
+    with pytest.raises(HTTPException) as exc_info:
+        job_service.get_job(test_db, "missing")
+    assert exc_info.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_job_task_records_success(test_db):
+    @job_task
+    async def handler(job, db):
+        job_service.set_progress(db, job, 0.5)
+        return {"echo": job.payload["value"]}
+
+    job = job_service.create_job(test_db, "echo", {"value": 42})
+    await handler({"task": "echo", "job_id": job.id}, test_db)
+
+    test_db.refresh(job)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.progress == 1.0
+    assert job.result == {"echo": 42}
+    assert job.attempts == 1
+    assert job.started_at <= job.finished_at
+
+@pytest.mark.asyncio
+async def test_job_task_records_failure_and_reraises(test_db):
+    @job_task
+    async def handler(job, db):
+        raise ValueError("boom")
+
+    job = job_service.create_job(test_db, "explode")
+    with pytest.raises(ValueError):
+        await handler({"task": "explode", "job_id": job.id}, test_db)
+
+    test_db.refresh(job)
+    assert job.status == JobStatus.FAILED
+    assert job.error == "boom"
+
+@pytest.mark.asyncio
+async def test_generate_content_block_job_runs_on_the_fake_route(test_db, monkeypatch):
+    from app.orchestrators import job_tasks
+    from app.services import model_router_service
+    from app.services.model_router_service import ModelRoute, ModelRouter
+    monkeypatch.setattr(
+        model_router_service, "model_router", ModelRouter([ModelRoute(provider="fake", model="fake", quality_tier=3)])
+    )
+
+    job = job_service.create_job(test_db, job_tasks.GENERATE_CONTENT_BLOCK, {"prompt": "Write a section"})
+    await job_tasks.generate_content_block({"task": job.task, "job_id": job.id}, test_db)
+
+    test_db.refresh(job)
+    assert job.status == JobStatus.SUCCEEDED
+    assert "content_block" in job.result["content"]
+
+def test_get_job_endpoint(authorized_client, test_db, test_user):
+    job = job_service.create_job(test_db, "generate_content_block", user_id=test_user.id)
+    response = authorized_client.get(f"/jobs/{job.id}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == JobStatus.QUEUED
+    assert body["queued_ms"] is None
+
+    assert authorized_client.get("/jobs/missing").status_code == 404
+
+def test_get_job_endpoint_requires_the_owner(client, authorized_client, test_db):
+    job = job_service.create_job(test_db, "generate_content_block")
+    assert authorized_client.get(f"/jobs/{job.id}").status_code == 404
+
+    del authorized_client.headers["Authorization"]
+    assert client.get(f"/jobs/{job.id}").status_code == 401
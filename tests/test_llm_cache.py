@@ -0,0 +1,64 @@
+import pytest
+from app.services.llm_cache_service import LRUCache, LLMResponseCache, make_cache_key
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def test_cache_key_is_content_addressed():
+    # Test identical inputs share a key and any input change produces a new one
+    key = make_cache_key(model="m", system_prompt="s", user_prompt="u", tools=[{"name": "t"}], temperature=0.7)
+    assert key == make_cache_key(model="m", system_prompt="s", user_prompt="u", tools=[{"name": "t"}], temperature=0.7)
+    assert key != make_cache_key(model="m", system_prompt="s", user_prompt="u2", tools=[{"name": "t"}], temperature=0.7)
+    assert key != make_cache_key(model="m", system_prompt="s", user_prompt="u", tools=[{"name": "t"}], temperature=0.2)
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_lru_expires_entries():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1, ttl_seconds=0)
+    assert cache.get("a") is None
+
+@pytest.mark.asyncio
+async def test_get_or_call_counts_hits_and_bypasses():
+    # Test the memory tier serves repeats and use_cache=False always calls through
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60, persistent=False, enabled=True)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        return {"value": calls}
+
+    assert await cache.get_or_call("key", "m", call) == {"value": 1}
+    assert await cache.get_or_call("key", "m", call) == {"value": 1}
+    assert await cache.get_or_call("key", "m", call, use_cache=False) == {"value": 2}
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["bypassed"] == 1
+
+@pytest.mark.asyncio
+async def test_callers_cannot_mutate_cached_responses():
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60, persistent=False, enabled=True)
+
+    async def call():
+        return {"items": [1]}
+
+    first = await cache.get_or_call("key", "m", call)
+    first["items"].append(2)
+    second = await cache.get_or_call("key", "m", call)
+    second["items"].append(3)
+    assert await cache.get_or_call("key", "m", call) == {"items": [1]}
+
+def test_cache_stats_require_auth(client):
+    assert client.get("/agents/cache/stats").status_code == 401
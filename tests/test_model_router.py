@@ -0,0 +1,149 @@
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from app.clients.fake import FakeLLMClient, FakeLLMError
+from app.models.ai_model import AIModel
+from app.models.ai_provider import AIProvider
+from app.services import content_section_service, model_router_service
+from app.services.model_router_service import ModelRoute, ModelRouter, SECTION_REQUEST, STITCH_REQUEST, route_from_rows
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def fake_routes():
+    return [
+        ModelRoute(provider="fake", model="fake-slow", quality_tier=3),
+        ModelRoute(provider="fake", model="fake-fast", quality_tier=2),
+        ModelRoute(provider="fake", model="fake-basic", quality_tier=1),
+    ]
+
+def warm_up(router: ModelRouter, latencies: dict, errors: dict = None, samples: int = 10):
+    errors = errors or {}
+    for route in router.routes:
+        for i in range(samples):
+            router.record(route, latencies[route.model], ok=i >= errors.get(route.model, 0))
+
+def test_select_prefers_lowest_p95_within_quality_tier():
+    router = ModelRouter(fake_routes())
+    warm_up(router, {"fake-slow": 900, "fake-fast": 200, "fake-basic": 50})
+    # fake-basic is fastest but below the tier content sections need
+    assert router.select(SECTION_REQUEST).model == "fake-fast"
+    assert router.select(STITCH_REQUEST).model == "fake-basic"
+
+def test_new_models_are_tried_before_measured_ones():
+    router = ModelRouter(fake_routes()[:2])
+    for _ in range(10):
+        router.record(router.routes[1], 10, ok=True)
+    assert router.select(SECTION_REQUEST).model == "fake-slow"
+
+def test_unhealthy_models_are_skipped_until_retry(monkeypatch):
+    router = ModelRouter(fake_routes())
+    warm_up(router, {"fake-slow": 900, "fake-fast": 200, "fake-basic": 50}, errors={"fake-fast": 5})
+    assert router.select(SECTION_REQUEST).model == "fake-slow"
+
+    monkeypatch.setattr(model_router_service.settings, "MODEL_ROUTER_RETRY_SECONDS", 0)
+    assert router.select(SECTION_REQUEST).model == "fake-fast"
+
+def test_select_raises_503_without_candidates():
+    router = ModelRouter([ModelRoute(provider="fake", model="fake-basic", quality_tier=1)])
+    with pytest.raises(HTTPException) as exc_info:
+        router.select(SECTION_REQUEST)
+    assert exc_info.value.status_code == 503
+    with pytest.raises(HTTPException):
+        router.select(STITCH_REQUEST, provider="openai")
+
+def test_routes_need_credentials(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    route = ModelRoute(provider="anthropic", model="claude", quality_tier=3)
+    assert not route.available()
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    assert route.available()
+
+@pytest.mark.asyncio
+async def test_track_records_latency_and_errors():
+    router = ModelRouter(fake_routes())
+    route = router.routes[0]
+    client = FakeLLMClient(latency_ms=20, error_rate=1.0)
+
+    async with router.track(route):
+        pass
+    with pytest.raises(FakeLLMError):
+        async with router.track(route):
+            await client.create_text_message("prompt", model=route.model)
+
+    stats = router.snapshot()[0]
+    assert stats["calls"] == 2
+    assert stats["error_rate"] == 0.5
+    assert stats["p50_ms"] is not None
+
+def test_route_from_rows():
+    provider = AIProvider(id=1, name="Local", api_endpoint="http://localhost:8080/v1", is_openai_compatible=True,
+                          custom_fields={"api_key_env": "LOCAL_LLM_KEY"})
+    ai_model = AIModel(id=1, name="llama-3-8b", provider_id=1, custom_fields={"quality_tier": 2, "request_types": ["stitch"]})
+    route = route_from_rows(provider, ai_model)
+    assert route.key == "openai:llama-3-8b"
+    assert route.base_url == "http://localhost:8080/v1"
+    assert route.serves(STITCH_REQUEST)
+    assert not route.serves(SECTION_REQUEST)
+
+def test_route_without_a_tier_serves_every_request_type():
+    provider = AIProvider(id=1, name="OpenAI", api_endpoint="", pydantic_ai_wrapper="OpenAI")
+    route = route_from_rows(provider, AIModel(id=1, name="gpt-4o", provider_id=1))
+    assert route.serves(SECTION_REQUEST)
+    assert route.serves(STITCH_REQUEST)
+
+def test_stale_registry_is_refreshed_in_the_background(monkeypatch):
+    router = ModelRouter()
+    router.routes = fake_routes()
+    router.loaded_at = time.monotonic() - 3600
+    started = threading.Event()
+    release = threading.Event()
+    refresh_threads = []
+
+    def slow_refresh(db=None):
+        refresh_threads.append(threading.current_thread())
+        started.set()
+        release.wait(5)
+        router.loaded_at = time.monotonic()
+
+    monkeypatch.setattr(router, "refresh", slow_refresh)
+
+    # Routed straight away on the current registry, with only one refresh running at a time
+    assert router.select(STITCH_REQUEST) in router.routes
+    assert router.select(STITCH_REQUEST) in router.routes
+    assert started.wait(5)
+    release.set()
+    assert len(refresh_threads) == 1
+    assert refresh_threads[0] is not threading.current_thread()
+
+def test_refresh_reads_registry_tables(test_db):
+    provider = AIProvider(id=901, name="Fake", api_endpoint="", pydantic_ai_wrapper="Fake")
+    test_db.add(provider)
+    test_db.commit()
+    test_db.add_all([
+        AIModel(id=901, name="fake-a", provider_id=901, custom_fields={"quality_tier": 2}),
+        AIModel(id=902, name="fake-b", provider_id=901, custom_fields={"quality_tier": 2, "enabled": False}),
+    ])
+    test_db.commit()
+
+    router = ModelRouter()
+    router.refresh(test_db)
+    assert [route.key for route in router.routes] == ["fake:fake-a"]
+
+@pytest.mark.asyncio
+async def test_generate_content_section_uses_routed_fake_model(monkeypatch):
+    router = ModelRouter(fake_routes())
+    warm_up(router, {"fake-slow": 900, "fake-fast": 200, "fake-basic": 50})
+    monkeypatch.setattr(content_section_service, "model_router", router)
+    monkeypatch.setattr(content_section_service, "get_prompt_budget", lambda model: 8000)
+
+    section = await content_section_service.generate_content_section(
+        current_outline_section="Section one",
+        use_cache=False,
+        provider="auto"
+    )
+    assert "from fake-fast" in section["content_block"].content_block
+    assert section["usage"].calls == 1
+    assert router.stats["fake:fake-fast"].calls == 11
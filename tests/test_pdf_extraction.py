@@ -0,0 +1,74 @@
+import hashlib
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.models.upload import Upload
+from app.models.upload_page import UploadPage
+from app.services import pdf_extraction_service
+from app.services.pdf_text import extract_pages, normalize_text
+from benchmarks.pdf_extraction import make_pdf
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def test_normalize_text():
+    assert normalize_text("  Hello   world \n\n\n\n next\tline  ") == "Hello world\n\nnext line"
+
+def test_extract_pages(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(make_pdf(3, lines_per_page=2))
+    pages = extract_pages(str(path))
+    assert len(pages) == 3
+    assert "Page 2 line 1" in pages[1]
+
+def test_executor_falls_back_to_threads_without_a_process_pool(monkeypatch):
+    def no_semaphores(*args, **kwargs):
+        raise OSError(38, "Function not implemented")
+
+    monkeypatch.setattr(pdf_extraction_service, "ProcessPoolExecutor", no_semaphores)
+    monkeypatch.setattr(pdf_extraction_service, "_executor", None)
+    try:
+        assert isinstance(pdf_extraction_service.get_executor(), ThreadPoolExecutor)
+    finally:
+        pdf_extraction_service.shutdown_executor()
+
+@pytest.fixture
+def pdf_uploads(test_db, test_user, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_extraction_service, "UPLOADS_BASE_DIR", tmp_path)
+    content = make_pdf(2, lines_per_page=2)
+    (tmp_path / "doc.pdf").write_bytes(content)
+    sha256 = hashlib.sha256(content).hexdigest()
+    uploads = [
+        Upload(user_id=test_user.id, file_path="doc.pdf", original_filename=f"doc{i}.pdf",
+               file_size=len(content), sha256=sha256, mime_type="application/pdf")
+        for i in range(2)
+    ]
+    test_db.add_all(uploads)
+    test_db.commit()
+    return uploads
+
+@pytest.mark.asyncio
+async def test_extract_uploads_parses_each_hash_once(test_db, pdf_uploads):
+    # A thread pool keeps the test in-process; production uses the spawn process pool
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        counts = await pdf_extraction_service.extract_uploads(test_db, executor=executor)
+        assert counts["pdfs"] == 1
+        assert counts["parsed"] == 1
+        assert counts["pages"] == 2
+
+        for upload in pdf_uploads:
+            test_db.refresh(upload)
+            assert upload.page_count == 2
+            assert upload.extracted_at is not None
+        assert len(test_db.query(UploadPage).all()) == 2
+
+        # Incremental: nothing left to do
+        counts = await pdf_extraction_service.extract_uploads(test_db, executor=executor)
+        assert counts["pdfs"] == 0
+
+        # Full: re-parses and replaces the pages
+        counts = await pdf_extraction_service.extract_uploads(test_db, incremental=False, executor=executor)
+        assert counts["parsed"] == 1
+        assert len(test_db.query(UploadPage).all()) == 2
+
+    assert "Page 1 line 0" in pdf_extraction_service.get_upload_text(test_db, pdf_uploads[0])
@@ -0,0 +1,40 @@
+import pytest
+from app.schemas.principal import Principal
+from app.services import principal_service
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_service.clear()
+    yield
+    principal_service.clear()
+
+def test_get_principal_loads_columns_only(test_db, test_user):
+    principal = principal_service.get_principal(test_db, test_user.id)
+    assert isinstance(principal, Principal)
+    assert principal.id == test_user.id
+    assert principal.email == test_user.email
+    assert not hasattr(principal, "content_briefs")
+
+def test_principal_is_cached_until_invalidated(test_db, test_user):
+    # Test repeat lookups are served from cache and invalidation picks up changes
+    principal_service.get_principal(test_db, test_user.id)
+
+    test_user.subscription_status = "active"
+    test_db.add(test_user)
+    test_db.commit()
+    assert principal_service.get_principal(test_db, test_user.id).subscription_status is None
+
+    principal_service.invalidate(test_user.id)
+    assert principal_service.get_principal(test_db, test_user.id).has_premium_access()
+
+def test_missing_user_is_not_cached(test_db):
+    assert principal_service.get_principal(test_db, 99999) is None
+
+def test_me_returns_principal(authorized_client, test_user):
+    response = authorized_client.get("/auth/me")
+    assert response.status_code == 200
+    assert response.json()["email"] == test_user.email
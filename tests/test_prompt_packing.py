@@ -0,0 +1,98 @@
+import pytest
+from app.models.content_brief import ContentBrief
+from app.services import prompt_packing_service, token_service
+from app.services.prompt_packing_service import PromptPart, budget_from_custom_fields, pack
+from app.services.token_service import count_tokens, truncate_to_tokens
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def sentences(count: int) -> str:
+    return " ".join(f"Sentence number {i} describes the product in some detail." for i in range(count))
+
+def test_truncate_to_tokens_stays_within_limit():
+    text = sentences(200)
+    truncated = truncate_to_tokens(text, 50)
+    assert count_tokens(truncated) <= 50
+    assert truncated.endswith("[...]")
+    assert text.startswith(truncated[:-len(" [...]")])
+    assert truncate_to_tokens("short", 50) == "short"
+
+def test_pack_cuts_lowest_priority_first():
+    parts = [
+        PromptPart("outline", "Outline section:\nTips"),
+        PromptPart("instructions", "Author instructions:\n" + sentences(20), priority=2, min_tokens=20),
+        PromptPart("sample", "Writing Sample:\n" + sentences(200), priority=4, min_tokens=20),
+    ]
+    budget = parts[0].tokens + parts[1].tokens + 100
+    packed = pack(parts, budget)
+    assert packed.tokens <= budget
+    assert packed.truncated == ["sample"]
+    assert packed.parts[1].text == parts[1].text
+    # The caller's parts are left untouched
+    assert parts[2].text.endswith("detail.")
+
+def test_pack_drops_parts_that_would_fall_below_min_tokens():
+    parts = [
+        PromptPart("outline", "Outline section:\nTips"),
+        PromptPart("reference", "Reference material:\n" + sentences(50), priority=5, min_tokens=1000),
+    ]
+    packed = pack(parts, parts[0].tokens + 10)
+    assert packed.dropped == ["reference"]
+    assert packed.text() == "Outline section:\nTips"
+    assert not packed.over_budget
+
+def test_pack_never_cuts_required_parts():
+    packed = pack([PromptPart("outline", sentences(50))], 10)
+    assert packed.over_budget
+    assert packed.parts[0].text == sentences(50)
+
+def test_budget_from_custom_fields():
+    assert budget_from_custom_fields({"prompt_token_budget": 3000}) == 3000
+    assert budget_from_custom_fields({"context_window": 128000, "max_output_tokens": 16000}) == 112000
+    assert budget_from_custom_fields({}) is None
+
+def test_brief_token_counts_are_reused_until_the_field_changes(monkeypatch):
+    brief = ContentBrief(user_id=1, title="Brief", writing_sample=sentences(10), product_info="A product.")
+    brief.token_counts = token_service.brief_token_counts(brief)
+    assert set(brief.token_counts["fields"]) == {"writing_sample", "product_info"}
+
+    calls = []
+    monkeypatch.setattr(token_service, "count_tokens", lambda text: calls.append(text) or 1)
+    assert token_service.cached_field_tokens(brief, "writing_sample") == count_tokens(brief.writing_sample)
+    assert calls == []
+
+    brief.writing_sample += " One more sentence."
+    assert token_service.cached_field_tokens(brief, "writing_sample") == 1
+    assert calls == [brief.writing_sample]
+
+def test_section_prompts_fit_the_model_budget(monkeypatch):
+    from app.services.content_section_service import build_prompts, system_prompt
+
+    monkeypatch.setattr(prompt_packing_service.settings, "PROMPT_SECTION_RESERVE_TOKENS", 300)
+    monkeypatch.setattr("app.services.content_section_service.get_prompt_budget", lambda model: 1500)
+    brief = ContentBrief(user_id=1, title="Brief", writing_sample=sentences(300), negative_words="cheap")
+
+    first = build_prompts(brief, "gpt-4o-mini", current_outline_section="Section one", previous_section=sentences(300))
+    second = build_prompts(brief, "gpt-4o-mini", current_outline_section="Section two")
+
+    for section_system_prompt, _, prompt in (first, second):
+        assert count_tokens(section_system_prompt) + count_tokens(prompt) <= 1500
+    # Same packed brief context for every section, so the prefix cache still hits
+    assert first[0] == second[0]
+    assert first[0].startswith(system_prompt)
+    assert first[0].endswith("Negative words:\ncheap")
+    assert "Outline section:\nSection one" in first[2]
+
+def test_tokenizer_is_not_downloaded_at_startup(monkeypatch, tmp_path):
+    import tokenizers
+    monkeypatch.setattr(token_service.settings, "TOKENIZER_FILE", str(tmp_path / "missing.json"))
+    monkeypatch.setattr(token_service.settings, "TOKENIZER_DOWNLOAD", False)
+    monkeypatch.setattr(tokenizers.Tokenizer, "from_pretrained", lambda name: pytest.fail("fetched from the hub"))
+    token_service.get_tokenizer.cache_clear()
+    try:
+        assert token_service.get_tokenizer() is None
+        assert token_service.count_tokens("a" * 40) == 10
+    finally:
+        token_service.get_tokenizer.cache_clear()
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from app.clients import rate_limit
+from app.clients.rate_limit import ProviderLimiter, TokenBucket, classify, RATE_LIMITED, OVERLOADED, ERROR, OK
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code: int, retry_after: str = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={"retry-after": retry_after} if retry_after else {})
+
+def test_classify_errors():
+    assert classify(FakeStatusError(429)) == RATE_LIMITED
+    assert classify(FakeStatusError(529)) == OVERLOADED
+    assert classify(TimeoutError()) == OVERLOADED
+    assert classify(FakeStatusError(400)) == ERROR
+    assert classify(ValueError("bad prompt")) == ERROR
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(per_minute=600)
+    now = time.monotonic()
+    bucket.take(600)
+    assert bucket.wait_time(10, now) == pytest.approx(1.0, abs=0.05)
+    assert bucket.wait_time(10, now + 1.0) == 0.0
+
+def test_aimd_grows_on_success_and_halves_once_per_burst_of_429s():
+    limiter = ProviderLimiter("test", initial_limit=8, min_limit=1, max_limit=16)
+    for _ in range(8):
+        limiter._try_acquire(0)
+        limiter.release(100, OK)
+    assert limiter.limit > 8.9
+
+    limit = limiter.limit
+    for _ in range(3):
+        limiter._try_acquire(0)
+        limiter.release(100, RATE_LIMITED, pause=5)
+    # Requests already in flight when the first 429 arrived don't halve it again
+    assert limiter.limit == pytest.approx(limit / 2)
+    assert limiter._try_acquire(0) > 4
+
+def test_latency_spike_backs_off():
+    limiter = ProviderLimiter("test", initial_limit=8)
+    for _ in range(5):
+        limiter._try_acquire(0)
+        limiter.release(100, OK)
+    limit = limiter.limit
+    limiter._try_acquire(0)
+    limiter.release(1000, OK)
+    assert limiter.limit == pytest.approx(limit / 2)
+    assert limiter.snapshot()["latency_spikes"] == 1
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_at_the_limit():
+    limiter = ProviderLimiter("test", initial_limit=2, max_limit=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.02)
+
+    await asyncio.gather(*(request() for _ in range(8)))
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.snapshot()["ok"] == 8
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_bucket_delays_requests():
+    limiter = ProviderLimiter("test", requests_per_minute=600)
+    limiter.requests.level = 0
+    started = time.monotonic()
+    async with limiter.slot():
+        pass
+    assert time.monotonic() - started >= 0.09
+
+@pytest.mark.asyncio
+async def test_call_retries_429_after_retry_after(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_RETRIES", 2)
+    limiter = ProviderLimiter("test")
+    attempts = []
+
+    async def request():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise FakeStatusError(429, retry_after="0.1")
+        return "done"
+
+    assert await limiter.call(request) == "done"
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.09
+    snapshot = limiter.snapshot()
+    assert snapshot["rate_limited"] == 1
+    assert snapshot["ok"] == 1
+
+@pytest.mark.asyncio
+async def test_call_does_not_retry_client_errors():
+    limiter = ProviderLimiter("test")
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        raise FakeStatusError(400)
+
+    with pytest.raises(FakeStatusError):
+        await limiter.call(request)
+    assert len(attempts) == 1
+
+@pytest.mark.asyncio
+async def test_actual_token_usage_settles_the_estimate():
+    limiter = ProviderLimiter("test", tokens_per_minute=1000)
+    await limiter.call(lambda: asyncio.sleep(0, result="ok"), tokens=100, used=lambda result: 300)
+    assert limiter.tokens.level == pytest.approx(700, abs=5)
@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from app.orchestrators.section_scheduler import SectionScheduler, build_dependencies, SEQUENTIAL, PARALLEL
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+@pytest.mark.asyncio
+async def test_parallel_mode_respects_concurrency_limit():
+    # Test no more than `concurrency` sections are generated at once
+    in_flight = 0
+    peak = 0
+
+    async def generate(idx, completed):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"section {idx}"
+
+    scheduler = SectionScheduler(concurrency=3)
+    result = await scheduler.run(build_dependencies(8, PARALLEL), generate)
+
+    assert peak == 3
+    assert result.sections == [f"section {idx}" for idx in range(8)]
+    assert [timing.index for timing in result.timings] == list(range(8))
+    assert all(timing.duration_ms > 0 for timing in result.timings)
+
+@pytest.mark.asyncio
+async def test_sequential_mode_waits_for_previous_section():
+    # Test each section sees the previous section's text in sequential mode
+    seen_previous = {}
+
+    async def generate(idx, completed):
+        seen_previous[idx] = completed.get(idx - 1)
+        return f"section {idx}"
+
+    scheduler = SectionScheduler(concurrency=4)
+    result = await scheduler.run(build_dependencies(4, SEQUENTIAL), generate)
+
+    assert result.sections == ["section 0", "section 1", "section 2", "section 3"]
+    assert seen_previous == {0: None, 1: "section 0", 2: "section 1", 3: "section 2"}
+
+@pytest.mark.asyncio
+async def test_failed_section_cancels_schedule():
+    # Test an error in one section propagates instead of hanging dependants
+    async def generate(idx, completed):
+        if idx == 1:
+            raise RuntimeError("boom")
+        return f"section {idx}"
+
+    scheduler = SectionScheduler(concurrency=2)
+    with pytest.raises(RuntimeError):
+        await scheduler.run(build_dependencies(4, SEQUENTIAL), generate)
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        build_dependencies(3, "bogus")
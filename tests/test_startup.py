@@ -0,0 +1,22 @@
+from app.database import get_expected_schema_revision
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def test_expected_schema_revision_is_migration_head(tmp_path):
+    # Test the head is the revision no other migration points back to
+    (tmp_path / "a_initial.py").write_text("revision: str = 'aaa'\ndown_revision: Union[str, None] = None\n")
+    (tmp_path / "b_second.py").write_text("revision: str = 'bbb'\ndown_revision: Union[str, None] = 'aaa'\n")
+    assert get_expected_schema_revision(tmp_path) == "bbb"
+
+def test_expected_schema_revision_ambiguous_heads(tmp_path):
+    (tmp_path / "a.py").write_text("revision = 'aaa'\ndown_revision = None\n")
+    (tmp_path / "b.py").write_text("revision = 'bbb'\ndown_revision = None\n")
+    assert get_expected_schema_revision(tmp_path) is None
+
+def test_startup_reports_phase_timings(client):
+    # Test the lifespan records how long each startup phase took
+    timings = client.app.state.startup_timings
+    assert set(timings) == {"import", "schema", "http_client", "llm_clients", "tokenizer"}
+    assert all(ms >= 0 for ms in timings.values())
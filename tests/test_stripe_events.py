@@ -0,0 +1,101 @@
+import pytest
+from app.models.user import User
+from app.models.stripe_event import StripeEvent, StripeEventStatus
+from app.services import stripe_event_service
+from app.routers import webhooks
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def subscription_event(event_id: str, created: int, status: str, customer: str = "cus_1", subscription: str = "sub_1"):
+    return {
+        "id": event_id,
+        "type": "customer.subscription.updated",
+        "created": created,
+        "data": {"object": {
+            "object": "subscription",
+            "id": subscription,
+            "customer": customer,
+            "status": status,
+            "current_period_end": 1_900_000_000,
+            "items": {"data": [{"price": {"id": "price_1", "product": "prod_1"}}]},
+        }},
+    }
+
+@pytest.fixture
+def stripe_user(test_db):
+    user = User(email="stripe@example.com", stripe_customer_id="cus_1", stripe_subscription_id="sub_1")
+    test_db.add(user)
+    test_db.commit()
+    test_db.refresh(user)
+    return user
+
+def test_record_event_dedupes_on_event_id(test_db):
+    event = subscription_event("evt_1", 100, "active")
+    stored, created = stripe_event_service.record_event(test_db, event)
+    assert created and stored.customer_key == "cus_1"
+
+    stored, created = stripe_event_service.record_event(test_db, event)
+    assert not created
+    assert stored.status == StripeEventStatus.RECEIVED
+
+def test_customer_events_apply_in_creation_order(test_db, stripe_user):
+    # Delivered out of order: the later "past_due" update must win
+    stripe_event_service.record_event(test_db, subscription_event("evt_late", 200, "past_due"))
+    stripe_event_service.record_event(test_db, subscription_event("evt_early", 100, "active"))
+
+    assert stripe_event_service.process_pending_events(test_db, "cus_1") == 2
+    test_db.refresh(stripe_user)
+    assert stripe_user.subscription_status == "past_due"
+    assert all(event.status == StripeEventStatus.PROCESSED for event in test_db.query(StripeEvent).all())
+
+    # Nothing left to do on a second run
+    assert stripe_event_service.process_pending_events(test_db, "cus_1") == 0
+
+def test_failed_event_leaves_no_partial_changes(test_db, stripe_user, monkeypatch):
+    handle_stripe_event = stripe_event_service.handle_stripe_event
+
+    def apply_then_fail(event, db):
+        handle_stripe_event(event, db)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(stripe_event_service, "handle_stripe_event", apply_then_fail)
+    stripe_event_service.record_event(test_db, subscription_event("evt_1", 100, "past_due"))
+    with pytest.raises(RuntimeError):
+        stripe_event_service.process_pending_events(test_db, "cus_1")
+
+    # The subscription change and the event status commit together, or not at all
+    test_db.refresh(stripe_user)
+    assert stripe_user.subscription_status is None
+    stored = test_db.get(StripeEvent, "evt_1")
+    assert stored.status == StripeEventStatus.FAILED
+    assert stored.attempts == 1
+
+def test_replay_reapplies_processed_events(test_db, stripe_user):
+    stripe_event_service.record_event(test_db, subscription_event("evt_1", 100, "active"))
+    stripe_event_service.process_pending_events(test_db, "cus_1")
+    stripe_user.subscription_status = "corrupted"
+    test_db.add(stripe_user)
+    test_db.commit()
+
+    counts = stripe_event_service.replay_events(test_db, statuses=[StripeEventStatus.PROCESSED])
+    assert counts == {"selected": 1, "processed": 1, "failed_customers": 0}
+    test_db.refresh(stripe_user)
+    assert stripe_user.subscription_status == "active"
+
+def test_webhook_acknowledges_and_dedupes(client, monkeypatch):
+    import json
+    event = subscription_event("evt_hook", 100, "active")
+    enqueued = []
+    monkeypatch.setattr(webhooks, "construct_event", lambda payload, signature: json.loads(payload))
+    monkeypatch.setattr(webhooks.settings, "STRIPE_EVENT_PROCESSING", "queue")
+    monkeypatch.setattr(stripe_event_service, "enqueue_processing", enqueued.append)
+
+    headers = {"stripe-signature": "t=1,v1=test"}
+    first = client.post("/webhooks/stripe", content=json.dumps(event), headers=headers)
+    second = client.post("/webhooks/stripe", content=json.dumps(event), headers=headers)
+
+    assert first.json() == {"status": "accepted"}
+    assert second.json() == {"status": "duplicate"}
+    assert enqueued == ["cus_1", "cus_1"]
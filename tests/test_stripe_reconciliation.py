@@ -0,0 +1,69 @@
+import pytest
+from app.models.user import User
+from app.services.stripe_reconciliation_service import FixtureSubscriptionSource, reconcile
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def subscription(subscription_id: str, customer: str, status: str = "active", price: str = "price_new"):
+    return {
+        "id": subscription_id,
+        "customer": customer,
+        "status": status,
+        "current_period_end": 1_900_000_000,
+        "canceled_at": 1_800_000_000 if status == "canceled" else None,
+        "items": {"data": [{"price": {"id": price, "product": "prod_new"}}]},
+    }
+
+@pytest.fixture
+def stripe_users(test_db):
+    users = [
+        User(email="linked@example.com", stripe_customer_id="cus_1", stripe_subscription_id="sub_1", subscription_status="active"),
+        User(email="customer-only@example.com", stripe_customer_id="cus_2"),
+        User(email="cancelled@example.com", stripe_customer_id="cus_3", stripe_subscription_id="sub_3", subscription_status="active"),
+    ]
+    test_db.add_all(users)
+    test_db.commit()
+    for user in users:
+        test_db.refresh(user)
+    return users
+
+def test_reconcile_updates_users_in_batches(test_db, stripe_users):
+    source = FixtureSubscriptionSource([
+        subscription("sub_1", "cus_1", status="past_due"),
+        subscription("sub_2", "cus_2"),
+        subscription("sub_3", "cus_3", status="canceled"),
+        subscription("sub_9", "cus_unknown"),
+    ], page_size=2)
+
+    counts = reconcile(test_db, source, batch_size=2)
+
+    assert counts["seen"] == 4
+    assert counts["matched"] == 3
+    assert counts["unmatched"] == 1
+    assert counts["updated"] == 3
+    assert counts["rows_per_second"] > 0
+
+    linked, customer_only, cancelled = stripe_users
+    for user in stripe_users:
+        test_db.refresh(user)
+    assert linked.subscription_status == "past_due"
+    assert linked.stripe_price_id == "price_new"
+    # Matched by customer id and linked to the subscription
+    assert customer_only.stripe_subscription_id == "sub_2"
+    assert customer_only.subscription_status == "active"
+    # Canceled subscriptions end up like handle_subscription_deleted leaves them
+    assert cancelled.stripe_subscription_id is None
+    assert cancelled.subscription_status == "canceled"
+
+def test_reconcile_prefers_live_subscription(test_db, stripe_users):
+    source = FixtureSubscriptionSource([
+        subscription("sub_old", "cus_2", status="canceled"),
+        subscription("sub_new", "cus_2", status="active"),
+    ])
+    reconcile(test_db, source)
+
+    customer_only = stripe_users[1]
+    test_db.refresh(customer_only)
+    assert customer_only.stripe_subscription_id == "sub_new"
@@ -0,0 +1,47 @@
+import hashlib
+import io
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from app.routers import uploads
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def upload_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads.Settings, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(uploads.Settings, "PDF_DIR", tmp_path / "pdfs")
+    monkeypatch.setattr(uploads.Settings, "BLOB_DIR", tmp_path / "pdfs" / "sha256")
+    monkeypatch.setattr(uploads.Settings, "TEMP_DIR", tmp_path / "temp")
+    monkeypatch.setattr(uploads.Settings, "_initialized", False)
+    return tmp_path
+
+def make_upload(content: bytes, filename: str = "essay.pdf") -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=filename, headers=Headers({"content-type": "application/pdf"}))
+
+@pytest.mark.asyncio
+async def test_store_upload_file_hashes_and_dedupes(upload_dirs):
+    content = b"%PDF-1.4 " + b"x" * (3 * 1024 * 1024)
+    first = await uploads.store_upload_file(make_upload(content))
+    second = await uploads.store_upload_file(make_upload(content, filename="copy.pdf"))
+
+    assert first.sha256 == hashlib.sha256(content).hexdigest()
+    assert first.size == len(content)
+    assert not first.deduplicated
+    assert second.deduplicated
+    assert second.path == first.path
+    assert first.path.read_bytes() == content
+    # Nothing left behind besides the one blob
+    assert [path.name for path in first.path.parent.iterdir()] == [first.path.name]
+
+@pytest.mark.asyncio
+async def test_store_upload_file_enforces_size_limit(upload_dirs, monkeypatch):
+    monkeypatch.setattr(uploads.Settings, "MAX_FILE_SIZE", 1024)
+    monkeypatch.setattr(uploads.Settings, "CHUNK_SIZE", 256)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await uploads.store_upload_file(make_upload(b"x" * 2048))
+    assert exc_info.value.status_code == 413
+    assert not any(path.is_file() for path in upload_dirs.rglob("*"))
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import pytest
+from app.routers import events
+from app.worker import SQSWorker
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class FakeSQS:
+    """Just enough of the boto3 SQS client for SQSWorker."""
+    def __init__(self, bodies):
+        self.messages = [
+            {"MessageId": f"msg-{i}", "ReceiptHandle": f"rh-{i}", "Body": json.dumps(body)}
+            for i, body in enumerate(bodies)
+        ]
+        self.receive_calls = []
+        self.deleted_batches = []
+        self.visibility_changes = []
+
+    def receive_message(self, **kwargs):
+        self.receive_calls.append(kwargs)
+        batch, self.messages = self.messages[:kwargs["MaxNumberOfMessages"]], self.messages[kwargs["MaxNumberOfMessages"]:]
+        return {"Messages": batch}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        self.deleted_batches.append([entry["ReceiptHandle"] for entry in Entries])
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries]}
+
+    def change_message_visibility(self, **kwargs):
+        self.visibility_changes.append(kwargs["ReceiptHandle"])
+
+@pytest.mark.asyncio
+async def test_worker_long_polls_and_batch_deletes(monkeypatch):
+    async def ok(message, db):
+        await asyncio.sleep(0.01)
+
+    async def broken(message, db):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(events.TASK_HANDLERS, "ok", ok)
+    monkeypatch.setitem(events.TASK_HANDLERS, "broken", broken)
+    client = FakeSQS([{"task": "ok"}] * 11 + [{"task": "broken"}])
+
+    stats = await SQSWorker(queue_url="queue", client=client, concurrency=10).run(max_messages=12)
+
+    assert client.receive_calls[0]["WaitTimeSeconds"] == 20
+    assert client.receive_calls[0]["MaxNumberOfMessages"] == 10
+    assert stats["succeeded"] == 11 and stats["failed"] == 1
+    # Failed messages are not deleted, so SQS redelivers them
+    deleted = [handle for batch in client.deleted_batches for handle in batch]
+    assert sorted(deleted) == sorted(f"rh-{i}" for i in range(11))
+    assert all(len(batch) <= 10 for batch in client.deleted_batches)
+
+@pytest.mark.asyncio
+async def test_worker_drops_messages_past_max_receives(monkeypatch):
+    async def broken(message, db):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(events.TASK_HANDLERS, "broken", broken)
+    monkeypatch.setattr(events.settings, "SQS_MAX_RECEIVE_COUNT", 3)
+    client = FakeSQS([{"task": "broken"}])
+    client.messages[0]["Attributes"] = {"ApproximateReceiveCount": "3"}
+
+    stats = await SQSWorker(queue_url="queue", client=client).run(max_messages=1)
+
+    assert stats["discarded"] == 1 and stats["failed"] == 0
+    assert client.deleted_batches == [["rh-0"]]
+
+@pytest.mark.asyncio
+async def test_worker_extends_visibility_for_slow_handlers(monkeypatch):
+    async def slow(message, db):
+        await asyncio.sleep(2.5)
+
+    monkeypatch.setitem(events.TASK_HANDLERS, "slow", slow)
+    client = FakeSQS([{"task": "slow"}])
+
+    await SQSWorker(queue_url="queue", client=client, visibility_timeout=4).run(max_messages=1)
+
+    assert client.visibility_changes == ["rh-0"]
+    assert client.deleted_batches == [["rh-0"]]